@@ -0,0 +1,69 @@
+# --- Aggregation.py ---
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+TOP_N = 20  # Categories shown before the rest is folded into "Other"
+BINS = 20  # Numeric X columns with more distinct values than TOP_N are binned
+CACHE_SIZE = 32
+AGGREGATIONS = ["sum", "mean", "count"]
+
+
+def group_keys(series):
+    # Labels to group by: the values themselves, or equal-width bins for many-valued numeric columns
+    if pd.api.types.is_numeric_dtype(series.dtype) and series.nunique() > TOP_N:
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        edges = np.histogram_bin_edges(values[~np.isnan(values)], bins=BINS)
+        labels = pd.Categorical.from_codes(
+            np.where(np.isnan(values), -1, np.clip(np.searchsorted(edges, values, side="right") - 1, 0, BINS - 1)),
+            [f"{edges[i]:.4g} – {edges[i + 1]:.4g}" for i in range(BINS)], ordered=True)
+        return pd.Series(labels, index=series.index, name=series.name), True
+    return series, False
+
+
+def aggregate(df, x, y=None, agg="count", top_n=TOP_N):
+    # One groupby gives sum and count per group; mean and the "Other" bucket are derived from those
+    keys, binned = group_keys(df[x])
+    if agg == "count" or y is None:
+        stats = keys.value_counts(sort=False).to_frame("count")
+        stats["sum"] = stats["count"]
+    else:
+        if not pd.api.types.is_numeric_dtype(df[y].dtype):
+            raise ValueError(f"Column '{y}' is not numeric, only 'count' works for it.")
+        stats = df[y].groupby(keys, observed=True, sort=False).agg(["sum", "count"])
+    stats = stats[stats["count"] > 0]
+
+    if binned:
+        stats = stats.sort_index()  # Bins keep their numeric order
+        stats.index = stats.index.astype(str)
+    else:
+        stats.index = stats.index.astype(str)
+        stats = stats.sort_values(agg if agg != "mean" else "count", ascending=False)
+        if len(stats) > top_n:
+            rest = stats.iloc[top_n - 1:].sum()
+            stats = stats.iloc[:top_n - 1]
+            stats.loc["Other"] = rest
+    if agg == "mean":
+        return stats["sum"] / stats["count"]
+    return stats[agg if agg in ("sum", "count") else "count"]
+
+
+class AggregateCache:
+    # Aggregates per (dataset version, x, y, agg); charts draw from these instead of the raw rows
+    def __init__(self, size=CACHE_SIZE):
+        self.size = size
+        self.entries = OrderedDict()
+
+    def get(self, df, version, x, y=None, agg="count"):
+        key = (version, x, y if agg != "count" else None, agg)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        result = aggregate(df, x, y, agg)
+        self.entries[key] = result
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+        return result
+
+
+AGGREGATE_CACHE = AggregateCache()
@@ -0,0 +1,146 @@
+# --- ChartPanel.py ---
+import tkinter as tk
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+import Rendering
+
+
+class ChartPanel(tk.Frame):
+    # One embedded figure per window: charts of the same type update their artist in place, and when the
+    # axes do not move only that artist is blitted over a saved background instead of redrawing everything
+    def __init__(self, master, figsize=(7, 5), **kwargs):
+        super().__init__(master, **kwargs)
+        self.figure = Figure(figsize=figsize, dpi=100)
+        self.canvas = None
+        self.toolbar = None
+        self.ax = None
+        self.kind = None
+        self.artist = None  # Line or scatter artist, drawn animated so it can be blitted
+        self.x_kind = None  # dtype kind of the X data; dates and numbers cannot share one axis
+        self.background = None
+        self._attach(self.figure)
+
+    def _attach(self, figure):
+        if self.canvas is not None:
+            self.toolbar.destroy()
+            self.canvas.get_tk_widget().destroy()
+        self.canvas = FigureCanvasTkAgg(figure, master=self)
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+        self.toolbar = NavigationToolbar2Tk(self.canvas, self, pack_toolbar=False)
+        self.toolbar.update()
+        self.toolbar.pack(side="bottom", fill="x")
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+
+    def _on_draw(self, event):
+        # After every full draw keep the background without the animated artist, then paint the artist on top.
+        # savefig draws on a temporary canvas (SVG, PDF, ...) that has no pixels to copy, so those draws are skipped
+        if event.canvas is not self.canvas:
+            return
+        if self.artist is None or not self.artist.get_animated() or self.canvas.figure is not self.figure:
+            self.background = None
+            return
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.ax.draw_artist(self.artist)
+
+    def _state(self):
+        ax = self.ax
+        return ax.get_xlim(), ax.get_ylim(), ax.get_title(), ax.get_xlabel(), ax.get_ylabel()
+
+    def _refresh(self, before):
+        # Unchanged limits and labels mean only the artist moved, so it is blitted; otherwise a full redraw
+        if self.background is not None and before == self._state():
+            self.canvas.restore_region(self.background)
+            self.ax.draw_artist(self.artist)
+            self.canvas.blit(self.figure.bbox)
+        else:
+            self.canvas.draw_idle()
+
+    def _labels(self, title, xlabel, ylabel):
+        self.ax.set_title(title)
+        self.ax.set_xlabel(xlabel)
+        self.ax.set_ylabel(ylabel)
+
+    def _reusable(self, kind, x):
+        return self.kind == kind and self.artist is not None and self.x_kind == x.dtype.kind
+
+    def start(self, kind):
+        # Clears the shared figure and hands out fresh axes for charts that are rebuilt every time
+        if self.canvas.figure is not self.figure:
+            self._attach(self.figure)
+        self.figure.clear()
+        self.ax = self.figure.add_subplot()
+        self.kind = kind
+        self.artist = None
+        self.x_kind = None
+        self.background = None
+        self.toolbar.update()
+        return self.ax
+
+    def finish(self):
+        self.figure.tight_layout()
+        self.canvas.draw_idle()
+
+    def show_figure(self, figure):
+        # Figures that lay themselves out (seaborn grids) are shown in place of the shared one until the next chart
+        self.kind = None
+        self.artist = None
+        self.background = None
+        self._attach(figure)
+        self.canvas.draw_idle()
+
+    def line(self, x, y, title, xlabel, ylabel):
+        if self._reusable("line", x):
+            x, y, reduced = Rendering.line_points(x, y)
+            before = self._state()
+            self.artist.set_data(x, y)
+            self.artist.set_marker('' if reduced else 'o')
+            self.ax.relim()
+            self.ax.autoscale_view()
+        else:
+            ax = self.start("line")
+            self.artist, reduced = Rendering.line(ax, x, y, animated=True)
+            ax.grid(True)
+            before = None
+        self.x_kind = x.dtype.kind
+        self._labels(f"{title} (LTTB downsampled)" if reduced else title, xlabel, ylabel)
+        if before is None:
+            self.finish()
+        else:
+            self._refresh(before)
+        return reduced
+
+    def scatter(self, x, y, title, xlabel, ylabel):
+        # Points update through set_offsets; past Rendering.MAX_SCATTER_POINTS the density image is refilled instead
+        x_kept, y_kept = Rendering.complete_rows(x, y)
+        dense = len(x_kept) > Rendering.MAX_SCATTER_POINTS
+        kind = "density" if dense else "scatter"
+        if not self._reusable(kind, x):
+            ax = self.start(kind)
+            if dense:
+                self.artist = Rendering.density(ax, x_kept, y_kept)
+            else:
+                self.artist = ax.scatter(x_kept, y_kept, s=10, animated=True)
+            self.x_kind = x.dtype.kind
+            self._labels(f"{title} (point density)" if dense else title, xlabel, ylabel)
+            self.finish()
+            return dense
+
+        before = self._state()
+        if dense:
+            counts, extent = Rendering.density_grid(x_kept, y_kept)
+            self.artist.set_data(counts)
+            self.artist.set_extent(extent)
+            self.artist.autoscale()  # The colorbar follows the norm
+            before = None
+        else:
+            offsets = np.column_stack([x_kept, y_kept])
+            self.artist.set_offsets(offsets)
+            self.ax.dataLim.update_from_data_xy(offsets, ignore=True)  # relim() skips collections
+            self.ax.autoscale_view()
+        self._labels(f"{title} (point density)" if dense else title, xlabel, ylabel)
+        if before is None:
+            self.canvas.draw_idle()
+        else:
+            self._refresh(before)
+        return dense
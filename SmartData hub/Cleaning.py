@@ -1,16 +1,25 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog, filedialog
-import numpy as np
-import pandas as pd
 import os
-import warnings
+from Outliers import ACTIONS, METHODS, compute_bounds, count_outliers, numeric_columns
+from Pipeline import Pipeline
+from Profiling import Profile
+from Dedup import dedup_csv
+from Imputation import STRATEGIES
+from Export import FILETYPES, write_frames
+from Tasks import run_with_progress
 
 class DataCleaningApp:
     def __init__(self, root, df):
         self.root = root
         self.root.title("\U0001F4CA Interactive Data Cleaning App")
         self.root.geometry("900x1000")
-        self.df = df
+        # Buttons only record steps; the frame is rebuilt when something needs to look at it
+        self.pipeline = Pipeline()
+        self.materialized = df
+        self.applied = 0
+        self.version = 0
+        self.profiled = None  # (version, Profile) of the last profiled frame
 
         self.bg_color = "#e0f7fa"
         self.section_color = "#b2ebf2"
@@ -33,6 +42,14 @@ class DataCleaningApp:
             ("\u2796 Handle Zero/Negative Values", self.zero_negative_values),
             ("\U0001F4C9 Remove Low Variance Columns", self.low_variance_columns),
             ("\U0001F516 Clean Index and Labels", self.clean_index_labels),
+            ("\U0001F4CB Profile Columns", self.show_profile),
+            ("\U0001F5C4️ Dedup Large CSV File", self.dedup_large_file),
+        ])
+
+        self.create_section("\U0001F4DC Cleaning Recipe", [
+            ("\U0001F4DC Show Pipeline", self.show_pipeline),
+            ("\U0001F4E5 Save Recipe", self.save_recipe),
+            ("\U0001F4C2 Load Recipe", self.load_recipe),
         ])
 
         ttk.Button(self.root, text="\U0001F4BE Save File", command=self.save_file).pack(pady=10)
@@ -64,6 +81,43 @@ class DataCleaningApp:
         self.output_text.config(yscrollcommand=scrollbar.set)
         ttk.Button(self.root, text="\U0001F9B9 Clear Output", command=lambda: self.output_text.delete("1.0", "end")).pack(pady=5)
 
+    @property
+    def df(self):
+        # Run only the steps recorded since the last time the frame was needed
+        if self.applied < len(self.pipeline.steps):
+            df = self.pipeline.run(self.materialized, start=self.applied, log=self.log, profile=self.cached_profile())
+            self.applied = len(self.pipeline.steps)
+            if df is not self.materialized:
+                self.materialized = df
+                self.version += 1
+        return self.materialized
+
+    def schema(self):
+        # Columns and dtypes after the queued steps, for dialogs that only need names; never runs the steps
+        return self.pipeline.schema(self.materialized, start=self.applied)
+
+    def cached_profile(self):
+        if self.profiled and self.profiled[0] == self.version:
+            return self.profiled[1]
+        return None
+
+    def ready_profile(self):
+        # Profile of the current frame if one exists and no steps are waiting, so previews never force a run
+        if self.applied == len(self.pipeline.steps):
+            return self.cached_profile()
+        return None
+
+    def profile(self):
+        # One pass gives nulls, distinct counts, ranges and row fingerprints; reused until the frame changes
+        df = self.df
+        if self.cached_profile() is None:
+            self.profiled = (self.version, Profile(df))
+        return self.profiled[1]
+
+    def record(self, op, message, **params):
+        self.pipeline.record(op, **params)
+        self.log(f"[\U0001F4DC] Queued: {message}")
+
     def log(self, message):
         self.output_text.insert("end", message + "\n")
         self.output_text.see("end")
@@ -77,101 +131,271 @@ class DataCleaningApp:
         text.pack(expand=True, fill="both")
 
     def handle_missing_data(self):
-        missing = self.df.isnull().sum()
+        missing = self.profile().nulls
         self.log("[❓] Missing values:\n" + str(missing[missing > 0]))
 
-        options = [
-            "0",
-            "Unknown",
-            "Custom Value",
-            "Previous Value (ffill)",
-            "Next Value (bfill)",
-            "Mode Value"
-        ]
-
-        for col in missing[missing > 0].index:
-            choice = simpledialog.askstring("Missing Value",
-                                            f"Column '{col}' has missing values.\nChoose strategy:\n"
-                                            "0 / Unknown / Custom / ffill / bfill / mode").strip().lower()
-
-            if choice == "0":
-                self.df[col] = self.df[col].fillna(0)
-            elif choice == "unknown":
-                self.df[col] = self.df[col].fillna("Unknown")
-            elif choice == "custom":
-                custom_value = simpledialog.askstring("Custom Value", f"Enter custom value for '{col}':")
-                self.df[col] = self.df[col].fillna(custom_value)
-            elif choice == "ffill":
-                self.df[col] = self.df[col].ffill()  # Forward fill
-            elif choice == "bfill":
-                self.df[col] = self.df[col].bfill()  # Backward fill
-            elif choice == "mode":
-                mode_val = self.df[col].mode()
-                if not mode_val.empty:
-                    self.df[col] = self.df[col].fillna(mode_val[0])
-                else:
-                    self.df[col] = self.df[col].fillna(0)
-            else:
-                self.df[col] = self.df[col].fillna(0)
-                self.log(f"[!] Unknown choice for '{col}', used default (0)")
+        columns = list(missing[missing > 0].index)
+        if not columns:
+            return
+        names = list(self.schema().columns)
+
+        top = tk.Toplevel(self.root)
+        top.title("❓ Handle Missing Data")
+        top.geometry("640x520")
+        top.configure(bg=self.bg_color)
+
+        options = tk.Frame(top, bg=self.bg_color)
+        options.pack(fill="x", padx=10, pady=10)
+        tk.Label(options, text="Set all to:", bg=self.bg_color, fg=self.text_color).grid(row=0, column=0, sticky="w")
+        all_var = tk.StringVar(value="skip")
+        ttk.Combobox(options, textvariable=all_var, values=list(STRATEGIES), state="readonly", width=20).grid(row=0, column=1, padx=10)
+        tk.Label(options, text="Custom uses the value column, group fills use it as the group-by column.",
+                 bg=self.bg_color, fg=self.text_color, font=("Segoe UI", 9, "italic")).grid(row=1, column=0, columnspan=2, sticky="w", pady=5)
 
-        self.log("[✅] Missing values handled with selected strategies.")
+        table = self.create_scroll_table(top, ["Column", "Missing", "Strategy", "Value / Group by"])
+        strategy_vars = {}
+        extra_vars = {}
+        for row, col in enumerate(columns, start=1):
+            tk.Label(table, text=col, bg=self.section_color).grid(row=row, column=0, padx=10, sticky="w")
+            tk.Label(table, text=f"{missing[col]:,}", bg=self.section_color).grid(row=row, column=1, padx=10)
+            strategy_vars[col] = tk.StringVar(value="skip")
+            ttk.Combobox(table, textvariable=strategy_vars[col], values=list(STRATEGIES), state="readonly", width=12).grid(row=row, column=2, padx=10, pady=2)
+            extra_vars[col] = tk.StringVar()
+            ttk.Combobox(table, textvariable=extra_vars[col], values=names, width=18).grid(row=row, column=3, padx=10, pady=2)
+
+        def set_all(*_):
+            for col in columns:
+                strategy_vars[col].set(all_var.get())
+
+        def apply():
+            fills = {}
+            for col in columns:
+                spec = STRATEGIES[strategy_vars[col].get()]
+                if spec is None:
+                    continue
+                spec = dict(spec)
+                extra = extra_vars[col].get()
+                if strategy_vars[col].get() == "custom":
+                    spec["value"] = extra
+                elif spec["strategy"] == "group":
+                    if extra not in names or extra == col:
+                        self.log(f"[!] Pick a group-by column for '{col}', skipped")
+                        continue
+                    spec["by"] = extra
+                fills[col] = spec
+            if fills:
+                self.record("fill", "missing values with selected strategies", fills=fills)
+            top.destroy()
+
+        all_var.trace_add("write", set_all)
+        ttk.Button(top, text="✅ Apply", command=apply).pack(pady=10)
+
+    def create_scroll_table(self, parent, headings):
+        # Scrollable grid for per-column dialogs; rows go in from grid row 1
+        holder = tk.Frame(parent, bg=self.section_color)
+        holder.pack(fill="both", expand=True, padx=10)
+        canvas = tk.Canvas(holder, bg=self.section_color, highlightthickness=0)
+        scrollbar = tk.Scrollbar(holder, command=canvas.yview)
+        table = tk.Frame(canvas, bg=self.section_color)
+        table.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
+        canvas.create_window((0, 0), window=table, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+        canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        for i, heading in enumerate(headings):
+            tk.Label(table, text=heading, font=("Segoe UI", 10, "bold"), bg=self.section_color).grid(row=0, column=i, padx=10, pady=5, sticky="w")
+        return table
 
     def remove_duplicates(self):
-        before = len(self.df)
-        self.df.drop_duplicates(inplace=True)
-        after = len(self.df)
-        self.log(f"[\U0001F9F9] Duplicates removed: {before - after}")
+        message = "remove duplicates"
+        profile = self.ready_profile()
+        if profile is not None:
+            message += f" (~{int(profile.duplicate_candidates().sum())} duplicate rows)"
+        self.record("drop_duplicates", message)
+
+    def dedup_large_file(self):
+        # Works file to file in a fixed memory budget, for CSVs too large to load here
+        input_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")], title="CSV file to deduplicate")
+        if not input_path:
+            return
+        subset = simpledialog.askstring("Key Columns", "Comma separated key columns (leave empty for all columns):", parent=self.root)
+        if subset is None:
+            return
+        keep = simpledialog.askstring("Keep", "Keep which duplicate? first / last", initialvalue="first", parent=self.root)
+        if keep is None:
+            return
+        keep = keep.strip().lower()
+        if keep not in ("first", "last"):
+            self.log(f"[!] Unknown choice '{keep}', keeping the first duplicate")
+            keep = "first"
+        output_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")],
+                                                   title="Save deduplicated file")
+        if not output_path:
+            return
+        if os.path.abspath(output_path) == os.path.abspath(input_path):
+            messagebox.showerror("Error", "Please choose a different output file.")
+            return
+        subset = [col.strip() for col in subset.split(",") if col.strip()] or None
+        name = os.path.basename(input_path)
+
+        def describe(info):
+            return f"{info['stage']}, {info['rows']:,} rows"
+
+        def on_done(result):
+            self.log(f"[\U0001F9F9] Duplicates removed from {name}: {result['removed']:,} of {result['rows']:,} rows "
+                     f"-> {os.path.basename(output_path)}")
+
+        def on_error(e):
+            messagebox.showerror("Error", f"Duplicate removal failed:\n{e}")
+
+        def on_cancel():
+            self.log(f"[\U0001F9F9] Duplicate removal for {name} cancelled.")
+
+        run_with_progress(self.root, "Removing Duplicates", f"\U0001F9F9 {name}:",
+                          lambda task: dedup_csv(input_path, output_path, subset, keep, task=task),
+                          on_done, on_error, on_cancel, describe)
 
     def handle_outliers(self):
-        numeric_cols = self.df.select_dtypes(include=[np.number]).columns
-        handled_cols = []
-        for col in numeric_cols:
-            q1, q3 = self.df[col].quantile([0.25, 0.75])
-            iqr = q3 - q1
-            lower, upper = q1 - 1.5 * iqr, q3 + 1.5 * iqr
-            outliers = self.df[(self.df[col] < lower) | (self.df[col] > upper)][col]
-            if not outliers.empty:
-                action = simpledialog.askstring("Outliers", f"Outliers in '{col}'. Action? (remove/positive/zero):")
-                if action == 'remove':
-                    self.df = self.df[~self.df[col].isin(outliers)]
-                elif action == 'positive':
-                    self.df[col] = self.df[col].apply(lambda x: abs(x) if x in outliers else x)
-                elif action == 'zero':
-                    self.df[col] = self.df[col].apply(lambda x: 0 if x in outliers else x)
-                handled_cols.append(col)
-        if handled_cols:
-            self.log(f"[⚠️] Outliers handled in columns: {', '.join(handled_cols)}")
-        else:
-            self.log("[⚠️] No outliers found.")
+        columns = numeric_columns(self.schema())
+        if not columns:
+            self.log("[⚠️] No numeric columns to check for outliers.")
+            return
+
+        top = tk.Toplevel(self.root)
+        top.title("\U0001F4CA Handle Outliers")
+        top.geometry("560x520")
+        top.configure(bg=self.bg_color)
+
+        options = tk.Frame(top, bg=self.bg_color)
+        options.pack(fill="x", padx=10, pady=10)
+        tk.Label(options, text="Detection method:", bg=self.bg_color, fg=self.text_color).grid(row=0, column=0, sticky="w")
+        method_var = tk.StringVar(value=list(METHODS)[0])
+        ttk.Combobox(options, textvariable=method_var, values=list(METHODS), state="readonly", width=25).grid(row=0, column=1, padx=10)
+        tk.Label(options, text="Set all to:", bg=self.bg_color, fg=self.text_color).grid(row=1, column=0, sticky="w", pady=5)
+        all_var = tk.StringVar(value="skip")
+        ttk.Combobox(options, textvariable=all_var, values=ACTIONS, state="readonly", width=25).grid(row=1, column=1, padx=10)
+
+        table = self.create_scroll_table(top, ["Column", "Outliers", "Action"])
+        count_labels = {}
+        action_vars = {}
+        for row, col in enumerate(columns, start=1):
+            tk.Label(table, text=col, bg=self.section_color).grid(row=row, column=0, padx=10, sticky="w")
+            count_labels[col] = tk.Label(table, text="", bg=self.section_color)
+            count_labels[col].grid(row=row, column=1, padx=10)
+            action_vars[col] = tk.StringVar(value="skip")
+            ttk.Combobox(table, textvariable=action_vars[col], values=ACTIONS, state="readonly", width=12).grid(row=row, column=2, padx=10, pady=2)
+
+        counts = {}  # Per method, so switching back and forth does not recompute the bounds
+
+        def refresh(*_):
+            method = METHODS[method_var.get()]
+            if method not in counts:
+                df = self.df
+                present = [col for col in columns if col in df.columns]  # Low variance steps may drop some
+                counts[method] = count_outliers(df, compute_bounds(df, present, method))
+            for col in columns:
+                count = counts[method].get(col)
+                count_labels[col].config(text="-" if count is None else f"{count:,}")
+
+        def set_all(*_):
+            for col in columns:
+                action_vars[col].set(all_var.get())
+
+        def apply():
+            actions = {col: var.get() for col, var in action_vars.items() if var.get() != "skip"}
+            if actions:
+                self.record("outliers", "handle outliers", method=METHODS[method_var.get()], actions=actions)
+            else:
+                self.log("[⚠️] No outlier actions selected.")
+            top.destroy()
+
+        method_var.trace_add("write", refresh)
+        all_var.trace_add("write", set_all)
+        ttk.Button(top, text="✅ Apply", command=apply).pack(pady=10)
+        refresh()
 
     def feature_engineering(self):
-        nums = self.df.select_dtypes(include=[np.number]).columns
-        if len(nums) >= 2:
-            self.df['Total'] = self.df[nums].sum(axis=1)
-            self.log("[✨] Feature 'Total' added.")
+        self.record("add_total", "add 'Total' feature")
 
     def zero_negative_values(self):
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore", category=FutureWarning)
-            numeric_cols = self.df.select_dtypes(include=[np.number]).columns
-            self.df[numeric_cols] = self.df[numeric_cols].apply(lambda col: np.where(col < 0, 0, col))
-        self.log("[0️⃣] Negative values replaced with 0.")
+        self.record("zero_negative", "replace negative values with 0")
 
     def low_variance_columns(self):
-        drop = [col for col in self.df.columns if self.df[col].nunique() == 1]
-        self.df.drop(columns=drop, inplace=True)
-        self.log(f"[\U0001F4C9] Dropped low variance columns: {drop}")
+        message = "drop low variance columns"
+        profile = self.ready_profile()
+        if profile is not None:
+            message += f" (candidates: {profile.constant_candidates})"
+        self.record("drop_low_variance", message)
 
     def clean_index_labels(self):
-        self.df.columns = self.df.columns.str.strip().str.lower().str.replace(' ', '_')
-        self.df.reset_index(drop=True, inplace=True)
-        self.log("[\U0001F516] Index and labels cleaned.")
+        self.record("clean_labels", "clean index and labels")
+
+    def show_profile(self):
+        self.log("[\U0001F4CB] Column profile:\n" + self.profile().summary().to_string())
+
+    def show_pipeline(self):
+        steps = self.pipeline.describe()
+        if not steps:
+            self.log("[\U0001F4DC] No cleaning steps recorded yet.")
+            return
+        self.log("[\U0001F4DC] Cleaning pipeline:\n" + "\n".join(f"  {i}. {step}" for i, step in enumerate(steps, start=1)))
+
+    def save_recipe(self):
+        file_path = filedialog.asksaveasfilename(defaultextension=".json",
+                                                 filetypes=[("Cleaning recipe", "*.json")],
+                                                 title="Save cleaning recipe")
+        if file_path:
+            self.pipeline.save(file_path)
+            self.log(f"[\U0001F4DC] Recipe saved: {os.path.basename(file_path)}")
+
+    def load_recipe(self):
+        file_path = filedialog.askopenfilename(filetypes=[("Cleaning recipe", "*.json")], title="Load cleaning recipe")
+        if not file_path:
+            return
+        try:
+            recipe = Pipeline.load(file_path)
+        except (OSError, ValueError, KeyError) as e:
+            messagebox.showerror("Error", f"Could not load recipe:\n{e}")
+            return
+        self.pipeline.steps.extend(recipe.steps)
+        self.log(f"[\U0001F4DC] Recipe loaded: {os.path.basename(file_path)} ({len(recipe.steps)} steps queued)")
 
     def save_file(self):
         file_path = filedialog.asksaveasfilename(defaultextension=".csv",
-                                                 filetypes=[("CSV files", "*.csv")],
+                                                 filetypes=FILETYPES,
                                                  title="Save cleaned DataFrame")
-        if file_path:
-            self.df.to_csv(file_path, index=False)
-            self.log(f"[💾] File saved: {os.path.basename(file_path)}")
+        if not file_path:
+            return
+        name = os.path.basename(file_path)
+        # Queued steps run in the worker along with the write; the result is kept unless the frame was rebuilt meanwhile
+        source, start, end = self.materialized, self.applied, len(self.pipeline.steps)
+        pending = Pipeline(self.pipeline.steps[start:end])
+        profile = self.cached_profile()
+        messages = []
+
+        def work(task):
+            df = pending.run(source, log=messages.append, profile=profile)
+            write_frames([(df, file_path)], task)
+            return df
+
+        def on_done(df):
+            for message in messages:
+                self.log(message)
+            if self.materialized is source and self.applied == start:
+                self.applied = end
+                if df is not source:
+                    self.materialized = df
+                    self.version += 1
+            self.log(f"[💾] File saved: {name}")
+
+        def on_error(e):
+            messagebox.showerror("Error", f"Failed to save file:\n{e}")
+
+        def on_cancel():
+            self.log(f"[💾] Saving {name} cancelled.")
+
+        def describe(info):
+            return f"{info['rows']:,} of {info['total']:,} rows"
+
+        run_with_progress(self.root, "Saving File", f"💾 {name}:",
+                          work, on_done, on_error, on_cancel, describe)
@@ -0,0 +1,202 @@
+# --- ClusterModels.py ---
+import os
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+MINIBATCH_ROWS = 100000  # Above this many rows full-batch KMeans is swapped for MiniBatchKMeans
+MINIBATCH_TOL = 1e-6  # Stops mini-batches once the centres settle; the inertia test alone misses it on 1-column data
+MAX_CATEGORIES = 50  # Text columns with more distinct values than this are not offered for one-hot encoding
+RANDOM_STATE = 42
+EXACT_LINKAGE_ROWS = 5000  # Up to this many rows Ward linkage runs on the rows themselves
+MICRO_CLUSTERS = 2000
+DENDROGRAM_LEAVES = 30
+SWEEP_SAMPLE_ROWS = 50000  # Auto K scores candidates on a stratified sample of this size
+SILHOUETTE_ROWS = 5000  # Silhouette is quadratic, so it is scored on a subsample
+STRATA = 10
+MAX_WORKERS = max(1, min(8, (os.cpu_count() or 1)))
+MODEL_CACHE_SIZE = 16
+
+
+def candidate_columns(df):
+    # Numeric columns plus text/categorical columns small enough to one-hot encode
+    numeric = list(df.select_dtypes(include=[np.number]).columns)
+    categorical = [col for col in df.columns if col not in numeric and df[col].nunique() <= MAX_CATEGORIES]
+    return numeric, categorical
+
+
+class FeatureMatrix:
+    # Standardized float32 design matrix over the selected columns; rows with a missing value are left out
+    def __init__(self, df, columns):
+        self.columns = list(columns)
+        numeric = [col for col in self.columns if pd.api.types.is_numeric_dtype(df[col])]
+        categorical = [col for col in self.columns if col not in numeric]
+        data = df[self.columns].dropna()
+        self.index = data.index
+
+        block = data[numeric].to_numpy(dtype=np.float32)
+        self.mean = block.mean(axis=0) if len(block) else np.zeros(len(numeric), dtype=np.float32)
+        self.scale = block.std(axis=0) if len(block) else np.ones(len(numeric), dtype=np.float32)
+        self.scale[self.scale == 0] = 1
+        parts = [(block - self.mean) / self.scale]
+        self.names = list(numeric)
+        for col in categorical:
+            dummies = pd.get_dummies(data[col], prefix=col, dtype=np.float32)
+            parts.append(dummies.to_numpy())
+            self.names.extend(dummies.columns)
+        self.numeric = numeric
+        self.X = np.ascontiguousarray(np.hstack(parts), dtype=np.float32)
+
+    def unscale(self, centers):
+        # Cluster centres back in the original units of the numeric columns
+        centers = np.array(centers, dtype=np.float64)
+        count = len(self.numeric)
+        centers[:, :count] = centers[:, :count] * self.scale + self.mean
+        return pd.DataFrame(centers, columns=self.names)
+
+
+def make_kmeans(k, rows):
+    from sklearn.cluster import KMeans, MiniBatchKMeans
+
+    if rows > MINIBATCH_ROWS:
+        # Mini-batches keep the cost per iteration fixed; k-means++ seeding on a sample of the data
+        return MiniBatchKMeans(n_clusters=k, batch_size=max(4096, 256 * k), n_init=3,
+                               init_size=min(rows, max(3 * k, 100000)), tol=MINIBATCH_TOL,
+                               random_state=RANDOM_STATE)
+    return KMeans(n_clusters=k, n_init=10, random_state=RANDOM_STATE)
+
+
+def fit_kmeans(features, k):
+    model = make_kmeans(k, len(features.X))
+    labels = model.fit_predict(features.X)
+    return model, pd.Series(labels, index=features.index)
+
+
+def fit_hierarchical(features, k):
+    # Ward linkage on the rows when that is affordable, otherwise on k-means micro-cluster centroids,
+    # so memory stays bounded by MICRO_CLUSTERS² instead of rows²; returns (linkage matrix, labels)
+    from scipy.cluster.hierarchy import fcluster, linkage
+
+    X = features.X
+    if len(X) <= EXACT_LINKAGE_ROWS:
+        linkage_matrix = linkage(X, method='ward')
+        labels = fcluster(linkage_matrix, k, criterion='maxclust')
+        return linkage_matrix, pd.Series(labels, index=features.index)
+
+    from sklearn.cluster import MiniBatchKMeans
+    micro_count = max(k, min(MICRO_CLUSTERS, len(X) // 4))
+    micro = MiniBatchKMeans(n_clusters=micro_count, batch_size=8192, n_init=1,
+                            init_size=min(len(X), 3 * micro_count), random_state=RANDOM_STATE).fit(X)
+    used = np.unique(micro.labels_)  # Micro-clusters that ended up empty are left out of the tree
+    linkage_matrix = linkage(micro.cluster_centers_[used].astype(np.float64), method='ward')
+    top = fcluster(linkage_matrix, k, criterion='maxclust')
+    lookup = np.zeros(micro_count, dtype=top.dtype)
+    lookup[used] = top
+    return linkage_matrix, pd.Series(lookup[micro.labels_], index=features.index)
+
+
+def stratified_sample(features, size, seed=RANDOM_STATE):
+    # Same share from each decile of the first feature, so tails are not lost in the sample
+    X = features.X
+    if len(X) <= size:
+        return X
+    ranks = np.argsort(np.argsort(X[:, 0], kind="stable"), kind="stable")
+    strata = ranks * STRATA // len(X)
+    rng = np.random.default_rng(seed)
+    picked = []
+    for stratum in range(STRATA):
+        rows = np.flatnonzero(strata == stratum)
+        picked.append(rng.choice(rows, max(1, round(size * len(rows) / len(X))), replace=False))
+    return X[np.sort(np.concatenate(picked))]
+
+
+_sweep_X = None
+
+
+def _init_sweep_worker(X):
+    global _sweep_X
+    _sweep_X = X
+
+
+def score_k(k, X=None):
+    from sklearn.metrics import davies_bouldin_score, silhouette_score
+
+    X = _sweep_X if X is None else X
+    model = make_kmeans(k, len(X))
+    labels = model.fit_predict(X)
+    return {
+        "k": k,
+        "inertia": float(model.inertia_),
+        "silhouette": float(silhouette_score(X, labels, sample_size=min(SILHOUETTE_ROWS, len(X)),
+                                             random_state=RANDOM_STATE)),
+        "davies_bouldin": float(davies_bouldin_score(X, labels)),
+    }
+
+
+def elbow_k(results):
+    # Point of the inertia curve farthest from the straight line between its ends
+    k = results["k"].to_numpy(dtype=np.float64)
+    inertia = results["inertia"].to_numpy(dtype=np.float64)
+    if len(k) < 3:
+        return int(k[0])
+    x = (k - k[0]) / (k[-1] - k[0])
+    y = (inertia - inertia[-1]) / max(inertia[0] - inertia[-1], 1e-12)
+    return int(k[np.argmax(np.abs(1 - x - y))])
+
+
+def sweep_k(features, k_values, task=None, sample_rows=SWEEP_SAMPLE_ROWS, max_workers=MAX_WORKERS):
+    # Scores every K on the sample, spread over processes; returns (results table, chosen K)
+    X = stratified_sample(features, sample_rows)
+    k_values = [k for k in k_values if 2 <= k < len(X)]
+    if not k_values:
+        raise ValueError("No usable K in that range for this many rows.")
+    rows = []
+
+    def collect(row):
+        rows.append(row)
+        if task:
+            task.check_cancelled()
+            task.report(done=len(rows), total=len(k_values), unit="K values", rows=len(X))
+
+    if max_workers > 1 and len(k_values) > 1:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        with ProcessPoolExecutor(min(max_workers, len(k_values)), initializer=_init_sweep_worker,
+                                 initargs=(X,)) as pool:
+            futures = [pool.submit(score_k, k) for k in k_values]
+            try:
+                for future in as_completed(futures):
+                    collect(future.result())
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+    else:
+        for k in k_values:
+            collect(score_k(k, X))
+
+    results = pd.DataFrame(rows).sort_values("k").reset_index(drop=True)
+    results["elbow"] = results["k"] == elbow_k(results)
+    # Best average rank of silhouette (higher is better) and Davies-Bouldin (lower is better)
+    rank = results["silhouette"].rank(ascending=False) + results["davies_bouldin"].rank()
+    return results, int(results.loc[rank.idxmin(), "k"])
+
+
+class ModelCache:
+    # Fitted K-Means models per (columns, K, dataset version), least recently used dropped first
+    def __init__(self, size=MODEL_CACHE_SIZE):
+        self.size = size
+        self.entries = OrderedDict()
+
+    def fit(self, features, k, version):
+        key = (tuple(features.columns), k, version)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return self.entries[key] + (True,)
+        result = fit_kmeans(features, k)
+        self.entries[key] = result
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+        return result + (False,)
+
+
+MODEL_CACHE = ModelCache()
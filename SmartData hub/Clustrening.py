@@ -1,17 +1,23 @@
+import time
 import tkinter as tk
 from tkinter import messagebox, ttk, filedialog
-import pandas as pd
-from sklearn.cluster import KMeans
-from scipy.cluster.hierarchy import linkage, fcluster, dendrogram
-import matplotlib.pyplot as plt
-import numpy as np
+from scipy.cluster.hierarchy import dendrogram
+from matplotlib import colormaps
+from ClusterModels import (DENDROGRAM_LEAVES, EXACT_LINKAGE_ROWS, MINIBATCH_ROWS, MODEL_CACHE, FeatureMatrix,
+                           candidate_columns, fit_hierarchical, sweep_k)
+import Rendering
+from ChartPanel import ChartPanel
+from Export import FILETYPES, split_extension, write_partitioned
+from Tasks import run_with_progress
 
 class ClusteringApp:
-    def __init__(self, root, df):
+    def __init__(self, root, df, version=0):
         self.root = root
         self.df = df
+        self.version = version  # Dataset version, part of the fitted-model cache key
+        self.features = None
         self.root.title("✨ CSV Clustering App ✨")
-        self.root.geometry("600x430")
+        self.root.geometry("1200x680")
         self.root.configure(bg="#f0f4f7")
         self.root.resizable(True, True)
 
@@ -23,11 +29,19 @@ class ClusteringApp:
         self.style.map("TButton", background=[("active", "#e6f2ff")], foreground=[("active", "#005a9e")])
 
         main_frame = ttk.Frame(root, padding=20, style="TFrame")
-        main_frame.pack(fill="both", expand=True)
+        main_frame.pack(side="left", fill="y")
 
-        ttk.Label(main_frame, text="Select column for clustering:").pack(anchor="w", pady=(10, 0))
-        self.column_dropdown = ttk.Combobox(main_frame, state="readonly")
-        self.column_dropdown.pack(fill="x", pady=5)
+        self.chart = ChartPanel(root, bg="#f0f4f7")
+        self.chart.pack(side="left", fill="both", expand=True, padx=10, pady=10)
+
+        ttk.Label(main_frame, text="Select columns for clustering (categorical columns are one-hot encoded):").pack(anchor="w", pady=(10, 0))
+        list_frame = ttk.Frame(main_frame)
+        list_frame.pack(fill="both", expand=True, pady=5)
+        self.column_list = tk.Listbox(list_frame, selectmode="multiple", exportselection=False, height=8)
+        list_scroll = ttk.Scrollbar(list_frame, command=self.column_list.yview)
+        self.column_list.config(yscrollcommand=list_scroll.set)
+        self.column_list.pack(side="left", fill="both", expand=True)
+        list_scroll.pack(side="right", fill="y")
 
         ttk.Label(main_frame, text="Enter number of clusters (K):").pack(anchor="w", pady=(10, 0))
         vcmd = (root.register(lambda P: P.isdigit() or P == ""), "%P")
@@ -39,76 +53,181 @@ class ClusteringApp:
         self.cluster_type.pack(fill="x", pady=5)
         self.cluster_type.set("K-Means")
 
-        cluster_btn = ttk.Button(main_frame, text="🔍 Perform Clustering", command=self.perform_clustering)
-        cluster_btn.pack(pady=20)
+        ttk.Label(main_frame, text="Auto K range (e.g. 2-10):").pack(anchor="w", pady=(10, 0))
+        self.k_range_entry = ttk.Entry(main_frame)
+        self.k_range_entry.insert(0, "2-10")
+        self.k_range_entry.pack(fill="x", pady=5)
+
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(pady=20)
+        cluster_btn = ttk.Button(button_frame, text="🔍 Perform Clustering", command=self.perform_clustering)
+        cluster_btn.pack(side="left", padx=5)
+        auto_btn = ttk.Button(button_frame, text="🎯 Auto K", command=self.auto_k)
+        auto_btn.pack(side="left", padx=5)
 
         self.status_label = ttk.Label(root, text="Data loaded. Ready for clustering.", relief="sunken", anchor="w", background="#e0e0e0")
-        self.status_label.pack(fill="x", side="bottom")
+        self.status_label.pack(fill="x", side="bottom", before=main_frame)
 
-        numeric_cols = self.df.select_dtypes(include=[np.number]).columns.tolist()
-        self.column_dropdown["values"] = numeric_cols
+        numeric_cols, categorical_cols = candidate_columns(self.df)
+        self.columns = numeric_cols + categorical_cols
+        for col in numeric_cols:
+            self.column_list.insert("end", col)
+        for col in categorical_cols:
+            self.column_list.insert("end", f"{col} (categorical)")
         if numeric_cols:
-            self.column_dropdown.set(numeric_cols[0])
+            self.column_list.selection_set(0)
+
+    def selected_columns(self):
+        return [self.columns[i] for i in self.column_list.curselection()]
+
+    def feature_matrix(self, columns):
+        # Reused while the selection stays the same, so switching K does not rebuild it
+        if self.features is None or self.features.columns != columns:
+            self.features = FeatureMatrix(self.df, columns)
+        return self.features
+
+    def auto_k(self):
+        columns = self.selected_columns()
+        try:
+            low, high = (int(part) for part in self.k_range_entry.get().split("-"))
+        except ValueError:
+            messagebox.showerror("Error", "Enter the K range as two numbers, e.g. 2-10")
+            return
+        if not columns or low < 2 or high < low:
+            messagebox.showerror("Error", "Please select columns and a K range starting at 2 or more.")
+            return
+
+        def on_done(result):
+            results, best_k = result
+            self.show_sweep(results, best_k)
+            self.k_entry.delete(0, "end")
+            self.k_entry.insert(0, str(best_k))
+            self.cluster_type.set("K-Means")
+            self.perform_clustering()
+
+        def on_error(e):
+            messagebox.showerror("Error", f"Auto K failed:\n{e}")
+
+        def describe(info):
+            return f"{info['done']} of {info['total']} K values scored"
+
+        run_with_progress(self.root, "Auto K", "🎯 Scoring K values:",
+                          lambda task: sweep_k(self.feature_matrix(columns), range(low, high + 1), task),
+                          on_done, on_error, describe=describe)
+
+    def show_sweep(self, results, best_k):
+        top = tk.Toplevel(self.root)
+        top.title("🎯 Auto K Results")
+        top.geometry("520x320")
+        columns = ["K", "Inertia", "Silhouette", "Davies-Bouldin", "Note"]
+        tree = ttk.Treeview(top, columns=columns, show="headings")
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=95, anchor="center")
+        for row in results.itertuples():
+            note = "chosen" if row.k == best_k else ""
+            if row.elbow:
+                note = f"{note}, elbow" if note else "elbow"
+            tree.insert("", "end", values=[row.k, f"{row.inertia:,.1f}", f"{row.silhouette:.3f}",
+                                           f"{row.davies_bouldin:.3f}", note])
+        tree.pack(fill="both", expand=True, padx=10, pady=10)
+        ttk.Label(top, text="Scored on a stratified sample; the chosen K has the best silhouette and Davies-Bouldin ranks.").pack(pady=5)
 
     def perform_clustering(self):
-        column = self.column_dropdown.get()
+        columns = self.selected_columns()
         cluster_type = self.cluster_type.get()
         k_value = self.k_entry.get()
 
-        if not column or not cluster_type or not k_value.isdigit():
+        if not columns or not cluster_type or not k_value.isdigit():
             messagebox.showerror("Error", "Please fill all fields correctly!")
             return
 
         k_value = int(k_value)
-        data = self.df[[column]].dropna().astype(float)
+        k_means = cluster_type == "K-Means"
+
+        def work(task):
+            # The feature matrix and the fit run off the Tk thread; a cancel takes effect once the fit returns
+            features = self.feature_matrix(columns)
+            if len(features.X) < max(k_value, 2):
+                raise ValueError("Not enough complete rows for that many clusters.")
+            start = time.perf_counter()
+            if k_means:
+                result = MODEL_CACHE.fit(features, k_value, self.version)
+            else:
+                result = fit_hierarchical(features, k_value)
+            task.check_cancelled()
+            return features, result, time.perf_counter() - start
 
-        if cluster_type == "K-Means":
-            self.k_means_clustering(data, column, k_value)
+        def on_done(outcome):
+            features, result, elapsed = outcome
+            if k_means:
+                self.k_means_clustering(features, k_value, *result, elapsed)
+            else:
+                self.hierarchical_clustering(features, k_value, *result, elapsed)
+            self.save_result()
+
+        def on_error(e):
+            messagebox.showerror("Error", f"Clustering failed:\n{e}")
+
+        run_with_progress(self.root, "Clustering", f"🔍 Fitting {cluster_type} on {', '.join(columns)}...",
+                          work, on_done, on_error)
+
+    def k_means_clustering(self, features, k_value, model, cluster_labels, cached, elapsed):
+        self.df.loc[cluster_labels.index, 'Cluster'] = cluster_labels
+        algorithm = "MiniBatchKMeans" if len(features.X) > MINIBATCH_ROWS else "KMeans"
+        self.status_label.config(text=f"{algorithm} on {len(features.X):,} rows x {features.X.shape[1]} features: "
+                                      f"inertia {model.inertia_:,.1f} " + ("(cached)" if cached else f"in {elapsed:.2f}s"))
+        centers = features.unscale(model.cluster_centers_)
+
+        ax = self.chart.start("clusters")
+        cmap = colormaps['tab10']
+        labels = cluster_labels.to_numpy()
+        shown = Rendering.sample_by_label(labels)  # Large results are drawn from a per-cluster sample
+        if len(features.numeric) >= 2:
+            x_col, y_col = features.numeric[:2]
+            x = self.df.loc[features.index, x_col].to_numpy()[shown]
+            y = self.df.loc[features.index, y_col].to_numpy()[shown]
+            for i in range(k_value):
+                points = labels[shown] == i
+                ax.scatter(x[points], y[points], color=cmap(i % 10), s=8, label=f'Cluster {i}')
+                ax.scatter(centers.at[i, x_col], centers.at[i, y_col], color='black', marker='x', s=100)
+            ax.set_xlabel(x_col)
+            ax.set_ylabel(y_col)
         else:
-            self.hierarchical_clustering(data, column, k_value)
-
-        self.save_result()
-
-    def k_means_clustering(self, data, column, k_value):
-        kmeans = KMeans(n_clusters=k_value, n_init=10, random_state=42)
-        cluster_labels = kmeans.fit_predict(data)
-        self.df.loc[data.index, 'Cluster'] = cluster_labels
-        centers = kmeans.cluster_centers_
-
-        plt.figure(figsize=(10, 5))
-        cmap = plt.get_cmap('tab10')
-        for i in range(k_value):
-            color = cmap(i % 10)
-            cluster_points = data.loc[self.df['Cluster'] == i]
-            plt.scatter(cluster_points[column], [0] * len(cluster_points), color=color, label=f'Cluster {i}')
-            plt.scatter(centers[i], 0, color='black', marker='x', s=100)
-            plt.axvline(x=centers[i], color=color, linestyle='dashed')
-
-        plt.title(f'K-Means Clustering on {column}')
-        plt.xlabel(column)
-        plt.yticks([])
-        plt.grid(True)
-        plt.tight_layout()
-        plt.legend()
-        plt.show()
-
-    def hierarchical_clustering(self, data, column, k_value):
-        linkage_matrix = linkage(data, method='ward')
-        cluster_labels = fcluster(linkage_matrix, k_value, criterion='maxclust')
-        self.df.loc[data.index, 'Cluster'] = cluster_labels
-
-        plt.figure(figsize=(10, 6))
-        dendrogram(linkage_matrix, labels=data.index)
-        plt.title(f'Hierarchical Clustering on {column}')
-        plt.xlabel("Data Points")
-        plt.ylabel("Distance")
-        plt.tight_layout()
-        plt.show()
+            column = features.names[0]
+            values = self.df.loc[features.index, column].to_numpy() if features.numeric else features.X[:, 0]
+            values = values[shown]
+            for i in range(k_value):
+                color = cmap(i % 10)
+                cluster_points = values[labels[shown] == i]
+                ax.scatter(cluster_points, [0] * len(cluster_points), color=color, label=f'Cluster {i}')
+                ax.scatter(centers.at[i, column], 0, color='black', marker='x', s=100)
+                ax.axvline(x=centers.at[i, column], color=color, linestyle='dashed')
+            ax.set_xlabel(column)
+            ax.set_yticks([])
+
+        ax.set_title(f'K-Means Clustering on {", ".join(features.columns)}')
+        ax.grid(True)
+        ax.legend()
+        self.chart.finish()
+
+    def hierarchical_clustering(self, features, k_value, linkage_matrix, cluster_labels, elapsed):
+        self.df.loc[cluster_labels.index, 'Cluster'] = cluster_labels
+        mode = "rows" if len(features.X) <= EXACT_LINKAGE_ROWS else "micro-cluster centroids"
+        self.status_label.config(text=f"Ward linkage on {mode} ({len(features.X):,} rows) in {elapsed:.2f}s")
+
+        # Only the last merges are drawn; leaf labels show how many points each branch holds
+        ax = self.chart.start("dendrogram")
+        dendrogram(linkage_matrix, truncate_mode='lastp', p=DENDROGRAM_LEAVES, show_leaf_counts=True, ax=ax)
+        ax.set_title(f'Hierarchical Clustering on {", ".join(features.columns)}')
+        ax.set_xlabel("Cluster size" if mode == "rows" else "Micro-clusters per branch")
+        ax.set_ylabel("Distance")
+        self.chart.finish()
 
     def save_result(self):
         base_path = filedialog.asksaveasfilename(
             defaultextension=".csv",
-            filetypes=[("CSV files", "*.csv"), ("Excel files", "*.xlsx")],
+            filetypes=FILETYPES,
             title="Save clustered data - base name only"
         )
 
@@ -116,23 +235,26 @@ class ClusteringApp:
             return
 
         # Remove extension from base name
-        if base_path.endswith(".csv"):
-            ext = ".csv"
-            base_path = base_path[:-4]
-        elif base_path.endswith(".xlsx"):
-            ext = ".xlsx"
-            base_path = base_path[:-5]
-        else:
-            ext = ".csv"  # Default
+        base_path, ext = split_extension(base_path)
 
-        try:
-            for label in sorted(self.df['Cluster'].unique()):
-                cluster_df = self.df[self.df['Cluster'] == label]
-                filename = f"{base_path}_Cluster{label}{ext}"
-                if ext == ".csv":
-                    cluster_df.to_csv(filename, index=False)
-                else:
-                    cluster_df.to_excel(filename, index=False)
-            messagebox.showinfo("Saved", f"Clustered files saved with base name:\n{base_path}_ClusterX{ext}")
-        except Exception as e:
+        # A single Hive-style dataset (base/Cluster=<label>/part-0.parquet) instead of one file per cluster
+        hive = ext == ".parquet" and messagebox.askyesno(
+            "Parquet Dataset", "Write one partitioned Parquet dataset folder instead of separate files?")
+        df = self.df
+        clusters = df['Cluster'].nunique()
+        target = base_path if hive else f"{base_path}_ClusterX{ext}"
+
+        def on_done(_):
+            self.status_label.config(text=f"Saved {clusters} clusters.")
+            messagebox.showinfo("Saved", f"Clustered data saved to:\n{target}")
+
+        def on_error(e):
             messagebox.showerror("Save Error", f"Error saving clustered files:\n{str(e)}")
+
+        def describe(info):
+            return f"{info['rows']:,} of {info['total']:,} rows"
+
+        # Rows are grouped by cluster in one sort and the files are written side by side in the background
+        run_with_progress(self.root, "Saving Clusters", "💾 Saving clusters:",
+                          lambda task: write_partitioned(df, 'Cluster', base_path, ext, task, hive),
+                          on_done, on_error, describe=describe)
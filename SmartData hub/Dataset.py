@@ -0,0 +1,43 @@
+# --- Dataset.py ---
+import pandas as pd
+
+
+def enable_copy_on_write():
+    # pandas >= 3 always uses Copy-on-Write, pandas 2.x needs the option switched on
+    major = int(pd.__version__.split(".")[0])
+    if major >= 3:
+        return True
+    if major == 2:
+        pd.set_option("mode.copy_on_write", True)
+        return True
+    return False
+
+
+COPY_ON_WRITE = enable_copy_on_write()
+
+
+class SharedDataset:
+    def __init__(self, df=None):
+        self._df = df
+        self.version = 0 if df is None else 1
+
+    @property
+    def frame(self):
+        return self._df
+
+    def is_empty(self):
+        return self._df is None
+
+    def publish(self, df):
+        # Swap in a new frame in one assignment so windows never see a half-loaded dataset
+        self._df = df
+        self.version += 1
+
+    def checkout(self, writable=False):
+        # With Copy-on-Write a shallow copy shares every column buffer until a window writes to it,
+        # and then only the written columns are copied.
+        if self._df is None:
+            return None
+        if COPY_ON_WRITE or not writable:
+            return self._df.copy(deep=False)
+        return self._df.copy()
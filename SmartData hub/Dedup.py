@@ -0,0 +1,129 @@
+# --- Dedup.py ---
+import os
+import pickle
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+
+CHUNK_ROWS = 200000
+MEMORY_BUDGET = 512 * 1024 * 1024  # Bytes one partition may take once loaded
+MIN_PARTITIONS = 16
+
+
+def hash_rows(df, subset=None):
+    # 64-bit fingerprint per row over the key columns, computed for a whole chunk at once
+    keys = df if subset is None else df[subset]
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+
+def partition_count(file_size, memory_budget=MEMORY_BUDGET):
+    # Enough hash partitions that one of them fits in the budget, rounded up to a power of two
+    needed = max(MIN_PARTITIONS, int(np.ceil(2 * file_size / memory_budget)))
+    return 1 << int(np.ceil(np.log2(needed)))
+
+
+def _read_chunks(file_path, chunk_rows):
+    # Everything stays text so equal rows hash alike in every chunk and are written back unchanged
+    return pd.read_csv(file_path, dtype=str, keep_default_na=False, na_filter=False, chunksize=chunk_rows)
+
+
+def _progress(task, handle, total, stage, rows):
+    if task:
+        task.check_cancelled()
+        task.report(done=handle.tell() if handle else 0, total=total, unit="bytes", stage=stage, rows=rows)
+
+
+def dedup_csv(input_path, output_path, subset=None, keep="first", memory_budget=MEMORY_BUDGET,
+              chunk_rows=CHUNK_ROWS, task=None):
+    # Three streaming passes: spill rows to hash partitions, dedup each partition, then write survivors in input order
+    if keep not in ("first", "last"):
+        raise ValueError("keep must be 'first' or 'last'")
+    total = os.path.getsize(input_path)
+    partitions = partition_count(total, memory_budget)
+    shift = np.uint64(64 - int(np.log2(partitions)))
+    spill_dir = tempfile.mkdtemp(prefix="smartdata_dedup_")
+    try:
+        # Pass 1: route every row to the spill file of its hash prefix
+        spills = [open(os.path.join(spill_dir, f"{i}.pkl"), "wb") for i in range(partitions)]
+        rows = 0
+        with open(input_path, "rb") as handle:
+            try:
+                for chunk in _read_chunks(handle, chunk_rows):
+                    if subset:
+                        missing = [col for col in subset if col not in chunk.columns]
+                        if missing:
+                            raise KeyError(f"Columns not found: {missing}")
+                    hashes = hash_rows(chunk, subset)
+                    part = (hashes >> shift).astype(np.int64)
+                    positions = np.arange(rows, rows + len(chunk), dtype=np.int64)
+                    keys = chunk[subset] if subset else chunk
+                    order = np.argsort(part, kind="stable")  # Groups partitions while keeping row order
+                    bounds = np.searchsorted(part[order], np.arange(partitions + 1))
+                    for i in range(partitions):
+                        selected = order[bounds[i]:bounds[i + 1]]
+                        if len(selected):
+                            pickle.dump((positions[selected], keys.iloc[selected].reset_index(drop=True)), spills[i],
+                                        protocol=pickle.HIGHEST_PROTOCOL)
+                    rows += len(chunk)
+                    _progress(task, handle, total, "partitioning", rows)
+            finally:
+                for spill in spills:
+                    spill.close()
+
+        # Pass 2: exact dedup inside each partition; survivors go into a bitmap of row numbers
+        keep_bits = np.zeros((rows + 7) // 8, dtype=np.uint8)
+        for i in range(partitions):
+            pieces = []
+            with open(os.path.join(spill_dir, f"{i}.pkl"), "rb") as spill:
+                while True:
+                    try:
+                        pieces.append(pickle.load(spill))
+                    except EOFError:
+                        break
+            if not pieces:
+                continue
+            positions = np.concatenate([piece[0] for piece in pieces])
+            keys = pd.concat([piece[1] for piece in pieces], ignore_index=True)
+            survivors = positions[~keys.duplicated(keep=keep).to_numpy()]
+            np.bitwise_or.at(keep_bits, survivors >> 3, (1 << (survivors & 7)).astype(np.uint8))
+            os.remove(os.path.join(spill_dir, f"{i}.pkl"))
+            if task:
+                task.check_cancelled()
+                task.report(done=i + 1, total=partitions, unit="partitions", stage="deduplicating", rows=rows)
+
+        # Pass 3: stream the input again and write the surviving rows
+        kept = 0
+        start = 0
+        with open(input_path, "rb") as handle, open(output_path, "w", newline="", encoding="utf-8") as out:
+            for number, chunk in enumerate(_read_chunks(handle, chunk_rows)):
+                stop = start + len(chunk)
+                bits = np.unpackbits(keep_bits[start // 8:(stop + 7) // 8], bitorder="little")
+                mask = bits[start % 8:start % 8 + len(chunk)].astype(bool)
+                chunk[mask].to_csv(out, index=False, header=number == 0)
+                kept += int(mask.sum())
+                start = stop
+                _progress(task, handle, total, "writing", start)
+            if rows == 0:
+                pd.read_csv(input_path, nrows=0).to_csv(out, index=False)
+    finally:
+        shutil.rmtree(spill_dir, ignore_errors=True)
+    return {"rows": rows, "kept": kept, "removed": rows - kept, "partitions": partitions}
+
+
+# Headless use: python Dedup.py input.csv output.csv [--subset a,b] [--keep last]
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Remove duplicate rows from a CSV file larger than memory.")
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--subset", help="Comma separated key columns (default: all columns)")
+    parser.add_argument("--keep", choices=["first", "last"], default="first")
+    parser.add_argument("--memory-mb", type=int, default=MEMORY_BUDGET // (1024 * 1024))
+    args = parser.parse_args()
+
+    subset = [col.strip() for col in args.subset.split(",")] if args.subset else None
+    result = dedup_csv(args.input, args.output, subset, args.keep, args.memory_mb * 1024 * 1024)
+    print(f"[\U0001F9F9] Duplicates removed: {result['removed']} of {result['rows']} rows "
+          f"({result['partitions']} partitions)")
@@ -0,0 +1,125 @@
+# --- DocxTables.py ---
+import zipfile
+import pandas as pd
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+REPORT_EVERY = 10000
+
+VAL = W + "val"
+
+
+def _row_padding(tr):
+    before = after = 0
+    tr_pr = tr.find(W + "trPr")
+    if tr_pr is not None:
+        for prop in tr_pr:
+            if prop.tag == W + "gridBefore":
+                before = int(prop.get(VAL, "0"))
+            elif prop.tag == W + "gridAfter":
+                after = int(prop.get(VAL, "0"))
+    return before, after
+
+
+def _cell_text(tc):
+    # Same text python-docx gives for cell.text: the cell's own paragraphs joined by newlines
+    paragraphs = []
+    for p in tc.iterchildren(W + "p"):
+        paragraphs.append("".join("\t" if node.tag == W + "tab" else (node.text or "")
+                                  for node in p.iter(W + "t", W + "tab")))
+    return "\n".join(paragraphs)
+
+
+def _free(elem):
+    # Drop the element and everything before it so the tree never grows with the document
+    elem.clear()
+    parent = elem.getparent()
+    while elem.getprevious() is not None:
+        del parent[0]
+
+
+def _iter_table_rows(xml_file):
+    # Yields (table_number, row_values) straight from the XML, expanding merged cells
+    # the same way python-docx's row.cells does, without building the document tree.
+    from lxml import etree  # Ships with python-docx
+    depth = 0
+    table_number = -1
+    vmerge_text = {}  # grid column -> text of the cell that started a vertical merge
+
+    for event, elem in etree.iterparse(xml_file, events=("start", "end"), tag=(W + "tbl", W + "tr")):
+        if elem.tag == W + "tbl":
+            if event == "start":
+                depth += 1
+                if depth == 1:
+                    table_number += 1
+                    vmerge_text = {}
+            else:
+                depth -= 1
+                if depth == 0:
+                    _free(elem)
+            continue
+        if event != "end" or depth != 1:
+            continue
+
+        before, after = _row_padding(elem)
+        row = [""] * before
+        for tc in elem.iterchildren(W + "tc"):
+            span = 1
+            vmerge = None
+            tc_pr = tc.find(W + "tcPr")
+            if tc_pr is not None:
+                for prop in tc_pr:
+                    if prop.tag == W + "gridSpan":
+                        span = int(prop.get(VAL, "1"))
+                    elif prop.tag == W + "vMerge":
+                        vmerge = prop.get(VAL, "continue")
+            text = _cell_text(tc)
+            column = len(row)
+            if vmerge == "restart":
+                vmerge_text[column] = text
+            elif vmerge == "continue":
+                text = vmerge_text.get(column, text)
+            row.extend([text] * span)
+        row.extend([""] * after)
+        yield table_number, row
+        _free(elem)
+
+
+def _to_column(values):
+    series = pd.Series(values, dtype=object)
+    filled = series != ""
+    numeric = pd.to_numeric(series.where(filled), errors="coerce")
+    if numeric.notna().sum() == filled.sum() and filled.any():
+        return numeric
+    return series
+
+
+def read_docx_tables(file_path, task=None):
+    header = None
+    columns = None
+    current_table = None
+    rows = 0
+    with zipfile.ZipFile(file_path) as archive:
+        with archive.open("word/document.xml") as xml_file:
+            for table_number, values in _iter_table_rows(xml_file):
+                first_row = table_number != current_table
+                current_table = table_number
+                if header is None:
+                    header = values
+                    columns = [[] for _ in header]
+                    continue
+                if len(values) != len(header):
+                    continue  # Tables with a different layout are not part of this dataset
+                if first_row and values == header:
+                    continue  # Header repeated at the top of the next table
+                for column, value in zip(columns, values):
+                    column.append(value)
+                rows += 1
+                if task and rows % REPORT_EVERY == 0:
+                    task.check_cancelled()
+                    task.report(done=rows, total=None, unit="rows", rows=rows)
+
+    if header is None:
+        raise ValueError("No table found in the Word document.")
+    df = pd.DataFrame({i: _to_column(column) for i, column in enumerate(columns)})
+    df.columns = header
+    return df
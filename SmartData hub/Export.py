@@ -0,0 +1,298 @@
+# --- Export.py ---
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+ROW_GROUP_ROWS = 100000
+SCHEMA_ROWS = 10000  # Rows looked at to type each column of an Arrow file
+MAX_WORKERS = 4
+FILETYPES = [
+    ("CSV files", "*.csv"),
+    ("Compressed CSV (gzip)", "*.csv.gz"),
+    ("Compressed CSV (zstd)", "*.csv.zst"),
+    ("Parquet files", "*.parquet"),
+    ("Feather files", "*.feather"),
+    ("Excel files", "*.xlsx"),
+]
+EXTENSIONS = {
+    ".csv.gz": "csv.gz", ".csv.zst": "csv.zst", ".csv": "csv", ".parquet": "parquet",
+    ".feather": "feather", ".arrow": "feather", ".xlsx": "xlsx",
+}
+
+
+def export_format(file_path):
+    name = file_path.lower()
+    for extension, kind in EXTENSIONS.items():
+        if name.endswith(extension):
+            return kind
+    return "csv"
+
+
+def split_extension(file_path):
+    # "out.csv.gz" -> ("out", ".csv.gz"), so callers can add suffixes before the extension
+    name = file_path.lower()
+    for extension in EXTENSIONS:
+        if name.endswith(extension):
+            return file_path[:-len(extension)], file_path[-len(extension):]
+    return file_path, ".csv"
+
+
+def _chunks(df, rows):
+    for start in range(0, max(len(df), 1), rows):
+        yield df.iloc[start:start + rows]
+
+
+def _open_text(file_path, kind):
+    if kind == "csv.gz":
+        import gzip
+        return gzip.open(file_path, "wt", newline="", encoding="utf-8", compresslevel=6)
+    if kind == "csv.zst":
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("Writing .csv.zst needs the 'zstandard' package (pip install zstandard).")
+        return zstandard.open(file_path, "wt", newline="", encoding="utf-8")
+    return open(file_path, "w", newline="", encoding="utf-8")
+
+
+def _write_csv(df, file_path, kind, on_chunk, rows):
+    # Formats one row group at a time, so the full CSV text never sits in memory
+    with _open_text(file_path, kind) as handle:
+        for number, chunk in enumerate(_chunks(df, rows)):
+            chunk.to_csv(handle, index=False, header=number == 0)
+            on_chunk(len(chunk))
+
+
+def _text_for_mixed(df):
+    # Object columns holding text next to numbers cannot become one Arrow type; they are written as text,
+    # the way a CSV export shows them
+    import numpy as np
+    import pandas as pd
+
+    kinds = {col: pd.api.types.infer_dtype(df[col], skipna=True) for col in df.columns if df[col].dtype == object}
+    mixed = [col for col, kind in kinds.items() if kind in ("mixed", "mixed-integer", "mixed-integer-float")]
+    if not mixed:
+        return df
+    df = df.copy(deep=False)
+    for col in mixed:
+        if kinds[col] == "mixed-integer-float":
+            df[col] = df[col].astype(np.float64)  # Only numbers, some of them whole
+        else:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+
+def _arrow_schema(df):
+    # Types come from the data rather than an empty slice: object columns are typed by their first non-missing
+    # values, so a column that starts empty is not fixed to null
+    import pyarrow as pa
+
+    schema = pa.Schema.from_pandas(df.iloc[:SCHEMA_ROWS], preserve_index=False)
+    for i, field in enumerate(schema):
+        if pa.types.is_null(field.type):
+            present = df.iloc[:, i].dropna()
+            kind = pa.array(present.iloc[:SCHEMA_ROWS], from_pandas=True).type if len(present) else pa.string()
+            schema = schema.set(i, field.with_type(pa.string() if pa.types.is_null(kind) else kind))
+    return schema.remove_metadata()
+
+
+def _write_arrow(df, file_path, kind, on_chunk, rows):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    df = _text_for_mixed(df)
+    schema = _arrow_schema(df)
+    if kind == "parquet":
+        writer = pq.ParquetWriter(file_path, schema, compression="snappy")
+    else:
+        options = pa.ipc.IpcWriteOptions(compression="lz4")  # Feather v2 is the Arrow IPC file format
+        writer = pa.ipc.new_file(file_path, schema, options=options)
+    with writer:
+        for chunk in _chunks(df, rows):
+            table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+            if kind == "parquet":
+                writer.write_table(table, row_group_size=rows)
+            else:
+                writer.write_table(table)
+            on_chunk(len(chunk))
+
+
+def write_frame(df, file_path, task=None, on_chunk=None, rows=ROW_GROUP_ROWS):
+    # Writes to a temporary name first so a cancelled or failed export never leaves a half file behind
+    kind = export_format(file_path)
+    partial = file_path + ".part"
+
+    def progress(count):
+        if task:
+            task.check_cancelled()
+        if on_chunk:
+            on_chunk(count)
+
+    try:
+        if kind == "xlsx":
+            df.to_excel(partial, index=False, engine="openpyxl")
+            progress(len(df))
+        elif kind in ("parquet", "feather"):
+            _write_arrow(df, partial, kind, progress, rows)
+        else:
+            _write_csv(df, partial, kind, progress, rows)
+        os.replace(partial, file_path)
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+    return file_path
+
+
+class ChunkWriter:
+    # Appends frames one at a time to a CSV, Parquet or Feather file, with the same .part handling as write_frame
+    def __init__(self, file_path):
+        self.kind = export_format(file_path)
+        if self.kind == "xlsx":
+            raise ValueError("Excel files cannot be written in chunks; choose CSV, Parquet or Feather.")
+        self.path = file_path
+        self.partial = file_path + ".part"
+        self.handle = None
+        self.writer = None
+        self.schema = None
+        self.filled = set()  # Arrow columns that have had a value written
+        self.rows = 0
+
+    def _open_arrow(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self.kind == "parquet":
+            self.writer = pq.ParquetWriter(self.partial, self.schema, compression="snappy")
+        else:
+            self.writer = pa.ipc.new_file(self.partial, self.schema, options=pa.ipc.IpcWriteOptions(compression="lz4"))
+
+    def _arrow_table(self, df):
+        # Columns keep the types of the first chunk (integer predictions stay integers; missing values are
+        # Arrow nulls). Only a column that cannot be cast to its type, or gets its first values, is widened
+        import pyarrow as pa
+
+        try:
+            return pa.Table.from_pandas(df, schema=self.schema, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass
+        table = pa.Table.from_pandas(df, preserve_index=False).select(self.schema.names)
+        wider = {}
+        for field in self.schema:
+            kind = table.schema.field(field.name).type
+            if kind == field.type or pa.types.is_null(kind):
+                continue
+            if field.name not in self.filled:
+                wider[field.name] = kind  # Empty so far, so the first chunk's type was only a guess
+                continue
+            try:
+                table.column(field.name).cast(field.type)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                numeric = all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in (kind, field.type))
+                wider[field.name] = pa.float64() if numeric else pa.string()
+        if wider:
+            self._widen(wider)
+        return table.cast(self.schema)
+
+    def _widen(self, wider):
+        # The rows written so far are read back and written again under the wider types; this holds the file
+        # in memory once, but only happens when a later chunk really needs it
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.writer.close()
+        if self.kind == "parquet":
+            written = pq.read_table(self.partial)
+        else:
+            with pa.OSFile(self.partial) as source:
+                written = pa.ipc.open_file(source).read_all()
+        self.schema = pa.schema([field.with_type(wider.get(field.name, field.type)) for field in self.schema])
+        self._open_arrow()
+        self.writer.write_table(written.cast(self.schema))
+
+    def write(self, df):
+        if self.kind in ("parquet", "feather"):
+            df = _text_for_mixed(df)
+            if self.writer is None:
+                self.schema = _arrow_schema(df)
+                self._open_arrow()
+            table = self._arrow_table(df)
+            self.writer.write_table(table)
+            self.filled.update(name for name in table.column_names
+                               if table.column(name).null_count < len(table))
+        else:
+            if self.handle is None:
+                self.handle = _open_text(self.partial, self.kind)
+            df.to_csv(self.handle, index=False, header=self.rows == 0)
+        self.rows += len(df)
+
+    def _close_files(self):
+        for stream in (self.writer, self.handle):
+            if stream is not None:
+                stream.close()
+        self.writer = self.handle = None
+
+    def close(self):
+        if self.writer is None and self.handle is None:
+            return
+        self._close_files()
+        os.replace(self.partial, self.path)
+
+    def abort(self):
+        self._close_files()
+        if os.path.exists(self.partial):
+            os.remove(self.partial)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, kind, value, traceback):
+        if kind is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+def write_frames(jobs, task=None, max_workers=MAX_WORKERS):
+    # jobs is a list of (frame, path); outputs are written side by side and progress counts rows over all of them
+    total = sum(len(df) for df, _ in jobs)
+    done = [0]
+    lock = threading.Lock()
+
+    def on_chunk(count):
+        with lock:
+            done[0] += count
+            if task:
+                task.report(done=done[0], total=total, unit="rows", rows=done[0])
+
+    if len(jobs) == 1 or max_workers <= 1:
+        return [write_frame(df, path, task, on_chunk) for df, path in jobs]
+    with ThreadPoolExecutor(min(max_workers, len(jobs))) as pool:
+        futures = [pool.submit(write_frame, df, path, task, on_chunk) for df, path in jobs]
+        return [future.result() for future in futures]
+
+
+def partition_slices(df, column):
+    # Sorts once by the partition column and returns (label, slice) pairs cut from that single pass
+    import numpy as np
+    import pandas as pd
+
+    codes, labels = pd.factorize(df[column], sort=True)  # Missing labels get -1 and are left out
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(-1, len(labels)) + 1)
+    ordered = df.take(order)
+    return [(label, ordered.iloc[bounds[i]:bounds[i + 1]]) for i, label in enumerate(labels)]
+
+
+def write_partitioned(df, column, base_path, extension, task=None, hive=False, max_workers=MAX_WORKERS):
+    # One file per label (base_Column<label>.ext), or a Hive-style Parquet dataset base/column=label/part-0.parquet
+    jobs = []
+    for label, part in partition_slices(df, column):
+        if hive:
+            folder = os.path.join(base_path, f"{column}={label}")
+            os.makedirs(folder, exist_ok=True)
+            jobs.append((part.drop(columns=[column]), os.path.join(folder, "part-0.parquet")))
+        else:
+            jobs.append((part, f"{base_path}_{column}{label}{extension}"))
+    return write_frames(jobs, task, max_workers)
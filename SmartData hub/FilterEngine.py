@@ -0,0 +1,432 @@
+# --- FilterEngine.py ---
+import re
+import json
+import operator
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+# Filter language, e.g.
+#   Age > 30 AND City IN (Pune, Delhi)
+#   `Sleep Duration` CONTAINS "5-6" OR CGPA BETWEEN 7 AND 9
+#   Degree MATCHES "^B\." AND NOT `Work Pressure` IS NULL
+
+TOKEN = re.compile(r"""\s*(?:
+    (?P<column>`[^`]*`)
+   |(?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+   |(?P<number>[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?(?![\w.]))
+   |(?P<op>==|!=|>=|<=|=|>|<|\(|\)|,)
+   |(?P<word>[^\s()<>=!,'"`]+)
+)""", re.X)
+
+CACHE_SIZE = 16
+KEYWORDS = {"AND", "OR", "NOT", "IN", "BETWEEN", "IS", "NULL", "CONTAINS", "MATCHES"}
+COMPARISONS = {
+    "=": operator.eq, "==": operator.eq, "!=": operator.ne,
+    ">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le,
+}
+
+
+class FilterError(ValueError):
+    pass
+
+
+def tokenize(text):
+    tokens = []
+    pos = 0
+    text = text.strip()
+    while pos < len(text):
+        match = TOKEN.match(text, pos)
+        if not match or match.end() == pos:
+            raise FilterError(f"Unexpected text at: {text[pos:]!r}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "column":
+            value = value[1:-1]
+        elif kind == "string":
+            value = re.sub(r"\\([\"'\\])", r"\1", value[1:-1])  # Keep regex escapes like \.
+        elif kind == "word" and value.upper() in KEYWORDS:
+            kind, value = "keyword", value.upper()
+        tokens.append((kind, value))
+        pos = match.end()
+    return tokens
+
+
+class _Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self, kind=None, value=None):
+        if self.pos >= len(self.tokens):
+            return None
+        token = self.tokens[self.pos]
+        if (kind and token[0] != kind) or (value and token[1] != value):
+            return None
+        return token
+
+    def take(self, kind=None, value=None):
+        token = self.peek(kind, value)
+        if token is None:
+            found = self.tokens[self.pos][1] if self.pos < len(self.tokens) else "end of filter"
+            raise FilterError(f"Expected {value or kind} but found {found!r}")
+        self.pos += 1
+        return token
+
+    def parse(self):
+        node = self.parse_or()
+        if self.pos != len(self.tokens):
+            raise FilterError(f"Unexpected {self.tokens[self.pos][1]!r}")
+        return node
+
+    def parse_or(self):
+        node = self.parse_and()
+        while self.peek("keyword", "OR"):
+            self.take()
+            node = ("or", node, self.parse_and())
+        return node
+
+    def parse_and(self):
+        node = self.parse_not()
+        while self.peek("keyword", "AND"):
+            self.take()
+            node = ("and", node, self.parse_not())
+        return node
+
+    def parse_not(self):
+        if self.peek("keyword", "NOT"):
+            self.take()
+            return ("not", self.parse_not())
+        if self.peek("op", "("):
+            self.take()
+            node = self.parse_or()
+            self.take("op", ")")
+            return node
+        return self.parse_predicate()
+
+    def value(self):
+        token = self.peek()
+        if token is None or token[0] not in ("string", "number", "word"):
+            raise FilterError(f"Expected a value but found {token[1] if token else 'end of filter'!r}")
+        self.pos += 1
+        return token[1]
+
+    def parse_predicate(self):
+        token = self.peek()
+        if token is None or token[0] not in ("column", "word", "string"):
+            raise FilterError(f"Expected a column name but found {token[1] if token else 'end of filter'!r}")
+        self.pos += 1
+        column = token[1]
+
+        negate = bool(self.peek("keyword", "NOT"))
+        if negate:
+            self.take()
+        if self.peek("op") and self.peek()[1] in COMPARISONS and not negate:
+            op = self.take()[1]
+            return ("cmp", column, "=" if op == "==" else op, self.value())
+        if self.peek("keyword", "IS") and not negate:
+            self.take()
+            is_not = bool(self.peek("keyword", "NOT"))
+            if is_not:
+                self.take()
+            self.take("keyword", "NULL")
+            node = ("null", column)
+            return ("not", node) if is_not else node
+
+        keyword = self.take("keyword")[1]
+        if keyword == "IN":
+            self.take("op", "(")
+            values = [self.value()]
+            while self.peek("op", ","):
+                self.take()
+                values.append(self.value())
+            self.take("op", ")")
+            node = ("in", column, tuple(values))
+        elif keyword == "BETWEEN":
+            low = self.value()
+            self.take("keyword", "AND")
+            node = ("between", column, low, self.value())
+        elif keyword == "CONTAINS":
+            node = ("contains", column, self.value())
+        elif keyword == "MATCHES":
+            pattern = self.value()
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                raise FilterError(f"Invalid regex {pattern!r}: {e}")
+            node = ("matches", column, pattern)
+        else:
+            raise FilterError(f"Unexpected {keyword!r} after column {column!r}")
+        return ("not", node) if negate else node
+
+
+def to_text(node):
+    # Canonical text for a parsed filter, used to compare and cache filters
+    kind = node[0]
+    if kind in ("and", "or"):
+        return f"({to_text(node[1])} {kind.upper()} {to_text(node[2])})"
+    if kind == "not":
+        return f"NOT {to_text(node[1])}"
+    column = f"`{node[1]}`"
+    if kind == "cmp":
+        return f"{column} {node[2]} {json.dumps(node[3])}"
+    if kind == "in":
+        return f"{column} IN ({', '.join(json.dumps(v) for v in node[2])})"
+    if kind == "between":
+        return f"{column} BETWEEN {json.dumps(node[2])} AND {json.dumps(node[3])}"
+    if kind == "null":
+        return f"{column} IS NULL"
+    return f"{column} {kind.upper()} {json.dumps(node[2])}"
+
+
+def columns_of(node):
+    if node[0] in ("and", "or"):
+        return columns_of(node[1]) | columns_of(node[2])
+    if node[0] == "not":
+        return columns_of(node[1])
+    return {node[1]}
+
+
+class CompiledFilter:
+    def __init__(self, text):
+        self.text = text
+        self.node = _Parser(tokenize(text)).parse()
+        self.key = to_text(self.node)
+        self.columns = columns_of(self.node)
+
+
+def compile_filter(text):
+    return CompiledFilter(text)
+
+
+def build_condition(column, condition):
+    # Turns the Mining window's column + condition boxes into a filter expression
+    condition = condition.strip()
+    if not column:
+        return condition
+    quoted = f"`{column}`"
+    first = tokenize(condition)[0] if condition else None
+    if first and (first[0] == "op" and first[1] in COMPARISONS or first[0] == "keyword"):
+        return f"{quoted} {condition}"
+    return f"{quoted} CONTAINS {json.dumps(condition)}"
+
+
+class FilterEngine:
+    # Evaluates compiled filters as NumPy masks over one frame and caches per-column string forms
+    def __init__(self, df, indexes=None):
+        self.df = df
+        self.indexes = indexes  # Optional Indexes.IndexManager for the same frame
+        self._text = {}
+        self._lower = {}
+
+    def _series(self, column):
+        if column not in self.df.columns:
+            raise FilterError(f"Unknown column {column!r}")
+        return self.df[column]
+
+    def text(self, column):
+        # String form of a column (or of its categories), converted once per column
+        if column not in self._text:
+            series = self._series(column)
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                series = pd.Series(series.cat.categories)
+            self._text[column] = series.astype(str)
+        return self._text[column]
+
+    def lower(self, column):
+        if column not in self._lower:
+            self._lower[column] = self.text(column).str.lower()
+        return self._lower[column]
+
+    def _subset(self, column, cached, rows):
+        # Cached forms of categoricals hold one entry per category, others one per row
+        if rows is None or isinstance(self.df[column].dtype, pd.CategoricalDtype):
+            return cached
+        return cached.iloc[rows]
+
+    def _per_category(self, series, category_mask):
+        # Evaluate on the (few) categories, then broadcast to rows through the codes
+        category_mask = np.append(np.asarray(category_mask, dtype=bool), False)
+        return category_mask[series.cat.codes.to_numpy()]
+
+    def _coerce(self, series, raw):
+        dtype = series.dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            dtype = dtype.categories.dtype
+        try:
+            if pd.api.types.is_bool_dtype(dtype):
+                return str(raw).lower() in ("true", "1", "yes")
+            if pd.api.types.is_numeric_dtype(dtype):
+                return float(raw)
+            if pd.api.types.is_datetime64_any_dtype(dtype):
+                return pd.Timestamp(raw)
+        except (TypeError, ValueError):
+            raise FilterError(f"Column {series.name!r} cannot be compared with {raw!r}")
+        return None  # Compare as text
+
+    def _values(self, column, series, raw, rows=None):
+        # Returns (values, coerced value) using the raw column or its cached text form
+        value = self._coerce(series, raw)
+        if value is None:
+            return self._subset(column, self.text(column), rows).to_numpy(), str(raw)
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            values = np.asarray(series.cat.categories)
+        elif isinstance(series.dtype, np.dtype):
+            values = series.to_numpy()
+        else:
+            values = series.to_numpy(dtype=float if isinstance(value, float) else object, na_value=np.nan)
+        return values, value
+
+    def _indexed(self, node, series):
+        # Answer the predicate from a secondary index when one applies, otherwise return None
+        kind, column = node[0], node[1]
+        if kind in ("cmp", "between", "in") and self._coerce(series, node[-1] if kind != "in" else node[2][0]) is not None:
+            index = self.indexes.sorted_index(column)
+            if index is None:
+                return None
+            if kind == "cmp":
+                return index.select(node[2], self._coerce(series, node[3]))
+            if kind == "between":
+                return index.between(self._coerce(series, node[2]), self._coerce(series, node[3]))
+            return index.isin([self._coerce(series, raw) for raw in node[2]])
+        if kind == "contains" or (kind == "cmp" and node[2] in ("=", "!=")) or kind == "in":
+            index = self.indexes.text_index(column, self.text(column))
+            if index is None:
+                return None
+            if kind == "contains":
+                return index.contains(str(node[2])) & series.notna().to_numpy()
+            if kind == "in":
+                return index.isin([str(raw) for raw in node[2]])
+            return index.select(node[2], str(node[3]))
+        return None
+
+    def _predicate(self, node, rows=None):
+        kind, column = node[0], node[1]
+        full = self._series(column)
+        series = full if rows is None else full.iloc[rows]
+        categorical = isinstance(series.dtype, pd.CategoricalDtype)
+
+        if kind == "null":
+            return series.isna().to_numpy()
+        # Index masks cover every row, so skip them when refining an already small subset
+        if self.indexes is not None and not categorical and (rows is None or len(rows) * 8 >= len(full)):
+            mask = self._indexed(node, full)
+            if mask is not None:
+                return mask if rows is None else mask[rows]
+        if kind in ("contains", "matches"):
+            if kind == "contains":
+                lowered = self._subset(column, self.lower(column), rows)
+                result = lowered.str.contains(str(node[2]).lower(), regex=False)
+            else:
+                text = self._subset(column, self.text(column), rows)
+                result = text.str.contains(node[2], regex=True, flags=re.IGNORECASE)
+            mask = result.to_numpy(dtype=bool, na_value=False)
+        elif kind == "cmp":
+            values, value = self._values(column, series, node[3], rows)
+            mask = COMPARISONS[node[2]](values, value)
+        elif kind == "between":
+            values, low = self._values(column, series, node[2], rows)
+            _, high = self._values(column, series, node[3], rows)
+            mask = (values >= low) & (values <= high)
+        elif kind == "in":
+            coerced = [self._values(column, series, raw, rows)[1] for raw in node[2]]
+            values = self._values(column, series, node[2][0], rows)[0]
+            mask = pd.Series(values).isin(coerced).to_numpy()
+        else:
+            raise FilterError(f"Unknown filter {kind!r}")
+
+        mask = np.asarray(mask, dtype=bool)
+        if categorical:
+            return self._per_category(series, mask)
+        if kind in ("contains", "matches"):
+            mask = mask & series.notna().to_numpy()  # The text form spells missing values as "nan"
+        return mask
+
+    def mask(self, compiled, rows=None):
+        return self.evaluate(compiled.node, rows)
+
+    def evaluate(self, node, rows=None):
+        # Mask over all rows, or over the given row positions only
+        kind = node[0]
+        if kind == "and":
+            left = self.evaluate(node[1], rows)
+            return left & self.evaluate(node[2], rows) if left.any() else left
+        if kind == "or":
+            return self.evaluate(node[1], rows) | self.evaluate(node[2], rows)
+        if kind == "not":
+            return ~self.evaluate(node[1], rows)
+        return self._predicate(node, rows)
+
+    def apply(self, compiled):
+        return self.df[self.mask(compiled)]
+
+
+def conjuncts(node):
+    # Flattens nested ANDs so filters can be matched regardless of grouping or order
+    if node[0] == "and":
+        return conjuncts(node[1]) + conjuncts(node[2])
+    return [node]
+
+
+class FilterSession:
+    # Stack of applied filters plus an LRU cache of results keyed by their normalized conditions.
+    # A filter whose conditions include a cached filter's conditions only scans that result's rows.
+    def __init__(self, engine, cache_size=CACHE_SIZE):
+        self.engine = engine
+        self.cache_size = cache_size
+        self.cache = OrderedDict()  # key -> (set of condition keys, row positions)
+        self.stack = []  # (description, condition nodes, row positions)
+
+    @property
+    def rows(self):
+        return self.stack[-1][2] if self.stack else None
+
+    def _run(self, nodes):
+        parts = {to_text(node): node for node in nodes}
+        keys = frozenset(parts)
+        key = " AND ".join(sorted(keys))
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key][1], True
+
+        rows = None
+        done = frozenset()
+        for cached_keys, cached_rows in self.cache.values():
+            if cached_keys < keys and (rows is None or len(cached_rows) < len(rows)):
+                rows, done = cached_rows, cached_keys
+        for part in sorted(keys - done):
+            mask = self.engine.evaluate(parts[part], rows)
+            rows = np.flatnonzero(mask) if rows is None else rows[mask]
+            if not len(rows):
+                break
+
+        self.cache[key] = (keys, rows)
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return rows, False
+
+    def apply(self, compiled):
+        nodes = conjuncts(compiled.node)
+        rows, cached = self._run(nodes)
+        self.stack.append((compiled.text, nodes, rows))
+        return rows, cached
+
+    def refine(self, compiled):
+        if not self.stack:
+            return self.apply(compiled)
+        description, nodes, _ = self.stack[-1]
+        nodes = nodes + conjuncts(compiled.node)
+        rows, cached = self._run(nodes)
+        self.stack.append((f"{description} AND {compiled.text}", nodes, rows))
+        return rows, cached
+
+    def back(self):
+        if self.stack:
+            self.stack.pop()
+        return self.rows
+
+    def reset(self):
+        self.stack.clear()
+
+    def describe(self):
+        return self.stack[-1][0] if self.stack else None
@@ -0,0 +1,149 @@
+# --- Imputation.py ---
+import os
+import numpy as np
+import pandas as pd
+
+# Dialog label -> strategy spec stored in the cleaning recipe
+STRATEGIES = {
+    "skip": None,
+    "0": {"strategy": "value", "value": 0},
+    "Unknown": {"strategy": "value", "value": "Unknown"},
+    "custom": {"strategy": "value"},
+    "ffill": {"strategy": "ffill"},
+    "bfill": {"strategy": "bfill"},
+    "mode": {"strategy": "mode"},
+    "mean": {"strategy": "mean"},
+    "median": {"strategy": "median"},
+    "group mean": {"strategy": "group", "stat": "mean"},
+    "group median": {"strategy": "group", "stat": "median"},
+    "knn": {"strategy": "knn"},
+}
+# Strategies that only look at the column being filled, so their order does not matter
+LOCAL_STRATEGIES = {"value", "ffill", "bfill", "mode", "mean", "median"}
+KNN_NEIGHBORS = 5
+KNN_FIT_ROWS = 10000  # Donor rows sampled for KNN; lookups scale linearly with this
+KNN_PARALLEL_ROWS = 20000  # Rows to impute before the work is spread over processes
+KNN_CHUNK_ROWS = 5000
+MAX_WORKERS = max(1, min(4, (os.cpu_count() or 1)))
+
+
+def is_local(fills):
+    return all(spec["strategy"] in LOCAL_STRATEGIES for spec in fills.values())
+
+
+def _is_numeric(series):
+    return isinstance(series.dtype, np.dtype) and series.dtype.kind in "iuf"
+
+
+def _mode(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        counts = np.bincount(series.cat.codes.to_numpy()[series.notna().to_numpy()],
+                             minlength=len(series.cat.categories))
+        return series.cat.categories[counts.argmax()] if counts.any() else 0
+    mode_val = series.mode()
+    return mode_val[0] if not mode_val.empty else 0
+
+
+def _fill_values(df, values):
+    # Categorical columns (see Ingestion.optimize_dtypes) only accept known categories
+    for col, value in values.items():
+        if isinstance(df[col].dtype, pd.CategoricalDtype) and value not in df[col].cat.categories:
+            df[col] = df[col].cat.add_categories([value])
+    return df.fillna(values)  # One call fills every column
+
+
+def _group_fill(df, by, stat, columns):
+    # A single groupby transform per (group column, statistic) covers all its target columns
+    columns = [col for col in columns if _is_numeric(df[col])]
+    if not columns or by not in df.columns:
+        return df
+    filled = df.groupby(by, observed=True, sort=False)[columns].transform(stat)
+    df[columns] = df[columns].fillna(filled)
+    return df
+
+
+_worker_imputer = None
+
+
+def _init_knn_worker(imputer):
+    global _worker_imputer
+    _worker_imputer = imputer
+
+
+def _knn_chunk(block):
+    return _worker_imputer.transform(block)
+
+
+def _knn_fill(df, columns, neighbors=KNN_NEIGHBORS, seed=0):
+    from sklearn.impute import KNNImputer
+
+    features = [col for col in df.columns if _is_numeric(df[col])]
+    targets = [col for col in columns if col in features]
+    if not targets:
+        return df
+    block = df[features].to_numpy(dtype=np.float64)
+    # Standardize so no single column dominates the distances, then undo it afterwards
+    center = np.nanmean(block, axis=0)
+    scale = np.nanstd(block, axis=0)
+    scale[~(scale > 0)] = 1
+    center[np.isnan(center)] = 0
+    block = (block - center) / scale
+
+    rows = np.flatnonzero(np.isnan(block[:, [features.index(col) for col in targets]]).any(axis=1))
+    if not len(rows):
+        return df
+    donors = np.flatnonzero(~np.isnan(block).all(axis=1))
+    if len(donors) > KNN_FIT_ROWS:
+        donors = np.sort(np.random.default_rng(seed).choice(donors, KNN_FIT_ROWS, replace=False))
+    imputer = KNNImputer(n_neighbors=neighbors, keep_empty_features=True).fit(block[donors])
+
+    missing = block[rows]
+    if len(rows) > KNN_PARALLEL_ROWS and MAX_WORKERS > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        chunks = [missing[i:i + KNN_CHUNK_ROWS] for i in range(0, len(missing), KNN_CHUNK_ROWS)]
+        with ProcessPoolExecutor(MAX_WORKERS, initializer=_init_knn_worker, initargs=(imputer,)) as pool:
+            imputed = np.vstack(list(pool.map(_knn_chunk, chunks)))
+    else:
+        imputed = imputer.transform(missing)
+
+    imputed = imputed * scale + center
+    for col in targets:
+        values = df[col].to_numpy(dtype=np.float64, copy=True)
+        gaps = np.isnan(values[rows])
+        if gaps.any():
+            values[rows[gaps]] = imputed[gaps, features.index(col)]
+            df[col] = values.astype(df[col].dtype)
+    return df
+
+
+def impute(df, fills):
+    # fills maps column -> strategy spec; column-local fills run first, then group fills, then KNN
+    fills = {col: spec for col, spec in fills.items() if col in df.columns}
+    df = df.copy(deep=False)
+    by_strategy = {}
+    for col, spec in fills.items():
+        by_strategy.setdefault(spec["strategy"], []).append(col)
+
+    values = {col: fills[col].get("value") for col in by_strategy.get("value", [])}
+    for stat in ("mean", "median"):
+        columns = [col for col in by_strategy.get(stat, []) if _is_numeric(df[col])]
+        if columns:
+            values.update(getattr(df[columns], stat)().dropna().to_dict())  # One reduction over the block
+    values.update({col: _mode(df[col]) for col in by_strategy.get("mode", [])})
+    if values:
+        df = _fill_values(df, values)
+    for method in ("ffill", "bfill"):
+        columns = by_strategy.get(method, [])
+        if columns:
+            df[columns] = getattr(df[columns], method)()
+
+    groups = {}
+    for col in by_strategy.get("group", []):
+        groups.setdefault((fills[col]["by"], fills[col].get("stat", "mean")), []).append(col)
+    for (by, stat), columns in groups.items():
+        df = _group_fill(df, by, stat, columns)
+
+    if "knn" in by_strategy:
+        neighbors = max(int(fills[col].get("neighbors", KNN_NEIGHBORS)) for col in by_strategy["knn"])
+        df = _knn_fill(df, by_strategy["knn"], neighbors)
+    return df
@@ -0,0 +1,153 @@
+# --- Indexes.py ---
+import sys
+import time
+from collections import defaultdict
+import numpy as np
+import pandas as pd
+
+MAX_TRIGRAM_VALUES = 500000  # Above this many distinct strings a scan is cheaper than building postings
+EMPTY = np.empty(0, dtype=np.int32)
+
+
+class SortedIndex:
+    # Row positions ordered by value, so range filters become two binary searches
+    kind = "sorted"
+
+    def __init__(self, values):
+        values = np.asarray(values)
+        order = np.argsort(values, kind="stable")
+        missing = int(np.isnan(values).sum()) if values.dtype.kind == "f" else 0
+        self.order = order[:len(order) - missing]  # NaN sorts last and never matches a range
+        self.sorted = values[self.order]
+        self.size = len(values)
+        self.entries = len(self.order)
+
+    def _mask(self, lo, hi):
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self.order[lo:hi]] = True
+        return mask
+
+    def select(self, op, value):
+        if op == "!=":
+            return ~self.select("=", value)
+        left = np.searchsorted(self.sorted, value, side="left")
+        right = np.searchsorted(self.sorted, value, side="right")
+        bounds = {
+            "=": (left, right), ">": (right, self.entries), ">=": (left, self.entries),
+            "<": (0, left), "<=": (0, right),
+        }
+        return self._mask(*bounds[op])
+
+    def between(self, low, high):
+        lo = np.searchsorted(self.sorted, low, side="left")
+        hi = np.searchsorted(self.sorted, high, side="right")
+        return self._mask(lo, max(lo, hi))
+
+    def isin(self, values):
+        mask = np.zeros(self.size, dtype=bool)
+        for value in values:
+            mask |= self.select("=", value)
+        return mask
+
+    def memory(self):
+        return self.order.nbytes + self.sorted.nbytes
+
+
+class TextIndex:
+    # Dictionary of distinct strings plus trigram postings over them; rows are reached through the codes
+    kind = "trigram"
+
+    def __init__(self, text):
+        codes, uniques = pd.factorize(text)
+        self.codes = codes
+        self.uniques = list(uniques)
+        self.lookup = {value: i for i, value in enumerate(self.uniques)}
+        self.lowered = [value.lower() for value in self.uniques]
+        postings = defaultdict(list)
+        for i, value in enumerate(self.lowered):
+            for gram in {value[j:j + 3] for j in range(len(value) - 2)}:
+                postings[gram].append(i)
+        self.postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+        self.entries = len(self.uniques)
+
+    def _rows(self, value_ids):
+        hit = np.zeros(len(self.uniques) + 1, dtype=bool)  # Extra slot for code -1
+        hit[list(value_ids)] = True
+        return hit[self.codes]
+
+    def contains(self, term):
+        term = term.lower()
+        if len(term) >= 3:
+            grams = {term[j:j + 3] for j in range(len(term) - 2)}
+            lists = sorted((self.postings.get(gram, EMPTY) for gram in grams), key=len)
+            candidates = lists[0]
+            for ids in lists[1:]:
+                if not len(candidates):
+                    break
+                candidates = np.intersect1d(candidates, ids, assume_unique=True)
+        else:
+            candidates = range(len(self.uniques))
+        return self._rows(i for i in candidates if term in self.lowered[i])
+
+    def isin(self, values):
+        return self._rows(self.lookup[value] for value in values if value in self.lookup)
+
+    def select(self, op, value):
+        mask = self.isin([value])
+        return ~mask if op == "!=" else mask
+
+    def memory(self):
+        size = self.codes.nbytes + sys.getsizeof(self.postings) + sys.getsizeof(self.lookup)
+        size += sum(sys.getsizeof(value) for value in self.uniques)
+        size += sum(sys.getsizeof(value) for value in self.lowered)
+        size += sum(sys.getsizeof(gram) + ids.nbytes for gram, ids in self.postings.items())
+        return size
+
+
+class IndexManager:
+    # Builds indexes lazily on first use and keeps them for as long as the frame stays the same
+    def __init__(self, df):
+        self.df = df
+        self.indexes = {}
+        self.stats_rows = {}
+        self.too_large = set()
+
+    def _get(self, column, kind, build):
+        key = (column, kind)
+        if key not in self.indexes:
+            start = time.perf_counter()
+            self.indexes[key] = build()
+            self.stats_rows[key] = {"build_seconds": time.perf_counter() - start, "uses": 0}
+        self.stats_rows[key]["uses"] += 1
+        return self.indexes[key]
+
+    def sorted_index(self, column):
+        series = self.df[column]
+        if not isinstance(series.dtype, np.dtype) or series.dtype.kind not in "iuf":
+            return None
+        return self._get(column, "sorted", lambda: SortedIndex(series.to_numpy()))
+
+    def text_index(self, column, text):
+        if column in self.too_large:
+            return None
+        if (column, "trigram") not in self.indexes and text.nunique() > MAX_TRIGRAM_VALUES:
+            self.too_large.add(column)
+            return None
+        return self._get(column, "trigram", lambda: TextIndex(text))
+
+    def reset(self, df):
+        if df is not self.df:
+            self.df = df
+            self.indexes.clear()
+            self.stats_rows.clear()
+            self.too_large.clear()
+
+    def stats(self):
+        rows = []
+        for (column, kind), index in self.indexes.items():
+            info = self.stats_rows[(column, kind)]
+            rows.append({
+                "column": column, "kind": kind, "entries": index.entries, "memory": index.memory(),
+                "build_seconds": info["build_seconds"], "uses": info["uses"],
+            })
+        return rows
@@ -0,0 +1,173 @@
+# --- Ingestion.py ---
+import os
+import hashlib
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+CHUNK_ROWS = 100000
+CATEGORY_RATIO = 0.5  # strings with fewer unique values than this share of rows become categoricals
+CACHE_DIR = ".smartdata_cache"
+
+
+def _is_text(series):
+    return series.dtype == object or pd.api.types.is_string_dtype(series.dtype)
+
+
+def optimize_dtypes(df, category_columns=None):
+    # Downcast numbers and turn repetitive strings into categoricals
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_bool_dtype(series.dtype):
+            continue
+        if pd.api.types.is_integer_dtype(series.dtype):
+            df[col] = pd.to_numeric(series, downcast="integer")
+        elif pd.api.types.is_float_dtype(series.dtype):
+            small = series.astype(np.float32)
+            # Only keep float32 when it is lossless, otherwise exact filters like CGPA == 8.97 break
+            if ((small == series) | series.isna()).all():
+                df[col] = small
+        elif _is_text(series):
+            if category_columns is not None:
+                to_category = col in category_columns
+            else:
+                to_category = len(series) > 0 and series.nunique() < CATEGORY_RATIO * len(series)
+            if to_category:
+                df[col] = series.astype("category")
+    return df
+
+
+def _concat_chunks(chunks):
+    if len(chunks) == 1:
+        return chunks[0]
+    columns = chunks[0].columns
+    data = {}
+    for col in columns:
+        parts = [chunk[col] for chunk in chunks]
+        if all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            data[col] = pd.Series(union_categoricals(parts, ignore_order=True), name=col)
+        else:
+            data[col] = pd.concat(parts, ignore_index=True)
+    return pd.DataFrame(data, columns=columns)
+
+
+def _value_kind(series):
+    if pd.api.types.is_bool_dtype(series.dtype):
+        return "bool"
+    return "number" if pd.api.types.is_numeric_dtype(series.dtype) else "text"
+
+
+def read_csv_optimized(file_path, chunk_rows=CHUNK_ROWS, task=None):
+    # Read in chunks so only one chunk is ever held with wide object dtypes
+    chunks = []
+    category_columns = None
+    kinds = {}  # Kinds of value each column was parsed as, over the chunks where it has any
+    rows = 0
+    total_bytes = os.path.getsize(file_path)
+    with open(file_path, "rb") as handle:
+        for chunk in pd.read_csv(handle, chunksize=chunk_rows):
+            chunk = chunk.reset_index(drop=True)
+            for col in chunk.columns:
+                if chunk[col].notna().any():
+                    kinds.setdefault(col, set()).add(_value_kind(chunk[col]))
+            if category_columns is None:
+                # Decide categorical columns from the first chunk so every chunk agrees
+                category_columns = {col for col in chunk.columns
+                                    if _is_text(chunk[col]) and chunk[col].nunique() < CATEGORY_RATIO * len(chunk)}
+            chunks.append(optimize_dtypes(chunk, category_columns))
+            rows += len(chunk)
+            if task:
+                task.check_cancelled()
+                task.report(done=handle.tell(), total=total_bytes, unit="bytes", rows=rows)
+    if not chunks:
+        return pd.read_csv(file_path)
+    df = _concat_chunks(chunks)
+    # A column parsed as numbers in some chunks and text in others would mix 1 and "1"; read it again as text
+    mixed = [col for col, found in kinds.items() if len(found) > 1]
+    if mixed:
+        text = pd.read_csv(file_path, usecols=mixed, dtype=str)
+        for col in mixed:
+            df[col] = text[col].to_numpy(dtype=object)
+    # Columns whose type changed between chunks come back as plain objects
+    return optimize_dtypes(df, {col for col in df.columns if _is_text(df[col])
+                                and df[col].nunique() < CATEGORY_RATIO * len(df)})
+
+
+# --- On-disk columnar cache ---
+def _cache_key(file_path):
+    stat = os.stat(file_path)
+    raw = f"{os.path.abspath(file_path)}|{stat.st_mtime_ns}|{stat.st_size}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def cache_dir(file_path):
+    return os.path.join(os.path.dirname(os.path.abspath(file_path)), CACHE_DIR)
+
+
+def cache_path(file_path):
+    name = os.path.basename(file_path)
+    return os.path.join(cache_dir(file_path), f"{name}.{_cache_key(file_path)}.parquet")
+
+
+def read_cache(file_path):
+    path = cache_path(file_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        return pd.read_parquet(path)
+    except Exception:
+        return None
+
+
+def write_cache(file_path, df):
+    path = cache_path(file_path)
+    prefix = os.path.basename(file_path) + "."
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Drop caches of older versions of the same file
+        for old in os.listdir(os.path.dirname(path)):
+            if old.startswith(prefix) and old.endswith(".parquet") and old != os.path.basename(path):
+                os.remove(os.path.join(os.path.dirname(path), old))
+        df.to_parquet(path + ".tmp", index=False)
+        os.replace(path + ".tmp", path)
+    except Exception:
+        # Caching is best effort (missing pyarrow, read-only folder, mixed-type columns)
+        if os.path.exists(path + ".tmp"):
+            os.remove(path + ".tmp")
+
+
+# --- Format readers ---
+def read_docx(file_path, task=None):
+    from DocxTables import read_docx_tables
+    return read_docx_tables(file_path, task=task)
+
+
+def read_pdf(file_path, task=None):
+    from PdfTables import read_pdf_tables
+    return read_pdf_tables(file_path, task=task)
+
+
+def load_dataset(file_path, use_cache=True, task=None):
+    # task is an optional Tasks.BackgroundTask used for progress and cancellation
+    if use_cache:
+        cached = read_cache(file_path)
+        if cached is not None:
+            return cached
+
+    if file_path.endswith('.csv'):
+        df = read_csv_optimized(file_path, task=task)
+    elif file_path.endswith(('.xlsx', '.xls')):
+        df = optimize_dtypes(pd.read_excel(file_path))
+    elif file_path.endswith('.docx'):
+        df = optimize_dtypes(read_docx(file_path, task=task))
+    elif file_path.endswith('.pdf'):
+        df = optimize_dtypes(read_pdf(file_path, task=task))
+    else:
+        raise ValueError("Unsupported file format selected.")
+
+    if task:
+        task.check_cancelled()
+        task.report(done=1, total=1, unit="file", rows=len(df))
+    if use_cache:
+        write_cache(file_path, df)
+    return df
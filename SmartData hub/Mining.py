@@ -1,12 +1,18 @@
 # --- Mining.py ---
 import tkinter as tk
+import time
 from tkinter import messagebox, ttk
-import pandas as pd
+from VirtualGrid import VirtualGrid
+from FilterEngine import FilterEngine, FilterSession, build_condition, compile_filter
+from Indexes import IndexManager
 
 class DataFilterApp:
     def __init__(self, root, df):
         self.root = root
         self.df = df
+        self.indexes = IndexManager(df)
+        self.engine = FilterEngine(df, self.indexes)
+        self.session = FilterSession(self.engine)
         self.root.title("🔍 Data Mining & Filter Tool")
         self.root.geometry("900x650")
         self.root.configure(bg="#e6f2ff")
@@ -28,58 +34,88 @@ class DataFilterApp:
         search_btn = tk.Button(control_frame, text="🔎 Apply Filter", bg="#28a745", fg="white", font=("Arial", 12), command=self.filter_data)
         search_btn.grid(row=2, column=1, pady=10)
 
+        refine_btn = tk.Button(control_frame, text="➕ Refine Results", bg="#007bff", fg="white", font=("Arial", 12), command=lambda: self.filter_data(refine=True))
+        refine_btn.grid(row=2, column=2, padx=10)
+
+        back_btn = tk.Button(control_frame, text="⬅️ Back", bg="#6c757d", fg="white", font=("Arial", 12), command=self.previous_filter)
+        back_btn.grid(row=2, column=3, padx=10)
+
         reset_btn = tk.Button(control_frame, text="🔄 Reset Filters", bg="#ffc107", fg="black", font=("Arial", 12), command=self.reset_filters)
-        reset_btn.grid(row=2, column=2, padx=10)
+        reset_btn.grid(row=2, column=4, padx=10)
 
-        self.status_label = tk.Label(root, text="🔔 Filter data using conditions.", font=("Arial", 10, "italic"), bg="#e6f2ff", fg="gray")
-        self.status_label.pack()
+        stats_btn = tk.Button(control_frame, text="📑 Index Stats", bg="#17a2b8", fg="white", font=("Arial", 12), command=self.show_index_stats)
+        stats_btn.grid(row=2, column=5, padx=10)
 
-        result_frame = tk.Frame(root)
-        result_frame.pack(fill="both", expand=True, padx=10, pady=10)
-        vsb = ttk.Scrollbar(result_frame, orient="vertical")
-        hsb = ttk.Scrollbar(result_frame, orient="horizontal")
+        hint = "Leave Column empty to filter on several columns, e.g.  Age > 30 AND City IN (Pune, Delhi)"
+        tk.Label(control_frame, text=hint, bg="#e6f2ff", fg="gray", font=("Arial", 9)).grid(row=3, column=0, columnspan=6, sticky="w")
 
-        self.result_tree = ttk.Treeview(result_frame, yscrollcommand=vsb.set, xscrollcommand=hsb.set)
-        vsb.config(command=self.result_tree.yview)
-        hsb.config(command=self.result_tree.xview)
+        self.status_label = tk.Label(root, text="🔔 Filter data using conditions.", font=("Arial", 10, "italic"), bg="#e6f2ff", fg="gray")
+        self.status_label.pack()
 
-        self.result_tree.pack(side="left", fill="both", expand=True)
-        vsb.pack(side="right", fill="y")
-        hsb.pack(side="bottom", fill="x")
+        self.result_grid = VirtualGrid(root)
+        self.result_grid.pack(fill="both", expand=True, padx=10, pady=10)
 
         self.column_dropdown['values'] = list(self.df.columns)
         self.display_results(self.df)
 
-    def filter_data(self):
+    def filter_data(self, refine=False):
         column = self.column_dropdown.get()
         search_value = self.condition_entry.get().strip()
-        if not column or not search_value:
-            messagebox.showerror("Error", "Please select a column and enter a condition!")
+        if not search_value:
+            messagebox.showerror("Error", "Please enter a condition or keyword!")
             return
 
         try:
-            if any(op in search_value for op in ['>', '<', '>=', '<=', '=']):
-                filtered_df = self.df.query(f"`{column}` {search_value}")
+            start = time.perf_counter()
+            compiled = compile_filter(build_condition(column, search_value))
+            if refine:
+                rows, cached = self.session.refine(compiled)
             else:
-                filtered_df = self.df[self.df[column].astype(str).str.contains(search_value, na=False, case=False)]
-            self.display_results(filtered_df)
-            self.status_label.config(text=f"✅ Showing results for: {column} {search_value}")
+                rows, cached = self.session.apply(compiled)
+            elapsed = (time.perf_counter() - start) * 1000
+            self.display_results(self.df, rows)
+            source = "cached" if cached else f"{elapsed:.0f} ms"
+            self.status_label.config(text=f"✅ Showing results for: {self.session.describe()} ({source})")
         except Exception as e:
             messagebox.showerror("Error", f"Invalid condition: {e}")
             self.status_label.config(text="❌ Filter error.")
 
+    def previous_filter(self):
+        rows = self.session.back()
+        self.display_results(self.df, rows)
+        if self.session.describe():
+            self.status_label.config(text=f"⬅️ Back to: {self.session.describe()}")
+        else:
+            self.status_label.config(text="🔄 Showing all data.")
+
     def reset_filters(self):
         self.column_dropdown.set('')
         self.condition_entry.delete(0, tk.END)
+        self.session.reset()
         self.display_results(self.df)
         self.status_label.config(text="🔄 Filters reset. Showing all data.")
 
-    def display_results(self, data):
-        self.result_tree.delete(*self.result_tree.get_children())
-        self.result_tree["columns"] = list(data.columns)
-        self.result_tree["show"] = "headings"
-        for col in data.columns:
-            self.result_tree.heading(col, text=col)
-            self.result_tree.column(col, width=150, anchor="center")
-        for _, row in data.iterrows():
-            self.result_tree.insert("", "end", values=list(row))
+    def show_index_stats(self):
+        top = tk.Toplevel(self.root)
+        top.title("📑 Index Statistics")
+        top.geometry("650x300")
+        top.configure(bg="#e6f2ff")
+
+        columns = ("Column", "Type", "Entries", "Memory", "Build Time", "Uses")
+        tree = ttk.Treeview(top, columns=columns, show="headings")
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=100, anchor="center")
+        tree.pack(fill="both", expand=True, padx=10, pady=10)
+
+        stats = self.indexes.stats()
+        for row in stats:
+            tree.insert("", "end", values=(row["column"], row["kind"], f"{row['entries']:,}",
+                                           f"{row['memory'] / 1024 ** 2:.2f} MB", f"{row['build_seconds'] * 1000:.0f} ms", row["uses"]))
+        total = sum(row["memory"] for row in stats) / 1024 ** 2
+        tk.Label(top, text=f"{len(stats)} indexes, {total:.2f} MB in total. Indexes are built on first use.",
+                 bg="#e6f2ff", fg="gray", font=("Arial", 10, "italic")).pack(pady=5)
+
+    def display_results(self, data, rows=None):
+        # Only the visible rows are materialized, so this is instant even on millions of rows
+        self.result_grid.set_data(data, rows)
@@ -0,0 +1,85 @@
+# --- Outliers.py ---
+import numpy as np
+import pandas as pd
+
+METHODS = {
+    "IQR (1.5 x IQR)": "iqr",
+    "Z-score (|z| > 3)": "zscore",
+    "MAD (|robust z| > 3.5)": "mad",
+}
+ACTIONS = ["skip", "clip", "zero", "positive", "remove"]
+
+
+def numeric_columns(df):
+    return list(df.select_dtypes(include=[np.number]).columns)
+
+
+def compute_bounds(df, columns=None, method="iqr"):
+    # One pass over the whole numeric block instead of one quantile call per column
+    columns = numeric_columns(df) if columns is None else list(columns)
+    lower, upper = block_bounds(df[columns].to_numpy(dtype=np.float64, na_value=np.nan), method)
+    return pd.DataFrame({"lower": lower, "upper": upper}, index=columns)
+
+
+def block_bounds(block, method="iqr"):
+    # (lower, upper) per column of a float block; also used by the fused column-wise pass in Pipeline
+    with np.errstate(all="ignore"):
+        if method == "iqr":
+            q1, q3 = np.nanquantile(block, [0.25, 0.75], axis=0)
+            spread = q3 - q1
+            lower, upper = q1 - 1.5 * spread, q3 + 1.5 * spread
+        elif method == "zscore":
+            mean = np.nanmean(block, axis=0)
+            std = np.nanstd(block, axis=0)
+            lower, upper = mean - 3 * std, mean + 3 * std
+        elif method == "mad":
+            median = np.nanmedian(block, axis=0)
+            mad = np.nanmedian(np.abs(block - median), axis=0) * 1.4826
+            lower, upper = median - 3.5 * mad, median + 3.5 * mad
+        else:
+            raise ValueError(f"Unknown outlier method: {method}")
+    return lower, upper
+
+
+def outlier_mask(df, bounds):
+    # Boolean matrix (rows x bounded columns); NaN never counts as an outlier
+    block = df[bounds.index].to_numpy(dtype=np.float64, na_value=np.nan)
+    lower = bounds["lower"].to_numpy()
+    upper = bounds["upper"].to_numpy()
+    return (block < lower) | (block > upper)
+
+
+def count_outliers(df, bounds):
+    return pd.Series(outlier_mask(df, bounds).sum(axis=0), index=bounds.index)
+
+
+def apply_actions(df, bounds, actions):
+    # actions maps column -> skip / clip / zero / positive / remove; returns (new frame, outliers handled per column)
+    active = [col for col in bounds.index if actions.get(col, "skip") != "skip"]
+    if not active:
+        return df, {}
+    bounds = bounds.loc[active]
+    mask = outlier_mask(df, bounds)
+    counts = dict(zip(active, mask.sum(axis=0).tolist()))
+    df = df.copy(deep=False)
+
+    for i, col in enumerate(active):
+        action = actions[col]
+        if action == "remove" or not counts[col]:
+            continue
+        values = df[col].to_numpy()
+        if action == "clip":
+            lower, upper = bounds.at[col, "lower"], bounds.at[col, "upper"]
+            if np.issubdtype(values.dtype, np.integer):
+                lower, upper = np.ceil(lower), np.floor(upper)  # Keep integer columns integer
+            df[col] = np.clip(values, lower, upper).astype(values.dtype, copy=False)
+        elif action == "zero":
+            df[col] = np.where(mask[:, i], 0, values).astype(values.dtype, copy=False)
+        elif action == "positive":
+            df[col] = np.where(mask[:, i], np.abs(values), values)
+
+    remove = [i for i, col in enumerate(active) if actions[col] == "remove"]
+    if remove:
+        # Drop exactly the outlier rows, not every row that happens to share an outlier's value
+        df = df[~mask[:, remove].any(axis=1)]
+    return df, counts
@@ -0,0 +1,191 @@
+# --- PdfTables.py ---
+import os
+import hashlib
+import pickle
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+
+from Ingestion import cache_dir
+
+PAGES_PER_TASK = 4
+MAX_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+
+# One pool for the whole session so every worker keeps its warm tabula/JVM between imports
+_pool = None
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=MAX_WORKERS, initializer=_init_worker)
+    return _pool
+
+
+def _init_worker():
+    # tabula-py runs the JVM in-process through jpype, so it starts once per worker and is then reused
+    import tabula  # noqa: F401
+
+
+def _extract_pages(file_path, pages):
+    import tabula
+    results = {}
+    for page in pages:
+        results[page] = tabula.read_pdf(file_path, pages=page, multiple_tables=True) or []
+    return results
+
+
+def page_signatures(file_path):
+    # Hash each page's content stream so an edited PDF only re-parses the pages that changed
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        return None
+    signatures = []
+    for page in PdfReader(file_path).pages:
+        contents = page.get_contents()
+        data = contents.get_data() if contents is not None else b""
+        signatures.append(hashlib.sha1(data + repr(page.mediabox).encode()).hexdigest()[:16])
+    return signatures
+
+
+def _page_cache_dir(file_path):
+    return os.path.join(cache_dir(file_path), os.path.basename(file_path) + ".pages")
+
+
+def _read_page_cache(folder, page, signature):
+    path = os.path.join(folder, f"{page}.{signature}.pkl")
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        return None
+
+
+def _write_page_cache(folder, page, signature, tables):
+    try:
+        os.makedirs(folder, exist_ok=True)
+        for old in os.listdir(folder):
+            if old.startswith(f"{page}.") and old != f"{page}.{signature}.pkl":
+                os.remove(os.path.join(folder, old))
+        with open(os.path.join(folder, f"{page}.{signature}.pkl"), "wb") as f:
+            pickle.dump(tables, f)
+    except OSError:
+        pass
+
+
+def _as_number(text):
+    try:
+        value = float(text.replace(",", ""))
+    except ValueError:
+        return None
+    return int(value) if value.is_integer() and "." not in text else value
+
+
+def _header_is_data(header):
+    # tabula uses the first row of a continuation page as its header; numbers or blank cells give it away
+    return any(_as_number(cell) is not None or cell.startswith("Unnamed") for cell in header)
+
+
+def _column_kinds(df, header_is_data=False):
+    # "number" or "text" per column from its cells (and its header when that is really a data row);
+    # None where there is nothing to go by
+    kinds = []
+    for col, cell in zip(df.columns, (str(col).strip() for col in df.columns)):
+        found = set()
+        if df[col].notna().any():
+            found.add("number" if pd.api.types.is_numeric_dtype(df[col].dtype) else "text")
+        if header_is_data and not cell.startswith("Unnamed"):
+            found.add("number" if _as_number(cell) is not None else "text")
+        kinds.append(found.pop() if len(found) == 1 else ("text" if found else None))
+    return kinds
+
+
+def _kinds_match(kinds, other):
+    return all(a is None or b is None or a == b for a, b in zip(kinds, other))
+
+
+def merge_tables(tables, pages=None):
+    # Tables that repeat the first table's header across pages are pieces of one table. A headerless page
+    # with the same number of columns is a continuation when its columns hold the same kinds of values and,
+    # where pages are known, it sits on the page of the previous piece or the next one. Anything else is
+    # left out and counted in df.attrs["skipped_tables"] / ["skipped_rows"]
+    header = [str(col).strip() for col in tables[0].columns]
+    kinds = _column_kinds(tables[0])
+    parts = []
+    last_page = pages[0] if pages else None
+    skipped_tables = skipped_rows = 0
+    for i, df in enumerate(tables):
+        own = [str(col).strip() for col in df.columns]
+        adjacent = pages is None or pages[i] - last_page in (0, 1)
+        if own == header:
+            parts.append(df.set_axis(header, axis=1))
+        elif (len(own) == len(header) and _header_is_data(own) and adjacent
+              and _kinds_match(kinds, _column_kinds(df, header_is_data=True))):
+            first = [None if cell.startswith("Unnamed") else
+                     (_as_number(cell) if _as_number(cell) is not None else cell) for cell in own]
+            parts.append(pd.DataFrame([first], columns=header))
+            parts.append(df.set_axis(header, axis=1))
+        else:
+            skipped_tables += 1
+            skipped_rows += len(df)
+            continue
+        if pages:
+            last_page = pages[i]
+    merged = pd.concat(parts, ignore_index=True)
+    merged.attrs["skipped_tables"] = skipped_tables
+    merged.attrs["skipped_rows"] = skipped_rows
+    return merged
+
+
+def read_pdf_tables(file_path, task=None):
+    signatures = page_signatures(file_path)
+    if signatures is None:
+        # Without pypdf there is no page count, so fall back to one call for the whole file
+        import tabula
+        tables = tabula.read_pdf(file_path, pages='all', multiple_tables=True)
+        if not tables:
+            raise ValueError("No table found in the PDF document.")
+        return merge_tables(tables)
+
+    folder = _page_cache_dir(file_path)
+    page_tables = {}
+    missing = []
+    for page, signature in enumerate(signatures, start=1):
+        cached = _read_page_cache(folder, page, signature)
+        if cached is None:
+            missing.append(page)
+        else:
+            page_tables[page] = cached
+
+    total = len(signatures)
+    if task:
+        task.report(done=len(page_tables), total=total, unit="pages", rows=0)
+
+    def collect(result):
+        for page, tables in result.items():
+            page_tables[page] = tables
+            _write_page_cache(folder, page, signatures[page - 1], tables)
+        if task:
+            task.check_cancelled()
+            task.report(done=len(page_tables), total=total, unit="pages", rows=0)
+
+    batches = [missing[i:i + PAGES_PER_TASK] for i in range(0, len(missing), PAGES_PER_TASK)]
+    if len(batches) == 1:
+        collect(_extract_pages(file_path, batches[0]))
+    elif batches:
+        pool = _get_pool()
+        futures = [pool.submit(_extract_pages, file_path, batch) for batch in batches]
+        try:
+            for future in as_completed(futures):
+                collect(future.result())
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+    tables = [(page, df) for page in sorted(page_tables) for df in page_tables[page]]
+    if not tables:
+        raise ValueError("No table found in the PDF document.")
+    return merge_tables([df for _, df in tables], [page for page, _ in tables])
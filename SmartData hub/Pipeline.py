@@ -0,0 +1,360 @@
+# --- Pipeline.py ---
+import json
+import warnings
+from itertools import groupby
+import numpy as np
+import pandas as pd
+from Imputation import impute, is_local
+from Outliers import apply_actions, block_bounds, compute_bounds, numeric_columns
+
+# Steps that can be repeated back to back without changing the result
+IDEMPOTENT = {"drop_duplicates", "zero_negative", "drop_low_variance", "clean_labels"}
+# Steps that neither create nor hide duplicate rows, so dropping duplicates first gives the same frame.
+# drop_low_variance is not one: nunique() ignores NaN, so [1, NaN, 1] counts as constant and dropping it can
+# make rows equal that were not
+DEDUP_SAFE = {"add_total"}
+# Column-wise steps that can share one pass over the numeric block (outlier steps only when they remove no rows)
+FUSABLE = {"zero_negative", "add_total", "drop_low_variance", "outliers"}
+
+
+def _fill(df, step, profile=None):
+    fills = {col: spec for col, spec in step["fills"].items() if col in df.columns}
+    if not fills:
+        return df, None
+    return impute(df, fills), f"[✅] Missing values filled in: {', '.join(fills)}"
+
+
+def _drop_duplicates(df, step, profile=None):
+    before = len(df)
+    if profile is not None:
+        df = df[~profile.duplicate_mask(df)]  # Only rows sharing a fingerprint are compared
+    else:
+        df = df.drop_duplicates()
+    return df, f"[\U0001F9F9] Duplicates removed: {before - len(df)}"
+
+
+def _outliers(df, step, profile=None):
+    actions = {col: action for col, action in step["actions"].items() if col in df.columns}
+    if not actions:
+        return df, None
+    before = len(df)
+    bounds = compute_bounds(df, list(actions), step["method"])
+    df, counts = apply_actions(df, bounds, actions)
+    return df, _outlier_message(actions, counts, before - len(df))
+
+
+def _outlier_message(actions, counts, removed=0):
+    handled = [f"{col} ({actions[col]}, {count})" for col, count in counts.items() if count]
+    if not handled:
+        return "[⚠️] No outliers found."
+    message = f"[⚠️] Outliers handled in columns: {', '.join(handled)}"
+    if removed:
+        message += f"\n[⚠️] Rows removed as outliers: {removed}"
+    return message
+
+
+def _add_total(df, step, profile=None):
+    nums = df.select_dtypes(include=[np.number]).columns
+    if len(nums) < 2:
+        return df, None
+    df = df.copy(deep=False)
+    df['Total'] = df[nums].sum(axis=1)
+    return df, "[✨] Feature 'Total' added."
+
+
+def _zero_negative(df, step, profile=None):
+    df = df.copy(deep=False)
+    for col in df.select_dtypes(include=[np.number]).columns:
+        if (df[col] < 0).any():  # Only touch columns that change
+            df[col] = df[col].clip(lower=0)
+    return df, "[0️⃣] Negative values replaced with 0."
+
+
+def _drop_low_variance(df, step, profile=None):
+    if profile is not None:
+        drop = profile.constant_columns(df)
+    else:
+        counts = df.nunique()
+        drop = list(counts[counts == 1].index)
+    return df.drop(columns=drop), f"[\U0001F4C9] Dropped low variance columns: {drop}"
+
+
+def _clean_labels(df, step, profile=None):
+    df = df.copy(deep=False)
+    df.columns = df.columns.str.strip().str.lower().str.replace(' ', '_')
+    return df.reset_index(drop=True), "[\U0001F516] Index and labels cleaned."
+
+
+def _columnwise(df, step, profile=None):
+    # A fused run of column-wise steps: the numeric columns are read into one float block once, every step
+    # works on the whole block, and only the columns that changed are written back at the end
+    order = list(df.columns)
+    dtypes = dict(df.dtypes)
+    numeric = set(numeric_columns(df))  # What zero_negative and add_total see; outlier steps may load others
+    names = [col for col in order if col in numeric]  # Block column order
+    block = df[names].to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+    changed, messages = set(), []
+
+    def load(columns):
+        # Block positions of columns, reading in any the block does not hold yet
+        nonlocal block
+        extra = [col for col in columns if col not in names]
+        if extra:
+            block = np.column_stack([block, df[extra].to_numpy(dtype=np.float64, na_value=np.nan)])
+            names.extend(extra)
+        return [names.index(col) for col in columns]
+
+    for part in step["steps"]:
+        op = part["op"]
+        if op == "zero_negative":
+            cols = load([col for col in order if col in numeric])
+            hit = [i for i, negative in zip(cols, (block[:, cols] < 0).any(axis=0)) if negative]
+            block[:, hit] = np.maximum(block[:, hit], 0)
+            changed.update(names[i] for i in hit)
+            messages.append("[0️⃣] Negative values replaced with 0.")
+        elif op == "add_total":
+            nums = [col for col in order if col in numeric]
+            if len(nums) < 2:
+                continue
+            total = np.nansum(block[:, load(nums)], axis=1)
+            dtypes["Total"] = pd.DataFrame({col: pd.Series(dtype=dtypes[col]) for col in nums}).sum(axis=1).dtype
+            if "Total" in names:
+                block[:, names.index("Total")] = total
+            else:
+                block = np.column_stack([block, total])
+                names.append("Total")
+            if "Total" not in order:
+                order.append("Total")
+            numeric.add("Total")
+            changed.add("Total")
+            messages.append("[✨] Feature 'Total' added.")
+        elif op == "drop_low_variance":
+            if profile is not None and not changed:
+                drop = profile.constant_columns(df)
+            else:
+                # On the block nunique() == 1 is min == max over the non-missing values
+                constant = {}
+                cols = [col for col in order if col in names]
+                if len(block) and cols:
+                    sub = block[:, load(cols)]
+                    with warnings.catch_warnings():
+                        warnings.simplefilter("ignore", RuntimeWarning)  # All-NaN columns
+                        constant = dict(zip(cols, np.nanmin(sub, axis=0) == np.nanmax(sub, axis=0)))
+                drop = [col for col in order
+                        if (constant.get(col, False) if col in names else df[col].nunique() == 1)]
+            keep = [i for i, col in enumerate(names) if col not in drop]
+            block = block[:, keep]
+            names = [names[i] for i in keep]
+            order = [col for col in order if col not in drop]
+            numeric.difference_update(drop)
+            changed.difference_update(drop)
+            messages.append(f"[\U0001F4C9] Dropped low variance columns: {drop}")
+        else:
+            actions = {col: action for col, action in part["actions"].items() if col in order}
+            if not actions:
+                continue
+            cols = load(list(actions))
+            sub = block[:, cols]
+            lower, upper = block_bounds(sub, part["method"])
+            mask = (sub < lower) | (sub > upper)
+            counts = {}
+            for j, (col, action) in enumerate(actions.items()):
+                if action == "skip":
+                    continue
+                counts[col] = int(mask[:, j].sum())
+                if not counts[col]:
+                    continue
+                i, rows = cols[j], mask[:, j]
+                if action == "clip":
+                    low, high = lower[j], upper[j]
+                    if pd.api.types.is_integer_dtype(dtypes[col]):
+                        low, high = np.ceil(low), np.floor(high)  # Keep integer columns integer
+                    block[:, i] = np.clip(block[:, i], low, high)
+                elif action == "zero":
+                    block[rows, i] = 0
+                elif action == "positive":
+                    block[rows, i] = np.abs(block[rows, i])
+                changed.add(col)
+            messages.append(_outlier_message(actions, counts))
+
+    message = "\n".join(messages) or None
+    if not changed and order == list(df.columns):
+        return df, message
+    out = df.drop(columns=[col for col in df.columns if col not in order])
+    for col in order:
+        if col in changed:
+            out[col] = pd.Series(block[:, names.index(col)], index=df.index).astype(dtypes[col])
+    if list(out.columns) != order:
+        out = out[order]
+    return out, message
+
+
+OPERATIONS = {
+    "fill": _fill,
+    "drop_duplicates": _drop_duplicates,
+    "outliers": _outliers,
+    "add_total": _add_total,
+    "zero_negative": _zero_negative,
+    "drop_low_variance": _drop_low_variance,
+    "clean_labels": _clean_labels,
+}
+
+LABELS = {
+    "fill": "Fill missing values",
+    "drop_duplicates": "Remove duplicates",
+    "outliers": "Handle outliers",
+    "add_total": "Add 'Total' feature",
+    "zero_negative": "Replace negative values with 0",
+    "drop_low_variance": "Drop low variance columns",
+    "clean_labels": "Clean index and labels",
+}
+
+
+def _row_filter(step):
+    if step["op"] == "outliers":
+        actions = set(step["actions"].values()) - {"skip"}
+        return actions == {"remove"}
+    return step["op"] == "drop_duplicates"
+
+
+def _fusable(step):
+    if step["op"] == "outliers":
+        return "remove" not in step["actions"].values()
+    return step["op"] in FUSABLE
+
+
+def _row_wise_writes(step):
+    # Columns a step changes when each row's result depends only on that row, otherwise None
+    if step["op"] == "add_total":
+        return {"Total"}
+    if step["op"] == "fill" and all(spec["strategy"] == "value" for spec in step["fills"].values()):
+        return set(step["fills"])
+    return None
+
+
+def _moves_before(step, previous):
+    # A row filter can go first when previous works row by row and leaves the columns the filter reads alone.
+    # Steps that look at other rows (mean fills, outlier bounds, low variance) would see different data
+    if step["op"] == "drop_duplicates":
+        return previous["op"] in DEDUP_SAFE  # Reads every column
+    writes = _row_wise_writes(previous)
+    return writes is not None and not writes & set(step["actions"])
+
+
+def optimize(steps):
+    # Move row filters ahead of steps they commute with, so later steps see fewer rows
+    ordered = []
+    for step in steps:
+        position = len(ordered)
+        if _row_filter(step):
+            while position and _moves_before(step, ordered[position - 1]):
+                position -= 1
+        ordered.insert(position, step)
+
+    # Collapse repeated steps and merge neighbouring fills into a single pass
+    merged = []
+    for step in ordered:
+        previous = merged[-1] if merged else None
+        if previous and previous["op"] == step["op"]:
+            if step["op"] in IDEMPOTENT:
+                continue
+            # Group and KNN fills read other columns, so only column-local fills can share a pass
+            if (step["op"] == "fill" and not set(previous["fills"]) & set(step["fills"])
+                    and is_local(previous["fills"]) and is_local(step["fills"])):
+                merged[-1] = {"op": "fill", "fills": {**previous["fills"], **step["fills"]}}
+                continue
+        merged.append(step)
+
+    # Runs of column-wise steps share one pass over the numeric block
+    fused = []
+    for fusable, run in groupby(merged, key=_fusable):
+        run = list(run)
+        if fusable and len(run) > 1:
+            fused.append({"op": "columnwise", "steps": run})
+        else:
+            fused.extend(run)
+    return fused
+
+
+def describe_step(step):
+    label = LABELS.get(step["op"], step["op"])
+    if step["op"] == "fill":
+        details = ", ".join(f"{col}={spec['strategy']}" + (f" by {spec['by']}" if "by" in spec else "")
+                            for col, spec in step["fills"].items())
+        return f"{label}: {details}"
+    if step["op"] == "outliers":
+        details = ", ".join(f"{col}={action}" for col, action in step["actions"].items())
+        return f"{label} ({step['method']}): {details}"
+    return label
+
+
+class Pipeline:
+    # Cleaning steps are recorded as plain dicts and only executed when the data is needed
+    def __init__(self, steps=None):
+        self.steps = list(steps or [])
+
+    def record(self, op, **params):
+        if op not in OPERATIONS:
+            raise ValueError(f"Unknown cleaning step: {op}")
+        self.steps.append({"op": op, **params})
+
+    def run(self, df, start=0, log=None, profile=None):
+        # profile, if given, describes df and is used until the first step changes the frame
+        for step in optimize(self.steps[start:]):
+            operation = _columnwise if step["op"] == "columnwise" else OPERATIONS[step["op"]]
+            result, message = operation(df, step, profile)
+            if result is not df:
+                df, profile = result, None
+            if log and message:
+                log(message)
+        return df
+
+    def schema(self, df, start=0):
+        # Zero-row frame with the columns the steps from start will leave, worked out without running them.
+        # Low variance drops depend on the values, so those columns stay listed until the steps run
+        empty = df.iloc[:0]
+        for step in self.steps[start:]:
+            if step["op"] in ("add_total", "clean_labels"):
+                empty, _ = OPERATIONS[step["op"]](empty, step)
+        return empty
+
+    def describe(self):
+        return [describe_step(step) for step in self.steps]
+
+    def to_json(self):
+        return json.dumps({"version": 1, "steps": self.steps}, indent=2, default=str)
+
+    @classmethod
+    def from_json(cls, text):
+        steps = json.loads(text)["steps"]
+        for step in steps:
+            if step.get("op") not in OPERATIONS:
+                raise ValueError(f"Unknown cleaning step: {step.get('op')}")
+        return cls(steps)
+
+    def save(self, file_path):
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write(self.to_json())
+
+    @classmethod
+    def load(cls, file_path):
+        with open(file_path, encoding="utf-8") as f:
+            return cls.from_json(f.read())
+
+
+# Headless replay: python Pipeline.py recipe.json input.csv output.csv
+if __name__ == "__main__":
+    import argparse
+    from Export import write_frame
+    from Ingestion import load_dataset
+
+    parser = argparse.ArgumentParser(description="Apply a saved cleaning recipe to a data file.")
+    parser.add_argument("recipe", help="JSON recipe saved from the Data Cleaning window")
+    parser.add_argument("input", help="CSV, Word or PDF file to clean")
+    parser.add_argument("output", help="Where to write the cleaned data (.csv, .csv.gz, .csv.zst, .parquet, .feather or .xlsx)")
+    args = parser.parse_args()
+
+    pipeline = Pipeline.load(args.recipe)
+    df = pipeline.run(load_dataset(args.input), log=print)
+    write_frame(df, args.output)
+    print(f"[💾] File saved: {args.output} ({len(df)} rows)")
@@ -1,18 +1,18 @@
 # --- Prediction.py ---
 import tkinter as tk
-from tkinter import messagebox, ttk
-import pandas as pd
-from sklearn.linear_model import LinearRegression, LogisticRegression
-from sklearn.preprocessing import StandardScaler
-from sklearn.pipeline import make_pipeline
+from tkinter import messagebox, ttk, filedialog
 import numpy as np
+from Export import FILETYPES
+from Scoring import INPUT_FILETYPES, score_file
+from Tasks import run_with_progress
+from Training import MODEL_TYPES, train
 
 class PredictionApp:
     def __init__(self, root, df):
         self.root = root
         self.df = df
         self.root.title("🎯 Prediction App")
-        self.root.geometry("650x400")
+        self.root.geometry("650x480")
         self.root.configure(bg="#f0f8ff")
 
         self.style = ttk.Style()
@@ -32,7 +32,7 @@ class PredictionApp:
             main_frame.columnconfigure(i, weight=1, uniform="col")
 
         ttk.Label(main_frame, text="Prediction Type:").grid(row=0, column=0, sticky="e", padx=5, pady=5)
-        self.prediction_type = ttk.Combobox(main_frame, state="readonly", values=["Numeric (Linear Regression)", "Categorical (Logistic Regression)"], width=35)
+        self.prediction_type = ttk.Combobox(main_frame, state="readonly", values=MODEL_TYPES, width=35)
         self.prediction_type.grid(row=0, column=1, sticky="w", pady=5)
 
         ttk.Label(main_frame, text="Target Column:").grid(row=1, column=0, sticky="e", padx=5, pady=5)
@@ -43,8 +43,8 @@ class PredictionApp:
         self.feature_entry = ttk.Entry(main_frame, width=38)
         self.feature_entry.grid(row=2, column=1, sticky="w", pady=5)
 
-        train_button = ttk.Button(main_frame, text="🚀 Train Model", command=self.train_model, width=25)
-        train_button.grid(row=3, column=0, columnspan=2, pady=(10, 10))
+        self.train_button = ttk.Button(main_frame, text="🚀 Train Model", command=self.train_model, width=25)
+        self.train_button.grid(row=3, column=0, columnspan=2, pady=(10, 10))
 
         ttk.Label(main_frame, text="Prediction Input (comma):").grid(row=4, column=0, sticky="e", padx=5, pady=5)
         self.value_entry = ttk.Entry(main_frame, width=38)
@@ -53,44 +53,98 @@ class PredictionApp:
         predict_button = ttk.Button(main_frame, text="🔮 Predict", command=self.make_prediction, width=25)
         predict_button.grid(row=5, column=0, columnspan=2, pady=(10, 5))
 
+        batch_button = ttk.Button(main_frame, text="📂 Batch Predict", command=self.batch_predict, width=25)
+        batch_button.grid(row=6, column=0, columnspan=2, pady=(5, 5))
+
+        self.status_label = ttk.Label(root, text="No model trained yet.", relief="sunken", anchor="w")
+        self.status_label.pack(fill="x", side="bottom")
+
         self.column_dropdown["values"] = list(self.df.columns)
 
     def train_model(self):
         target_column = self.column_dropdown.get()
-        feature_columns = [col.strip() for col in self.feature_entry.get().split(",")]
+        feature_columns = [col.strip() for col in self.feature_entry.get().split(",") if col.strip()]
         prediction_type = self.prediction_type.get()
 
         if not target_column or not feature_columns or not prediction_type:
             messagebox.showerror("Error", "Please select all options!")
             return
 
-        try:
-            X = self.df[feature_columns].dropna().astype(float)
-            y = self.df[target_column].dropna()
-
-            if prediction_type == "Numeric (Linear Regression)":
-                self.model = make_pipeline(StandardScaler(), LinearRegression())
-            else:
-                self.model = make_pipeline(
-                    StandardScaler(),
-                    LogisticRegression(max_iter=100000, solver='saga')
-                )
-
-            self.model.fit(X, y)
-            self.feature_columns = feature_columns
+        df = self.df
+
+        def on_done(result):
+            self.train_button.config(state="normal")
+            self.model = result["model"]
+            self.feature_columns = result["features"]
+            self.classify = result["classify"]
+            metric = "accuracy" if result["classify"] else "R²"
+            self.status_label.config(text=f"{result['solver']} on {result['rows']:,} rows "
+                                          f"({result['dropped']:,} with missing values left out), "
+                                          f"training {metric} {result['score']:.3f}")
             messagebox.showinfo("Success", "Model trained successfully!")
-        except Exception as e:
+
+        def on_error(e):
+            self.train_button.config(state="normal")
             messagebox.showerror("Error", f"Training failed: {e}")
 
+        def on_cancel():
+            self.train_button.config(state="normal")
+            self.status_label.config(text="Training cancelled.")
+
+        def describe(info):
+            if "total" not in info:
+                return f"{info['rows']:,} rows"
+            return f"{info['stage']}, {info['done']} of {info['total']} {info['unit']}"
+
+        # The design matrix is built off the Tk thread and the solver runs in its own process
+        self.train_button.config(state="disabled")
+        run_with_progress(self.root, "Training", "🚀 Training:",
+                          lambda task: train(df, feature_columns, target_column, prediction_type, task),
+                          on_done, on_error, on_cancel, describe=describe)
+
     def make_prediction(self):
         if not hasattr(self, 'model'):
             messagebox.showerror("Error", "Please train the model first!")
             return
 
         try:
-            input_values = np.array([float(val.strip()) for val in self.value_entry.get().split(",")]).reshape(1, -1)
-            input_df = pd.DataFrame(input_values, columns=self.feature_columns)
-            prediction = self.model.predict(input_df)
+            input_values = np.array([float(val.strip()) for val in self.value_entry.get().split(",")],
+                                    dtype=np.float32).reshape(1, -1)
+            prediction = self.model.predict(input_values)
             messagebox.showinfo("Prediction Result", f"🔮 Predicted value: {prediction[0]}")
         except Exception as e:
             messagebox.showerror("Error", f"Prediction failed: {e}")
+
+    def batch_predict(self):
+        # Scores a whole CSV/Parquet/Feather file chunk by chunk and writes it back with prediction columns
+        if not hasattr(self, 'model'):
+            messagebox.showerror("Error", "Please train the model first!")
+            return
+        input_path = filedialog.askopenfilename(filetypes=INPUT_FILETYPES, title="File to score")
+        if not input_path:
+            return
+        output_path = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[filetype for filetype in FILETYPES if filetype[1] != "*.xlsx"],
+            title="Save predictions"
+        )
+        if not output_path:
+            return
+
+        model, features, classify = self.model, self.feature_columns, self.classify
+
+        def on_done(result):
+            summary = (f"{result['rows']:,} rows ({result['scored']:,} scored) in {result['seconds']:.1f}s, "
+                       f"{result['rate']:,.0f} rows/s")
+            self.status_label.config(text=f"Batch prediction: {summary}")
+            messagebox.showinfo("Batch Prediction", f"Predictions saved to:\n{result['path']}\n\n{summary}")
+
+        def on_error(e):
+            messagebox.showerror("Error", f"Batch prediction failed: {e}")
+
+        def describe(info):
+            return f"{info['rows']:,} rows, {info['rate']:,.0f} rows/s"
+
+        run_with_progress(self.root, "Batch Prediction", "📂 Scoring:",
+                          lambda task: score_file(model, features, classify, input_path, output_path, task),
+                          on_done, on_error, describe=describe)
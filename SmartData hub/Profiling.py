@@ -0,0 +1,162 @@
+# --- Profiling.py ---
+import numpy as np
+import pandas as pd
+
+CHUNK_ROWS = 100000
+EXACT_DISTINCT_VALUES = 200000  # Distinct counts are exact up to this many values, HyperLogLog estimates above it
+HLL_PRECISION = 14  # 16384 registers, about 0.8% standard error
+SKETCH_SIZE = 10000  # Values kept per numeric column for approximate quantiles
+QUANTILES = [0.25, 0.5, 0.75]
+MIX = np.uint64(0x100000001B3)
+
+
+def _bit_length(values):
+    # Bit length of uint64 values, done in two 32-bit halves so float conversion stays exact
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    high_bits = np.frexp(high)[1]
+    low_bits = np.frexp(low)[1]
+    return np.where(high > 0, high_bits + 32, low_bits)
+
+
+class HyperLogLog:
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, hashes):
+        if not len(hashes):
+            return
+        shift = np.uint64(64 - self.precision)
+        index = (hashes >> shift).astype(np.int64)
+        rest = hashes << np.uint64(self.precision)
+        rank = np.minimum(64 - _bit_length(rest), 64 - self.precision) + 1
+        np.maximum.at(self.registers, index, rank.astype(np.uint8))
+
+    def estimate(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)  # Linear counting for small cardinalities
+        return int(round(estimate))
+
+
+class _DistinctCounter:
+    # Exact on hashes while the column has few distinct values, switches to HyperLogLog once it grows
+    def __init__(self):
+        self.parts = []
+        self.stored = 0
+        self.hll = None
+
+    def add(self, hashes):
+        if self.hll is not None:
+            self.hll.add(hashes)
+            return
+        part = pd.unique(hashes)
+        self.parts.append(part)
+        self.stored += len(part)
+        if self.stored > EXACT_DISTINCT_VALUES:
+            merged = pd.unique(np.concatenate(self.parts))
+            self.parts = [merged]
+            self.stored = len(merged)
+            if self.stored > EXACT_DISTINCT_VALUES:
+                self.hll = HyperLogLog()
+                self.hll.add(merged)
+                self.parts = []
+
+    @property
+    def exact(self):
+        return self.hll is None
+
+    def count(self):
+        if self.hll is not None:
+            return self.hll.estimate()
+        return len(pd.unique(np.concatenate(self.parts))) if self.parts else 0
+
+
+class Profile:
+    # Column statistics and row fingerprints gathered in one chunked pass over a frame
+    def __init__(self, df, chunk_rows=CHUNK_ROWS, seed=0):
+        self.rows = len(df)
+        self.columns = list(df.columns)
+        numeric = [col for col in self.columns
+                   if isinstance(df[col].dtype, np.dtype) and df[col].dtype.kind in "iuf"]
+        rng = np.random.default_rng(seed)
+        rate = min(1.0, SKETCH_SIZE / max(self.rows, 1))
+
+        nulls = dict.fromkeys(self.columns, 0)
+        counters = {col: _DistinctCounter() for col in self.columns}
+        first = {}
+        constant = dict.fromkeys(self.columns, True)
+        minimum, maximum = {}, {}
+        samples = {col: [] for col in numeric}
+        self.row_hashes = np.zeros(self.rows, dtype=np.uint64)
+
+        with np.errstate(over="ignore"):
+            for start in range(0, self.rows, chunk_rows):
+                chunk = df.iloc[start:start + chunk_rows]
+                row_hash = np.zeros(len(chunk), dtype=np.uint64)
+                for col in self.columns:
+                    series = chunk[col]
+                    missing = series.isna().to_numpy()
+                    hashes = pd.util.hash_pandas_object(series, index=False).to_numpy()
+                    row_hash = (row_hash ^ hashes) * MIX  # Order-dependent mix of the column hashes
+
+                    nulls[col] += int(missing.sum())
+                    present = hashes[~missing]
+                    if not len(present):
+                        continue
+                    counters[col].add(present)
+                    first.setdefault(col, present[0])
+                    constant[col] = constant[col] and bool((present == first[col]).all())
+
+                    if col in samples:
+                        values = series.to_numpy()[~missing]
+                        low, high = values.min(), values.max()
+                        minimum[col] = low if col not in minimum else min(minimum[col], low)
+                        maximum[col] = high if col not in maximum else max(maximum[col], high)
+                        samples[col].append(values[rng.random(len(values)) < rate])
+                self.row_hashes[start:start + len(chunk)] = row_hash
+
+        self.nulls = pd.Series(nulls, dtype=np.int64)
+        self.distinct = pd.Series({col: counter.count() for col, counter in counters.items()}, dtype=np.int64)
+        self.distinct_exact = pd.Series({col: counter.exact for col, counter in counters.items()})
+        self.minimum = pd.Series(minimum, dtype=object)
+        self.maximum = pd.Series(maximum, dtype=object)
+        quantiles = {}
+        for col, parts in samples.items():
+            values = np.concatenate(parts) if parts else np.empty(0)
+            quantiles[col] = np.quantile(values, QUANTILES) if len(values) else [np.nan] * len(QUANTILES)
+        self.quantiles = pd.DataFrame(quantiles, index=QUANTILES).T
+        # Columns whose non-null values all hash alike; confirmed exactly before anything is dropped
+        self.constant_candidates = [col for col in self.columns if col in first and constant[col]]
+
+    def duplicate_candidates(self):
+        # Rows whose fingerprint was seen before; a hash collision can only over-report
+        return pd.Series(self.row_hashes).duplicated().to_numpy()
+
+    def duplicate_mask(self, df):
+        # Exact duplicated() mask, comparing real values only among rows that share a fingerprint
+        hashes = pd.Series(self.row_hashes)
+        involved = np.flatnonzero(hashes.duplicated(keep=False).to_numpy())
+        mask = np.zeros(self.rows, dtype=bool)
+        if len(involved):
+            mask[involved] = df.iloc[involved].duplicated().to_numpy()
+        return mask
+
+    def constant_columns(self, df):
+        return [col for col in self.constant_candidates if df[col].nunique() == 1]
+
+    def summary(self):
+        table = pd.DataFrame({
+            "nulls": self.nulls,
+            "distinct": [f"{count:,}" if exact else f"~{count:,}"
+                         for count, exact in zip(self.distinct, self.distinct_exact)],
+            "min": self.minimum.reindex(self.columns),
+            "max": self.maximum.reindex(self.columns),
+        }, index=self.columns)
+        for q in QUANTILES:
+            table[f"p{int(q * 100)}"] = self.quantiles[q].reindex(self.columns) if len(self.quantiles) else np.nan
+        return table.fillna("")
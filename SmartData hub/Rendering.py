@@ -0,0 +1,123 @@
+# --- Rendering.py ---
+import numpy as np
+import pandas as pd
+
+MAX_LINE_POINTS = 4000  # Lines longer than this are reduced with LTTB
+MAX_SCATTER_POINTS = 20000  # Scatters larger than this are drawn as a density raster
+MAX_WEBGL_POINTS = 100000  # Interactive scatters above this are binned before they reach plotly
+GRID = 400
+SEED = 0
+
+
+def axis_values(series):
+    # Numbers and dates plot as themselves; anything else by position, as pandas does for line plots
+    if pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_datetime64_any_dtype(series.dtype):
+        return series.to_numpy(), False
+    return np.arange(len(series)), True
+
+
+def numeric_values(series):
+    if not pd.api.types.is_numeric_dtype(series.dtype):
+        raise ValueError(f"Column '{series.name}' is not numeric.")
+    return series.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def complete_rows(x, y):
+    keep = ~(pd.isna(x) | pd.isna(y))
+    return x[keep], y[keep]
+
+
+def lttb(x, y, threshold):
+    # Largest-Triangle-Three-Buckets: keeps the points that carry the visible shape of the line
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return x, y
+    xf = (x.view(np.int64) if x.dtype.kind == "M" else x).astype(np.float64)
+    yf = y.astype(np.float64)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    picked = np.empty(threshold, dtype=np.int64)
+    picked[0], picked[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, stop = edges[i], edges[i + 1]
+        following = slice(stop, edges[i + 2] if i + 2 < len(edges) else n)
+        avg_x, avg_y = xf[following].mean(), yf[following].mean()
+        area = np.abs((xf[a] - avg_x) * (yf[start:stop] - yf[a]) - (xf[a] - xf[start:stop]) * (avg_y - yf[a]))
+        a = start + int(area.argmax())
+        picked[i + 1] = a
+    return x[picked], y[picked]
+
+
+def line_points(x, y):
+    x, y = complete_rows(x, y)
+    reduced = len(x) > MAX_LINE_POINTS
+    if reduced:
+        x, y = lttb(x, y, MAX_LINE_POINTS)
+    return x, y, reduced
+
+
+def line(ax, x, y, **kwargs):
+    x, y, reduced = line_points(x, y)
+    artist, = ax.plot(x, y, marker=None if reduced else 'o', **kwargs)
+    return artist, reduced
+
+
+def density_grid(x, y):
+    # Rasterized point density: one histogram pass, drawn as a single image however many rows there are
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=GRID)
+    counts[counts == 0] = np.nan
+    return counts.T, (x_edges[0], x_edges[-1], y_edges[0], y_edges[-1])
+
+
+def density(ax, x, y, cmap="viridis"):
+    from matplotlib.colors import LogNorm
+
+    counts, extent = density_grid(x, y)
+    image = ax.imshow(counts, origin="lower", aspect="auto", cmap=cmap, norm=LogNorm(),
+                      extent=extent, interpolation="nearest")
+    ax.figure.colorbar(image, ax=ax, label="Points")
+    return image
+
+
+def scatter(ax, x, y, **kwargs):
+    x, y = complete_rows(x, y)
+    if len(x) > MAX_SCATTER_POINTS:
+        density(ax, x, y)
+        return True
+    ax.scatter(x, y, **kwargs)
+    return False
+
+
+def sample_by_label(labels, limit=MAX_SCATTER_POINTS, seed=SEED):
+    # Row positions to draw: every group keeps its share of the points, and small groups keep at least a few
+    if len(labels) <= limit:
+        return np.arange(len(labels))
+    rng = np.random.default_rng(seed)
+    picked = []
+    for label in pd.unique(labels):
+        rows = np.flatnonzero(labels == label)
+        size = min(len(rows), max(50, int(limit * len(rows) / len(labels))))
+        picked.append(rng.choice(rows, size, replace=False))
+    return np.sort(np.concatenate(picked))
+
+
+def interactive_scatter(df, x_col, y_col, title):
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    x, y = complete_rows(numeric_values(df[x_col]), numeric_values(df[y_col]))
+    if len(x) <= MAX_WEBGL_POINTS:
+        return px.scatter(x=x, y=y, labels={"x": x_col, "y": y_col}, title=title, render_mode="webgl")
+    # Bin first and send one WebGL marker per occupied cell, coloured by how many rows fell into it
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=GRID)
+    cx, cy = np.nonzero(counts)
+    x_mid = (x_edges[:-1] + x_edges[1:]) / 2
+    y_mid = (y_edges[:-1] + y_edges[1:]) / 2
+    values = counts[cx, cy]
+    fig = go.Figure(go.Scattergl(
+        x=x_mid[cx], y=y_mid[cy], mode="markers", text=[f"{int(v):,} rows" for v in values],
+        marker=dict(color=np.log10(values), colorscale="Viridis", size=4,
+                    colorbar=dict(title="log10 rows")),
+    ))
+    fig.update_layout(title=f"{title} ({len(x):,} rows binned)", xaxis_title=x_col, yaxis_title=y_col)
+    return fig
@@ -0,0 +1,131 @@
+# --- Scoring.py ---
+import os
+import time
+import numpy as np
+import pandas as pd
+from Export import ChunkWriter
+
+CHUNK_ROWS = 100000
+PARALLEL_BYTES = 64 * 1024 * 1024  # Inputs larger than this are scored by worker processes
+MAX_WORKERS = max(1, min(4, (os.cpu_count() or 1)))
+INPUT_FILETYPES = [
+    ("Data files", "*.csv *.csv.gz *.parquet *.feather *.arrow"),
+    ("CSV files", "*.csv"),
+    ("Parquet files", "*.parquet"),
+    ("Feather files", "*.feather"),
+]
+
+
+def read_chunks(file_path, chunk_rows=CHUNK_ROWS):
+    # Yields (frame, done, total, unit): progress in bytes for CSV and in rows for the columnar formats
+    name = file_path.lower()
+    if name.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        source = pq.ParquetFile(file_path)
+        total, done = source.metadata.num_rows, 0
+        for batch in source.iter_batches(batch_size=chunk_rows):
+            done += batch.num_rows
+            yield batch.to_pandas(), done, total, "rows"
+    elif name.endswith((".feather", ".arrow")):
+        import pyarrow as pa
+
+        with pa.memory_map(file_path) as source:
+            reader = pa.ipc.open_file(source)
+            total, done = sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches)), 0
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i)
+                done += batch.num_rows
+                yield batch.to_pandas(), done, total, "rows"
+    else:
+        total = os.path.getsize(file_path)
+        with open(file_path, "rb") as handle:
+            compression = "gzip" if name.endswith(".gz") else None
+            for chunk in pd.read_csv(handle, chunksize=chunk_rows, compression=compression):
+                yield chunk, handle.tell(), total, "bytes"
+
+
+def score_chunk(model, chunk, features, classify):
+    # Vectorized over the whole chunk; rows with a missing or non-numeric feature get an empty prediction
+    missing = [col for col in features if col not in chunk.columns]
+    if missing:
+        raise ValueError(f"Input file is missing feature columns: {', '.join(missing)}")
+    X = chunk[features].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float32)
+    complete = ~np.isnan(X).any(axis=1)
+    out = chunk.reset_index(drop=True)
+    if classify:
+        predictions = np.full(len(chunk), None, dtype=object)
+    else:
+        predictions = np.full(len(chunk), np.nan)
+    if complete.any():
+        predictions[complete] = model.predict(X[complete])
+    out["Prediction"] = predictions
+    if classify and hasattr(model, "predict_proba"):
+        probabilities = np.full((len(chunk), len(model.classes_)), np.nan)
+        if complete.any():
+            probabilities[complete] = model.predict_proba(X[complete])
+        for i, label in enumerate(model.classes_):
+            out[f"P({label})"] = probabilities[:, i]
+    return out, int(complete.sum())
+
+
+_worker_model = None
+
+
+def _init_worker(model):
+    global _worker_model
+    _worker_model = model
+
+
+def _score_in_worker(chunk, features, classify):
+    return score_chunk(_worker_model, chunk, features, classify)
+
+
+def score_file(model, features, classify, input_path, output_path, task=None, max_workers=None):
+    # Streams the input through the model and the output writer chunk by chunk; large inputs are scored
+    # by a process pool while the chunks are still written in their original order
+    if max_workers is None:
+        max_workers = MAX_WORKERS if os.path.getsize(input_path) > PARALLEL_BYTES else 1
+    start = time.perf_counter()
+    rows = scored = 0
+
+    def written(out, count, done, total, unit):
+        nonlocal rows, scored
+        writer.write(out)
+        rows += len(out)
+        scored += count
+        if task:
+            task.check_cancelled()
+            rate = rows / max(time.perf_counter() - start, 1e-9)
+            task.report(done=done, total=total, unit=unit, rows=rows, rate=rate)
+
+    with ChunkWriter(output_path) as writer:
+        if max_workers <= 1:
+            for chunk, *progress in read_chunks(input_path):
+                written(*score_chunk(model, chunk, features, classify), *progress)
+        else:
+            from collections import deque
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers, initializer=_init_worker, initargs=(model,)) as pool:
+                pending = deque()
+                try:
+                    for chunk, *progress in read_chunks(input_path):
+                        pending.append((pool.submit(_score_in_worker, chunk, features, classify), progress))
+                        # At most two chunks per worker in flight keeps memory bounded
+                        if len(pending) >= 2 * max_workers:
+                            future, progress = pending.popleft()
+                            written(*future.result(), *progress)
+                    while pending:
+                        future, progress = pending.popleft()
+                        written(*future.result(), *progress)
+                except BaseException:
+                    for future, _ in pending:
+                        future.cancel()
+                    raise
+        if not rows:
+            raise ValueError("The input file has no rows.")
+
+    seconds = time.perf_counter() - start
+    return {"rows": rows, "scored": scored, "seconds": seconds, "rate": rows / max(seconds, 1e-9),
+            "workers": max_workers, "path": output_path}
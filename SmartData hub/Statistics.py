@@ -0,0 +1,125 @@
+# --- Statistics.py ---
+import numpy as np
+import pandas as pd
+
+CHUNK_ROWS = 100000
+CHECK_ROWS = 64  # Rows compared to decide whether a new frame only appended rows
+PAIRPLOT_ROWS = 2000
+PAIRPLOT_COLUMNS = 6
+MAX_STRATA = 10
+
+
+def numeric_block(df):
+    return [col for col in df.columns if pd.api.types.is_numeric_dtype(df[col].dtype)
+            and not pd.api.types.is_bool_dtype(df[col].dtype)]
+
+
+class CorrelationAccumulator:
+    # Pairwise-complete Pearson sums over float32 chunks; more rows can be added at any time
+    def __init__(self, columns):
+        p = len(columns)
+        self.columns = list(columns)
+        self.rows = 0
+        self.shift = None  # Per-column offset taken from the first chunk, keeps the sums well conditioned
+        self.n = np.zeros((p, p))
+        self.sx = np.zeros((p, p))
+        self.sxx = np.zeros((p, p))
+        self.sxy = np.zeros((p, p))
+
+    def add(self, block):
+        block = np.asarray(block, dtype=np.float32)
+        if not len(block):
+            return
+        present = ~np.isnan(block)
+        if self.shift is None:
+            with np.errstate(all="ignore"):
+                self.shift = np.nan_to_num(np.nanmean(block, axis=0, dtype=np.float64)).astype(np.float32)
+        values = np.where(present, block - self.shift, 0).astype(np.float32)
+        mask = present.astype(np.float32)
+        # Entry (i, j) only sums rows where both column i and column j are present
+        self.n += mask.T @ mask
+        self.sx += values.T @ mask
+        self.sxx += (values * values).T @ mask
+        self.sxy += values.T @ values
+        self.rows += len(block)
+
+    def matrix(self):
+        with np.errstate(all="ignore"):
+            cov = self.n * self.sxy - self.sx * self.sx.T
+            var = (self.n * self.sxx - self.sx * self.sx) * (self.n * self.sxx - self.sx * self.sx).T
+            corr = cov / np.sqrt(var)
+        corr[self.n < 2] = np.nan
+        np.fill_diagonal(corr, np.where(np.diag(self.n) >= 2, 1.0, np.nan))
+        return pd.DataFrame(np.clip(corr, -1, 1), index=self.columns, columns=self.columns)
+
+
+def _fingerprint(df, rows):
+    # Hash of a few spread-out rows below `rows`, enough to tell an append from an edited frame
+    positions = np.unique(np.linspace(0, rows - 1, min(rows, CHECK_ROWS)).astype(np.int64))
+    return pd.util.hash_pandas_object(df.iloc[positions], index=False).to_numpy().tobytes()
+
+
+class CorrelationCache:
+    # Correlation matrices per dataset version; Pearson is extended in place when rows are only appended
+    def __init__(self):
+        self.version = None
+        self.pearson = None
+        self.fingerprint = None
+        self.spearman = None
+
+    def _rows(self, df, columns, start, accumulator):
+        for offset in range(start, len(df), CHUNK_ROWS):
+            accumulator.add(df[columns].iloc[offset:offset + CHUNK_ROWS].to_numpy(dtype=np.float32, na_value=np.nan))
+
+    def correlation(self, df, version, method="pearson"):
+        columns = numeric_block(df)
+        if version != self.version:
+            appended = (self.pearson is not None and self.pearson.columns == columns
+                        and 0 < self.pearson.rows <= len(df)
+                        and _fingerprint(df, self.pearson.rows) == self.fingerprint)
+            if not appended:
+                self.pearson = CorrelationAccumulator(columns)
+            self._rows(df, columns, self.pearson.rows, self.pearson)
+            self.fingerprint = _fingerprint(df, self.pearson.rows) if self.pearson.rows else None
+            self.spearman = None
+            self.version = version
+
+        if method == "spearman":
+            if self.spearman is None:
+                # Ranks depend on every row, so Spearman is recomputed for each version rather than extended
+                ranks = df[columns].rank(method="average")
+                accumulator = CorrelationAccumulator(columns)
+                self._rows(ranks, columns, 0, accumulator)
+                self.spearman = accumulator.matrix()
+            return self.spearman
+        return self.pearson.matrix()
+
+
+def pairplot_columns(corr, limit=PAIRPLOT_COLUMNS):
+    # The most correlated columns say the most in a pairplot
+    if len(corr.columns) <= limit:
+        return list(corr.columns)
+    strength = corr.abs().fillna(0).sum() - 1
+    return list(strength.sort_values(ascending=False).index[:limit])
+
+
+def stratified_sample(df, size=PAIRPLOT_ROWS, by=None, seed=0):
+    # Same share of every group of `by` (or a plain random sample), so rare groups still show up
+    if len(df) <= size:
+        return df
+    if by is None:
+        return df.sample(size, random_state=seed)
+    codes, _ = pd.factorize(df[by], use_na_sentinel=False)
+    rng = np.random.default_rng(seed)
+    picked = []
+    for code in range(codes.max() + 1):
+        rows = np.flatnonzero(codes == code)
+        picked.append(rng.choice(rows, max(1, round(len(rows) * size / len(df))), replace=False))
+    return df.iloc[np.sort(np.concatenate(picked))]
+
+
+def can_stratify(series):
+    return series.nunique() <= MAX_STRATA
+
+
+STATS_CACHE = CorrelationCache()
@@ -0,0 +1,128 @@
+# --- Tasks.py ---
+import threading
+import queue
+
+POLL_MS = 100
+
+
+class TaskCancelled(Exception):
+    pass
+
+
+class BackgroundTask:
+    # Runs work(task) on a worker thread and hands results back to the Tk loop through a queue
+    def __init__(self, root, work, on_done, on_error=None, on_progress=None, on_cancel=None):
+        self.root = root
+        self.work = work
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.on_cancel = on_cancel
+        self.cancel_event = threading.Event()
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        self.root.after(POLL_MS, self._poll)
+        return self
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def is_cancelled(self):
+        return self.cancel_event.is_set()
+
+    def check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise TaskCancelled()
+
+    def report(self, **progress):
+        self.queue.put(("progress", progress))
+
+    def _run(self):
+        try:
+            result = self.work(self)
+            self.queue.put(("done", result))
+        except TaskCancelled:
+            self.queue.put(("cancelled", None))
+        except Exception as e:
+            self.queue.put(("error", e))
+
+    def _owner_exists(self):
+        import tkinter as tk
+
+        try:
+            return bool(self.root.winfo_exists())
+        except tk.TclError:  # The whole application is gone
+            return False
+
+    def _poll(self):
+        # A closed owner window takes the callbacks with it; the worker is told to stop instead
+        if not self._owner_exists():
+            self.cancel()
+            return
+        latest = None
+        while True:
+            try:
+                kind, payload = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                latest = payload  # Only the newest progress update is worth drawing
+                continue
+            if kind == "done":
+                self.on_done(payload)
+            elif kind == "error" and self.on_error:
+                self.on_error(payload)
+            elif kind == "cancelled" and self.on_cancel:
+                self.on_cancel()
+            return
+        if latest is not None and self.on_progress:
+            self.on_progress(latest)
+        self.root.after(POLL_MS, self._poll)
+
+
+def run_with_progress(root, title, message, work, on_done, on_error=None, on_cancel=None, describe=None):
+    # Progress window with a Cancel button around a BackgroundTask; describe(info) adds detail to the message
+    import tkinter as tk
+    from tkinter import messagebox, ttk
+
+    if on_error is None:
+        def on_error(e):
+            messagebox.showerror("Error", f"{title} failed:\n{e}", parent=root)
+
+    window = tk.Toplevel(root)
+    window.title(title)
+    window.geometry("420x150")
+    window.configure(bg="#ffffff")
+    window.transient(root)
+    status = tk.Label(window, text=message, font=("Arial", 11), bg="#ffffff", fg="#2c3e50")
+    status.pack(pady=10)
+    bar = ttk.Progressbar(window, length=360, mode="indeterminate")
+    bar.pack(pady=5)
+    bar.start(10)
+
+    def on_progress(info):
+        if info.get("total"):
+            if bar["mode"] != "determinate":
+                bar.stop()
+                bar.config(mode="determinate")
+            bar.config(maximum=info["total"])
+            bar["value"] = info["done"]
+        if describe:
+            status.config(text=f"{message} {describe(info)}")
+
+    def finish(callback):
+        def handler(*args):
+            window.destroy()
+            if callback:
+                callback(*args)
+        return handler
+
+    task = BackgroundTask(root, work, finish(on_done), on_error=finish(on_error),
+                          on_progress=on_progress, on_cancel=finish(on_cancel))
+    tk.Button(window, text="Cancel ❌", command=task.cancel, font=("Arial", 11, "bold"), bg="#eb4d4b",
+              fg="white", relief="flat", activebackground="#ff7979", cursor="hand2").pack(pady=10)
+    window.protocol("WM_DELETE_WINDOW", task.cancel)
+    return task.start()
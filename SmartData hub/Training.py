@@ -0,0 +1,160 @@
+# --- Training.py ---
+import multiprocessing
+import numpy as np
+import pandas as pd
+from Tasks import TaskCancelled
+
+SGD_ROWS = 1000000  # Above this many rows the model is fitted with SGD over chunks instead of a full-batch solver
+LBFGS_FEATURES = 200  # Wide data goes to SGD as well, the full-batch solvers scale with features²
+CHUNK_ROWS = 100000
+EPOCHS = 5
+SCORE_ROWS = 100000  # Training score is measured on a sample of this size
+POLL_SECONDS = 0.1
+RANDOM_STATE = 42
+MODEL_TYPES = ["Numeric (Linear Regression)", "Categorical (Logistic Regression)"]
+
+
+def is_classifier(prediction_type):
+    return prediction_type == MODEL_TYPES[1]
+
+
+def design_matrix(df, feature_columns, target_column, classify):
+    # One joint dropna keeps X and y on the same rows; X is a contiguous float32 block built once
+    missing = [col for col in feature_columns + [target_column] if col not in df.columns]
+    if missing:
+        raise ValueError(f"Unknown columns: {', '.join(missing)}")
+    non_numeric = [col for col in feature_columns if not pd.api.types.is_numeric_dtype(df[col].dtype)]
+    if non_numeric:
+        raise ValueError(f"Feature columns must be numeric: {', '.join(non_numeric)}")
+    data = df[feature_columns + [target_column]].dropna()
+    if data.empty:
+        raise ValueError("No rows have every feature and the target filled in.")
+    X = np.ascontiguousarray(data[feature_columns].to_numpy(dtype=np.float32))
+    y = data[target_column].to_numpy()
+    if not classify:
+        if not pd.api.types.is_numeric_dtype(df[target_column].dtype):
+            raise ValueError(f"Target column '{target_column}' is not numeric.")
+        y = y.astype(np.float64)
+    elif len(np.unique(y)) < 2:
+        raise ValueError("The target needs at least two classes.")
+    return X, y, len(df) - len(data)
+
+
+def choose_solver(rows, features, classify):
+    if rows > SGD_ROWS or features > LBFGS_FEATURES:
+        return "sgd"
+    return "lbfgs" if classify else "lstsq"
+
+
+def _make_model(solver, classify):
+    from sklearn.linear_model import LinearRegression, LogisticRegression, SGDClassifier, SGDRegressor
+
+    if solver == "sgd":
+        if classify:
+            return SGDClassifier(loss="log_loss", alpha=1e-5, n_jobs=-1, random_state=RANDOM_STATE)
+        return SGDRegressor(alpha=1e-6, learning_rate="invscaling", random_state=RANDOM_STATE)
+    if classify:
+        return LogisticRegression(solver="lbfgs", max_iter=1000)
+    return LinearRegression()
+
+
+def fit_model(X, y, classify, solver, report=None):
+    # Returns a fitted StandardScaler + model pipeline; SGD streams CHUNK_ROWS at a time for EPOCHS passes
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    scaler = StandardScaler().fit(X)
+    model = _make_model(solver, classify)
+    if solver != "sgd":
+        if report:
+            report(done=0, total=1, unit="fits", stage=solver)
+        model.fit(scaler.transform(X), y)
+        if report:
+            report(done=1, total=1, unit="fits", stage=solver)
+        return make_pipeline(scaler, model)
+
+    classes = np.unique(y) if classify else None
+    starts = np.arange(0, len(X), CHUNK_ROWS)
+    total = EPOCHS * len(starts)
+    rng = np.random.default_rng(RANDOM_STATE)
+    done = 0
+    for epoch in range(EPOCHS):
+        for start in rng.permutation(starts):  # Chunk order is shuffled every epoch
+            chunk = slice(start, start + CHUNK_ROWS)
+            if classify:
+                model.partial_fit(scaler.transform(X[chunk]), y[chunk], classes=classes)
+            else:
+                model.partial_fit(scaler.transform(X[chunk]), y[chunk])
+            done += 1
+            if report:
+                report(done=done, total=total, unit="chunks", stage=f"epoch {epoch + 1} of {EPOCHS}")
+    return make_pipeline(scaler, model)
+
+
+def training_score(model, X, y):
+    if len(X) > SCORE_ROWS:
+        rows = np.random.default_rng(RANDOM_STATE).choice(len(X), SCORE_ROWS, replace=False)
+        X, y = X[rows], y[rows]
+    return float(model.score(X, y))
+
+
+def _train_worker(connection, X, y, classify, solver):
+    def report(**progress):
+        connection.send(("progress", progress))
+
+    try:
+        model = fit_model(X, y, classify, solver, report)
+        connection.send(("done", (model, training_score(model, X, y))))
+    except Exception as e:
+        connection.send(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        connection.close()
+
+
+def train(df, feature_columns, target_column, prediction_type, task=None):
+    # Fits in a separate process so the Tk loop never waits on the solver; cancelling terminates that process
+    classify = is_classifier(prediction_type)
+    X, y, dropped = design_matrix(df, feature_columns, target_column, classify)
+    solver = choose_solver(len(X), X.shape[1], classify)
+    if task:
+        task.report(stage="starting", rows=len(X))
+
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_train_worker, args=(sender, X, y, classify, solver), daemon=True)
+    process.start()
+    sender.close()
+    result = None
+    try:
+        while result is None:
+            if task and task.is_cancelled():
+                raise TaskCancelled()
+            if not receiver.poll(POLL_SECONDS):
+                if not process.is_alive():
+                    raise RuntimeError("The training process stopped unexpectedly.")
+                continue
+            try:
+                kind, payload = receiver.recv()
+            except EOFError:
+                raise RuntimeError("The training process stopped unexpectedly.")
+            if kind == "progress":
+                if task:
+                    task.report(rows=len(X), **payload)
+            elif kind == "error":
+                raise RuntimeError(payload)
+            else:
+                result = payload
+    finally:
+        if process.is_alive() and result is None:
+            process.terminate()
+        process.join()
+        receiver.close()
+    model, score = result
+    return {
+        "model": model,
+        "features": list(feature_columns),
+        "classify": classify,
+        "solver": solver,
+        "rows": len(X),
+        "dropped": dropped,
+        "score": score,
+    }
@@ -0,0 +1,123 @@
+# --- VirtualGrid.py ---
+import tkinter as tk
+from tkinter import ttk
+import numpy as np
+import pandas as pd
+
+BUFFER_ROWS = 20
+
+
+class VirtualGrid(tk.Frame):
+    # A Treeview that only holds the rows on screen and fills them by position while scrolling
+    def __init__(self, master, column_width=150, **kwargs):
+        super().__init__(master, **kwargs)
+        self.column_width = column_width
+        self.columns = []
+        self.getters = []
+        self.total = 0
+        self.first = 0
+        self.visible = 20
+        self.cache_start = 0
+        self.cache_rows = []
+        self.row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+
+        body = tk.Frame(self)
+        body.pack(side="top", fill="both", expand=True)
+        self.vsb = ttk.Scrollbar(body, orient="vertical", command=self.yview)
+        self.hsb = ttk.Scrollbar(self, orient="horizontal")
+        self.tree = ttk.Treeview(body, show="headings", xscrollcommand=self.hsb.set)
+        self.hsb.config(command=self.tree.xview)
+
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.vsb.pack(side="right", fill="y")
+        self.hsb.pack(side="top", fill="x")
+        self.count_label = tk.Label(self, text="", anchor="w", font=("Arial", 9, "italic"), fg="gray")
+        self.count_label.pack(side="top", fill="x")
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll_rows(-3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll_rows(3))
+        self.tree.bind("<Prior>", lambda e: self.scroll_rows(-self.visible))
+        self.tree.bind("<Next>", lambda e: self.scroll_rows(self.visible))
+
+    def _make_getter(self, series, rows):
+        # Each getter turns a [start, stop) position range into display values for one column
+        def positions(start, stop):
+            return slice(start, stop) if rows is None else rows[start:stop]
+
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy()
+            categories = np.append(series.cat.categories.to_numpy(dtype=object), np.nan)
+            return lambda start, stop: categories[codes[positions(start, stop)]]  # code -1 maps to the trailing NaN
+        if isinstance(series.dtype, np.dtype):
+            values = series.to_numpy()
+            return lambda start, stop: values[positions(start, stop)]
+        return lambda start, stop: series.iloc[positions(start, stop)].to_numpy(dtype=object)
+
+    def set_data(self, data, rows=None):
+        # rows optionally selects row positions of data to show, so filtered views need no copy
+        self.columns = list(data.columns)
+        self.getters = [self._make_getter(data.iloc[:, i], rows) for i in range(len(self.columns))]
+        self.total = len(data) if rows is None else len(rows)
+        self.first = 0
+        self.cache_start = 0
+        self.cache_rows = []
+
+        self.tree.delete(*self.tree.get_children())
+        self.tree["columns"] = list(range(len(self.columns)))
+        for i, col in enumerate(self.columns):
+            self.tree.heading(i, text=col)
+            self.tree.column(i, width=self.column_width, anchor="center", stretch=False)
+        self.count_label.config(text=f"📄 {self.total:,} rows × {len(self.columns)} columns")
+        self._render()
+
+    def _rows(self, start, stop):
+        # Keep a small window of rows around the screen so short scrolls do not refetch
+        if not (self.cache_start <= start and stop <= self.cache_start + len(self.cache_rows)):
+            self.cache_start = max(0, start - BUFFER_ROWS)
+            cache_stop = min(self.total, stop + BUFFER_ROWS)
+            columns = [getter(self.cache_start, cache_stop) for getter in self.getters]
+            self.cache_rows = list(zip(*columns)) if columns else []
+        return self.cache_rows[start - self.cache_start:stop - self.cache_start]
+
+    def _render(self):
+        stop = min(self.total, self.first + self.visible)
+        rows = self._rows(self.first, stop)
+        items = self.tree.get_children()
+        # Reuse the existing items and only add or remove the difference
+        for item, values in zip(items, rows):
+            self.tree.item(item, values=[str(value) for value in values])
+        for values in rows[len(items):]:
+            self.tree.insert("", "end", values=[str(value) for value in values])
+        if len(items) > len(rows):
+            self.tree.delete(*items[len(rows):])
+
+        if self.total:
+            self.vsb.set(self.first / self.total, stop / self.total)
+        else:
+            self.vsb.set(0, 1)
+
+    def _on_resize(self, event):
+        heading = self.row_height + 4
+        visible = max(1, (event.height - heading) // self.row_height)
+        if visible != self.visible:
+            self.visible = visible
+            self.scroll_to(self.first)
+
+    def _on_wheel(self, event):
+        self.scroll_rows(-3 if event.delta > 0 else 3)
+
+    def scroll_to(self, first):
+        self.first = max(0, min(int(first), self.total - self.visible))
+        self._render()
+
+    def scroll_rows(self, count):
+        self.scroll_to(self.first + count)
+
+    def yview(self, *args):
+        if args[0] == "moveto":
+            self.scroll_to(float(args[1]) * self.total)
+        elif args[0] == "scroll":
+            step = self.visible if args[2] == "pages" else 1
+            self.scroll_rows(int(args[1]) * step)
@@ -4,21 +4,33 @@ from tkinter import messagebox, ttk
 import matplotlib.pyplot as plt
 import seaborn as sns
 import plotly.express as px
+import Rendering
+from ChartPanel import ChartPanel
+from Aggregation import AGGREGATE_CACHE, AGGREGATIONS
+from Statistics import STATS_CACHE, can_stratify, pairplot_columns, stratified_sample
 
 class DataVisualizationApp:
-    def __init__(self, root, df):
+    def __init__(self, root, df, version=0):
         self.root = root
         self.df = df
+        self.version = version  # Dataset version, the key for cached statistics
         self.root.title("📊 Advanced Data Visualization App")
-        self.root.geometry("800x600")
-        self.root.minsize(700, 500)
+        self.root.geometry("1280x720")
+        self.root.minsize(1000, 560)
         self.root.configure(bg="#f4f8fc")
 
         title_label = tk.Label(root, text="📊 Data Visualization Dashboard", font=("Arial Rounded MT Bold", 20), bg="#4682B4", fg="white", pady=12)
         title_label.pack(fill='x')
 
-        form_frame = tk.Frame(root, bg="#f4f8fc")
-        form_frame.pack(pady=5, padx=20, fill='x')
+        controls = tk.Frame(root, bg="#f4f8fc")
+        controls.pack(side="left", fill="y", padx=(10, 0))
+
+        # Every chart below is drawn into this one embedded figure
+        self.chart = ChartPanel(root, bg="#f4f8fc")
+        self.chart.pack(side="left", fill="both", expand=True, padx=10, pady=10)
+
+        form_frame = tk.Frame(controls, bg="#f4f8fc")
+        form_frame.pack(pady=5, padx=10, fill='x')
 
         tk.Label(form_frame, text="X-axis Column:", font=("Arial", 11), bg="#f4f8fc").grid(row=0, column=0, padx=10, pady=8, sticky="w")
         self.x_column_dropdown = ttk.Combobox(form_frame, width=30, state="readonly")
@@ -28,8 +40,18 @@ class DataVisualizationApp:
         self.y_column_dropdown = ttk.Combobox(form_frame, width=30, state="readonly")
         self.y_column_dropdown.grid(row=1, column=1, padx=10, pady=8)
 
-        btn_frame = tk.Frame(root, bg="#f4f8fc")
-        btn_frame.pack(pady=10, padx=20, fill='both', expand=True)
+        tk.Label(form_frame, text="Correlation:", font=("Arial", 11), bg="#f4f8fc").grid(row=2, column=0, padx=10, pady=8, sticky="w")
+        self.corr_method = ttk.Combobox(form_frame, width=30, state="readonly", values=["pearson", "spearman"])
+        self.corr_method.set("pearson")
+        self.corr_method.grid(row=2, column=1, padx=10, pady=8)
+
+        tk.Label(form_frame, text="Bar Aggregation:", font=("Arial", 11), bg="#f4f8fc").grid(row=3, column=0, padx=10, pady=8, sticky="w")
+        self.agg_dropdown = ttk.Combobox(form_frame, width=30, state="readonly", values=AGGREGATIONS)
+        self.agg_dropdown.set("sum")
+        self.agg_dropdown.grid(row=3, column=1, padx=10, pady=8)
+
+        btn_frame = tk.Frame(controls, bg="#f4f8fc")
+        btn_frame.pack(pady=10, padx=10, fill='both', expand=True)
 
         chart_buttons = [
             ("📈 Line Graph", self.plot_line_graph),
@@ -61,65 +83,111 @@ class DataVisualizationApp:
             return None, None
         return x_col, y_col
 
+    def get_aggregate(self, x_col, y_col):
+        # Bars and pies are drawn from a small cached aggregate, never from the raw rows
+        agg = self.agg_dropdown.get()
+        try:
+            return AGGREGATE_CACHE.get(self.df, self.version, x_col, y_col, agg), agg
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return None, agg
+
     def plot_line_graph(self):
         x_col, y_col = self.get_selected_columns()
         if x_col and y_col:
-            self.df.plot(x=x_col, y=y_col, kind='line', marker='o', title="Line Graph")
-            plt.grid(True)
-            plt.tight_layout()
-            plt.show()
+            try:
+                y = Rendering.numeric_values(self.df[y_col])
+            except ValueError as e:
+                messagebox.showerror("Error", str(e))
+                return
+            x, by_position = Rendering.axis_values(self.df[x_col])
+            self.chart.line(x, y, "Line Graph", f"{x_col} (row position)" if by_position else x_col, y_col)
 
     def plot_bar_graph(self):
         x_col, y_col = self.get_selected_columns()
         if x_col and y_col:
-            self.df.plot(x=x_col, y=y_col, kind='bar', title="Bar Graph")
-            plt.tight_layout()
-            plt.show()
+            data, agg = self.get_aggregate(x_col, y_col)
+            if data is None:
+                return
+            ax = self.chart.start("bar")
+            data.plot(kind='bar', ax=ax, title=f"Bar Graph ({agg} of {y_col} by {x_col})" if agg != "count" else f"Bar Graph (rows by {x_col})")
+            ax.set_xlabel(x_col)
+            ax.set_ylabel(y_col if agg != "count" else "count")
+            self.chart.finish()
 
     def plot_scatter_plot(self):
         x_col, y_col = self.get_selected_columns()
         if x_col and y_col:
-            self.df.plot(x=x_col, y=y_col, kind='scatter', title="Scatter Plot")
-            plt.tight_layout()
-            plt.show()
+            try:
+                x = Rendering.numeric_values(self.df[x_col])
+                y = Rendering.numeric_values(self.df[y_col])
+            except ValueError as e:
+                messagebox.showerror("Error", str(e))
+                return
+            self.chart.scatter(x, y, "Scatter Plot", x_col, y_col)
 
     def plot_pie_chart(self):
         column = self.x_column_dropdown.get()
         if column in self.df.columns:
-            self.df[column].value_counts().plot(kind='pie', autopct='%1.1f%%', startangle=90, shadow=True)
-            plt.title(f"Pie Chart of {column}")
-            plt.ylabel("")
-            plt.tight_layout()
-            plt.show()
+            ax = self.chart.start("pie")
+            AGGREGATE_CACHE.get(self.df, self.version, column).plot(kind='pie', ax=ax, autopct='%1.1f%%', startangle=90, shadow=True)
+            ax.set_title(f"Pie Chart of {column}")
+            ax.set_ylabel("")
+            self.chart.finish()
 
     def plot_heatmap(self):
-        corr = self.df.corr()
-        sns.heatmap(corr, annot=True, cmap="coolwarm", center=0)
-        plt.title("Correlation Heatmap")
-        plt.tight_layout()
-        plt.show()
+        method = self.corr_method.get()
+        corr = STATS_CACHE.correlation(self.df, self.version, method)
+        if corr.empty:
+            messagebox.showerror("Error", "No numeric columns to correlate.")
+            return
+        ax = self.chart.start("heatmap")
+        sns.heatmap(corr, annot=len(corr) <= 15, fmt=".2f", cmap="coolwarm", center=0, ax=ax)
+        ax.set_title(f"Correlation Heatmap ({method.title()})")
+        self.chart.finish()
 
     def plot_boxplot(self):
         x_col, y_col = self.get_selected_columns()
         if x_col and y_col:
-            sns.boxplot(x=self.df[x_col], y=self.df[y_col], color="lightblue")
-            plt.title(f"Boxplot of {x_col} vs {y_col}")
-            plt.tight_layout()
-            plt.show()
+            ax = self.chart.start("boxplot")
+            sns.boxplot(x=self.df[x_col], y=self.df[y_col], color="lightblue", ax=ax)
+            ax.set_title(f"Boxplot of {x_col} vs {y_col}")
+            self.chart.finish()
 
     def plot_pairplot(self):
-        sns.pairplot(self.df)
-        plt.tight_layout()
-        plt.show()
+        # A stratified row sample over the most correlated columns; the X column colours it when it is categorical
+        corr = STATS_CACHE.correlation(self.df, self.version)
+        columns = pairplot_columns(corr)
+        if not columns:
+            messagebox.showerror("Error", "No numeric columns for a pairplot.")
+            return
+        hue = self.x_column_dropdown.get()
+        if hue not in self.df.columns or hue in columns or not can_stratify(self.df[hue]):
+            hue = None
+        sample = stratified_sample(self.df[columns + ([hue] if hue else [])], by=hue)
+        grid = sns.pairplot(sample, vars=columns, hue=hue, plot_kws={"s": 10})
+        grid.figure.suptitle(f"Pairplot of {len(sample):,} sampled rows")
+        grid.figure.tight_layout()
+        plt.close(grid.figure)  # seaborn builds its own figure; pyplot lets go of it and the panel shows it
+        self.chart.show_figure(grid.figure)
 
     def plot_interactive_scatter(self):
         x_col, y_col = self.get_selected_columns()
         if x_col and y_col:
-            fig = px.scatter(self.df, x=x_col, y=y_col, title="Interactive Scatter Plot")
+            try:
+                fig = Rendering.interactive_scatter(self.df, x_col, y_col, "Interactive Scatter Plot")
+            except ValueError as e:
+                messagebox.showerror("Error", str(e))
+                return
             fig.show()
 
     def plot_interactive_bar(self):
         x_col, y_col = self.get_selected_columns()
         if x_col and y_col:
-            fig = px.bar(self.df, x=x_col, y=y_col, title="Interactive Bar Graph")
+            data, agg = self.get_aggregate(x_col, y_col)
+            if data is None:
+                return
+            label = y_col if agg != "count" else "count"
+            fig = px.bar(x=data.index, y=data.to_numpy(), labels={"x": x_col, "y": label},
+                         title=f"Interactive Bar Graph ({agg})")
             fig.show()
@@ -1,8 +1,8 @@
 import tkinter as tk
 from tkinter import messagebox, filedialog
 import webbrowser
+import os
 from PIL import Image, ImageTk,ImageDraw
-import pandas as pd
 
 # Import functional windows
 from Cleaning import DataCleaningApp
@@ -10,9 +10,12 @@ from Clustrening import ClusteringApp
 from Mining import DataFilterApp
 from Predection import PredictionApp
 from Visulization import DataVisualizationApp
+from Ingestion import load_dataset
+from Dataset import SharedDataset
+from Tasks import run_with_progress
 
-# Global shared dataframe
-shared_df = None
+# Global shared dataset, windows check out copy-on-write views of it
+shared_data = SharedDataset()
 
 def open_link(url):
     webbrowser.open(url, new=2)
@@ -179,108 +182,110 @@ def show_about_us():
                           activebackground="#ff7979", cursor="hand2")
     close_btn.pack(pady=20)
 
-# Load a file (CSV, Excel, Word, PDF) and store it globally
+# Load a file (CSV, Excel, Word, PDF) in the background and store it globally
 def load_file():
-    global shared_df
     file_path = filedialog.askopenfilename(
         filetypes=[
             ("Supported Files", "*.csv *.xlsx *.xls *.docx *.pdf"),
             ("All Files", "*.*")
         ]
     )
-    if file_path:
-        try:
-            if file_path.endswith('.csv'):
-                shared_df = pd.read_csv(file_path)
-            elif file_path.endswith(('.xlsx', '.xls')):
-                shared_df = pd.read_excel(file_path)
-            elif file_path.endswith('.docx'):
-                import docx
-                doc = docx.Document(file_path)
-                data = []
-                for table in doc.tables:
-                    for row in table.rows:
-                        data.append([cell.text for cell in row.cells])
-                if data:
-                    shared_df = pd.DataFrame(data[1:], columns=data[0])  # First row as header
-                else:
-                    raise ValueError("No table found in the Word document.")
-            elif file_path.endswith('.pdf'):
-                import tabula
-                dfs = tabula.read_pdf(file_path, pages='all', multiple_tables=True)
-                if dfs:
-                    shared_df = dfs[0]  # Take the first table
-                else:
-                    raise ValueError("No table found in the PDF document.")
-            else:
-                raise ValueError("Unsupported file format selected.")
-            messagebox.showinfo("Success", f"File loaded successfully: {file_path}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load file:\n{e}")
+    if not file_path:
+        return
+
+    def on_done(df):
+        load_button.config(state="normal")
+        shared_data.publish(df)
+        message = f"File loaded successfully: {file_path}"
+        if df.attrs.get("skipped_tables"):
+            # PDF tables whose header matched neither the first table nor a continuation page
+            message += (f"\n\n{df.attrs['skipped_tables']} other table(s) with "
+                        f"{df.attrs['skipped_rows']:,} row(s) did not match the main table and were left out.")
+        messagebox.showinfo("Success", message)
+
+    def on_error(e):
+        load_button.config(state="normal")
+        messagebox.showerror("Error", f"Failed to load file:\n{e}")
+
+    def on_cancel():
+        load_button.config(state="normal")
+        messagebox.showinfo("Cancelled", "File loading was cancelled.")
+
+    def describe(info):
+        if info.get("unit") == "pages":
+            return f"page {info['done']} of {info['total']}"
+        return f"{info.get('rows', 0):,} rows"
+
+    load_button.config(state="disabled")
+    run_with_progress(root, "Loading File", f"📂 Loading {os.path.basename(file_path)}...",
+                      lambda task: load_dataset(file_path, task=task), on_done, on_error, on_cancel,
+                      describe=describe)
 
 # Launch functional window with shared DataFrame
 def launch_task_window(task):
-    if shared_df is None:
+    if shared_data.is_empty():
         messagebox.showwarning("⚠️ Warning", "Please load a file first.")
         return
 
     new_window = tk.Toplevel(root)
     if task == "Data Cleaning":
-        DataCleaningApp(new_window, shared_df.copy())
+        DataCleaningApp(new_window, shared_data.checkout(writable=True))
     elif task == "Visualization":
-        DataVisualizationApp(new_window, shared_df.copy())
+        DataVisualizationApp(new_window, shared_data.checkout(), shared_data.version)
     elif task == "Mining":
-        DataFilterApp(new_window, shared_df.copy())
+        DataFilterApp(new_window, shared_data.checkout())
     elif task == "Prediction":
-        PredictionApp(new_window, shared_df.copy())
+        PredictionApp(new_window, shared_data.checkout())
     elif task == "Clustering":
-        ClusteringApp(new_window, shared_df.copy())
-
-# Main window setup
-root = tk.Tk()
-root.title("Data Science Operations")
-root.geometry("900x600")
-
-bg_image = Image.open("clean.jpg")
-bg_photo = ImageTk.PhotoImage(bg_image)
-background_label = tk.Label(root, image=bg_photo)
-background_label.place(x=0, y=0, relwidth=1, relheight=1)
-
-main_frame = tk.Frame(root, bg="#ffffff", bd=0)
-main_frame.place(relx=0.5, rely=0.5, anchor="center")
-
-title_label = tk.Label(main_frame, text="🌟 Data Science Operations 🌟", font=("Helvetica", 22, "bold"), bg="#ffffff", fg="#2c3e50")
-title_label.pack(pady=20)
-
-# Load File button
-load_button = tk.Button(main_frame, text="📂 Load File", font=("Arial", 13), bg="#2ecc71", fg="white",
-                        width=20, relief="flat", bd=0, activebackground="#27ae60", cursor="hand2", command=load_file)
-load_button.pack(pady=10)
-
-# Feature buttons
-tasks = ["Data Cleaning", "Visualization", "Mining", "Prediction", "Clustering"]
-
-for task in tasks:
-    button_frame = tk.Frame(main_frame, bg="#ffffff")
-    button_frame.pack(pady=7)
-
-    operation_button = tk.Button(button_frame, text=task, font=("Arial", 14), bg="#3498db", fg="white",
-                                 width=20, relief="flat", bd=0, activebackground="#2980b9", cursor="hand2",
-                                 command=lambda t=task: launch_task_window(t))
-    operation_button.pack(side="left", padx=10)
-    operation_button.bind("<Enter>", on_enter)
-    operation_button.bind("<Leave>", on_leave)
-
-    info_button = tk.Button(button_frame, text="i", font=("Arial", 12, "bold"), bg="#2ecc71", fg="white",
-                            width=3, relief="flat", bd=0, command=lambda t=task: show_info(t), cursor="hand2")
-    info_button.pack(side="left")
-    info_button.bind("<Enter>", on_info_enter)
-    info_button.bind("<Leave>", on_info_leave)
-
-# About Us button
-about_button = tk.Button(main_frame, text="About Us", font=("Arial", 13), bg="#f39c12", fg="white",
-                         width=20, relief="flat", bd=0, activebackground="#e67e22", cursor="hand2", command=show_about_us)
-about_button.pack(pady=10)
-
-root.bind("<Configure>", resize_bg)
-root.mainloop()
+        ClusteringApp(new_window, shared_data.checkout(), shared_data.version)
+
+# Guarded so worker processes (e.g. PDF extraction) can import this module safely
+if __name__ == "__main__":
+    # Main window setup
+    root = tk.Tk()
+    root.title("Data Science Operations")
+    root.geometry("900x600")
+
+    bg_image = Image.open("clean.jpg")
+    bg_photo = ImageTk.PhotoImage(bg_image)
+    background_label = tk.Label(root, image=bg_photo)
+    background_label.place(x=0, y=0, relwidth=1, relheight=1)
+
+    main_frame = tk.Frame(root, bg="#ffffff", bd=0)
+    main_frame.place(relx=0.5, rely=0.5, anchor="center")
+
+    title_label = tk.Label(main_frame, text="🌟 Data Science Operations 🌟", font=("Helvetica", 22, "bold"), bg="#ffffff", fg="#2c3e50")
+    title_label.pack(pady=20)
+
+    # Load File button
+    load_button = tk.Button(main_frame, text="📂 Load File", font=("Arial", 13), bg="#2ecc71", fg="white",
+                            width=20, relief="flat", bd=0, activebackground="#27ae60", cursor="hand2", command=load_file)
+    load_button.pack(pady=10)
+
+    # Feature buttons
+    tasks = ["Data Cleaning", "Visualization", "Mining", "Prediction", "Clustering"]
+
+    for task in tasks:
+        button_frame = tk.Frame(main_frame, bg="#ffffff")
+        button_frame.pack(pady=7)
+
+        operation_button = tk.Button(button_frame, text=task, font=("Arial", 14), bg="#3498db", fg="white",
+                                     width=20, relief="flat", bd=0, activebackground="#2980b9", cursor="hand2",
+                                     command=lambda t=task: launch_task_window(t))
+        operation_button.pack(side="left", padx=10)
+        operation_button.bind("<Enter>", on_enter)
+        operation_button.bind("<Leave>", on_leave)
+
+        info_button = tk.Button(button_frame, text="i", font=("Arial", 12, "bold"), bg="#2ecc71", fg="white",
+                                width=3, relief="flat", bd=0, command=lambda t=task: show_info(t), cursor="hand2")
+        info_button.pack(side="left")
+        info_button.bind("<Enter>", on_info_enter)
+        info_button.bind("<Leave>", on_info_leave)
+
+    # About Us button
+    about_button = tk.Button(main_frame, text="About Us", font=("Arial", 13), bg="#f39c12", fg="white",
+                             width=20, relief="flat", bd=0, activebackground="#e67e22", cursor="hand2", command=show_about_us)
+    about_button.pack(pady=10)
+
+    root.bind("<Configure>", resize_bg)
+    root.mainloop()
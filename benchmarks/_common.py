@@ -0,0 +1,22 @@
+import os
+import sys
+import time
+
+# The app's modules live flat in "SmartData hub" and import each other by name
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "SmartData hub"))
+
+
+def timed(work, repeat=1):
+    # Best wall time over `repeat` runs, with the result of the last run
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = work()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def row_counts(default):
+    # Row counts from the command line (python bench_x.py 100000 1000000) or the benchmark's defaults
+    return [int(arg.replace("_", "")) for arg in sys.argv[1:]] or default
@@ -0,0 +1,55 @@
+# K-Means time and inertia: the old single-column path (KMeans(n_init=10) on df[[column]]) against the
+# ClusterModels engine (standardized float32 FeatureMatrix, MiniBatchKMeans above MINIBATCH_ROWS).
+# The engine is run on the same single column, where its inertia is converted back to the column's units
+# so the two are comparable, and on all feature columns, where inertia is in standardized units.
+# Usage: python bench_clustering.py [rows ...]   (10M rows of the old path takes several minutes)
+import numpy as np
+import pandas as pd
+
+from _common import row_counts, timed
+from ClusterModels import MINIBATCH_ROWS, FeatureMatrix, fit_kmeans
+
+K = 5
+NUMERIC = 5
+
+
+def frame(rows, seed=0):
+    # K well separated blobs over NUMERIC columns plus one categorical column
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(scale=5, size=(K, NUMERIC))
+    labels = rng.integers(0, K, size=rows)
+    data = {f"x{i}": (centers[labels, i] + rng.normal(size=rows)).astype(np.float64) for i in range(NUMERIC)}
+    data["kind"] = pd.Categorical(np.array(["a", "b", "c"])[labels % 3])
+    return pd.DataFrame(data)
+
+
+def legacy(df, column):
+    from sklearn.cluster import KMeans
+
+    data = df[[column]].dropna()
+    model = KMeans(n_clusters=K, n_init=10, random_state=42)
+    model.fit_predict(data)
+    return model.inertia_
+
+
+def engine(df, columns):
+    features = FeatureMatrix(df, columns)
+    model, _ = fit_kmeans(features, K)
+    inertia = model.inertia_
+    if columns == features.numeric and len(columns) == 1:
+        inertia *= float(features.scale[0]) ** 2  # Back to the column's own units
+    return inertia, features.X.nbytes
+
+
+if __name__ == "__main__":
+    print(f"MiniBatchKMeans above {MINIBATCH_ROWS:,} rows; K = {K}")
+    print(f"{'rows':>11} {'old s':>8} {'old inertia':>14} {'1-col s':>8} {'1-col inertia':>14} "
+          f"{'all-col s':>10} {'all-col inertia':>16} {'X MB':>7}")
+    for rows in row_counts([100000, 1000000, 10000000]):
+        df = frame(rows)
+        columns = [f"x{i}" for i in range(NUMERIC)] + ["kind"]
+        old_time, old_inertia = timed(lambda: legacy(df, "x0"))
+        one_time, (one_inertia, _) = timed(lambda: engine(df, ["x0"]))
+        all_time, (all_inertia, nbytes) = timed(lambda: engine(df, columns))
+        print(f"{rows:>11,} {old_time:>8.2f} {old_inertia:>14,.0f} {one_time:>8.2f} {one_inertia:>14,.0f} "
+              f"{all_time:>10.2f} {all_inertia:>16,.0f} {nbytes / 2 ** 20:>7.1f}")
@@ -0,0 +1,79 @@
+# Memory held by the five task windows: the old shared_df.copy() per window against SharedDataset.checkout.
+# With a display the real windows are opened (Cleaning, Visualization, Mining, Prediction, Clustering);
+# without one only the frames the windows would receive are created. Cleaning then rewrites one column.
+# Usage: python bench_dataset_memory.py [rows ...]
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+from _common import row_counts
+from Dataset import COPY_ON_WRITE, SharedDataset
+
+COLUMNS = 10
+MB = 1024 * 1024
+
+
+def frame(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    data = {f"n{i}": rng.normal(size=rows) for i in range(COLUMNS)}
+    data["group"] = pd.Categorical(rng.choice(["a", "b", "c", "d"], size=rows))
+    return pd.DataFrame(data)
+
+
+# (module, app class, wants a writable frame, passes the dataset version) in launch_task_window's order
+WINDOWS = [
+    ("Cleaning", "DataCleaningApp", True, False),
+    ("Visulization", "DataVisualizationApp", False, True),
+    ("Mining", "DataFilterApp", False, False),
+    ("Predection", "PredictionApp", False, False),
+    ("Clustrening", "ClusteringApp", False, True),
+]
+
+
+def open_all(shared, legacy, root):
+    import importlib
+
+    frames = []
+    for module, name, writable, versioned in WINDOWS:
+        df = shared.frame.copy() if legacy else shared.checkout(writable=writable)
+        frames.append(df)
+        if root:
+            import tkinter as tk
+            app = getattr(importlib.import_module(module), name)
+            app(tk.Toplevel(root), df, *((shared.version,) if versioned else ()))
+            root.update()
+    # The Cleaning window edits a single column
+    frames[0]["n0"] = frames[0]["n0"].abs()
+    return frames
+
+
+def measure(rows, legacy, root):
+    shared = SharedDataset(frame(rows))
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    frames = open_all(shared, legacy, root)
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    base = shared.frame.memory_usage(deep=True).sum()
+    del frames
+    return base, held
+
+
+def display():
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+        return root
+    except Exception:
+        return None
+
+
+if __name__ == "__main__":
+    root = display()
+    print(f"Copy-on-Write: {COPY_ON_WRITE}; windows: {'opened' if root else 'not opened (no display), frames only'}")
+    print(f"{'rows':>10} {'dataset MB':>11} {'copy() MB':>10} {'checkout MB':>12}")
+    for rows in row_counts([100000, 1000000, 5000000]):
+        base, old = measure(rows, True, root)
+        _, new = measure(rows, False, root)
+        print(f"{rows:>10,} {base / MB:>11.1f} {old / MB:>10.1f} {new / MB:>12.1f}")
@@ -0,0 +1,90 @@
+# Time to first paint of the Mining result grid on a large frame. With a display the real VirtualGrid is
+# timed up to the first idle redraw; without one the same fetch-and-format path (getters, the buffered row
+# window, str() of each cell) is timed on VirtualGrid's own methods. The old display_results is timed
+# without its Treeview.insert calls, so its numbers are a lower bound.
+# Usage: python bench_virtual_grid.py [rows ...]
+import numpy as np
+import pandas as pd
+
+from _common import row_counts, timed
+import VirtualGrid as grid_module
+from VirtualGrid import VirtualGrid
+
+VISIBLE = 30
+LEGACY_LIMIT = 200000  # iterrows over more rows than this is extrapolated
+
+
+def frame(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "id": np.arange(rows),
+        "score": rng.normal(size=rows),
+        "city": pd.Categorical(rng.choice(["Pune", "Delhi", "Mumbai", None], size=rows)),
+        "name": pd.Series(rng.choice(["a", "bb", "ccc"], size=rows), dtype=object),
+        "when": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 10 ** 6, size=rows), unit="s"),
+    })
+
+
+class Headless:
+    # Just the state VirtualGrid's data path reads, so its methods can run without a Tk window
+    _make_getter = VirtualGrid._make_getter
+    _rows = VirtualGrid._rows
+
+    def __init__(self):
+        self.cache_start = 0
+        self.cache_rows = []
+
+    def first_paint(self, data, rows=None, first=0):
+        self.getters = [self._make_getter(data.iloc[:, i], rows) for i in range(data.shape[1])]
+        self.total = len(data) if rows is None else len(rows)
+        self.cache_start, self.cache_rows = 0, []
+        first = min(first, max(0, self.total - VISIBLE))
+        return [[str(value) for value in values] for values in self._rows(first, min(self.total, first + VISIBLE))]
+
+
+def real_first_paint(root, data, rows=None):
+    grid = VirtualGrid(root)
+    grid.pack(fill="both", expand=True)
+    grid.set_data(data, rows)
+    root.update_idletasks()
+    grid.destroy()
+
+
+def legacy_display(data, limit):
+    # The old display_results loop minus Treeview.insert
+    values = []
+    for _, row in data.head(limit).iterrows():
+        values.append(list(row))
+    return values
+
+
+def display():
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+        return root
+    except Exception:
+        return None
+
+
+if __name__ == "__main__":
+    root = display()
+    print(f"Grid: {'real VirtualGrid' if root else 'headless data path (no display)'}; buffer {grid_module.BUFFER_ROWS} rows")
+    print(f"{'rows':>10} {'first paint ms':>15} {'filtered ms':>12} {'jump to end ms':>15} {'old iterrows s':>15}")
+    headless = Headless()
+    for rows in row_counts([100000, 1000000]):
+        df = frame(rows)
+        matches = np.flatnonzero(df["score"].to_numpy() > 0)
+        if root:
+            paint, _ = timed(lambda: real_first_paint(root, df), repeat=3)
+            filtered, _ = timed(lambda: real_first_paint(root, df, matches), repeat=3)
+        else:
+            paint, _ = timed(lambda: headless.first_paint(df), repeat=3)
+            filtered, _ = timed(lambda: headless.first_paint(df, matches), repeat=3)
+        jump, _ = timed(lambda: headless.first_paint(df, first=rows), repeat=3)
+        limit = min(rows, LEGACY_LIMIT)
+        old, _ = timed(lambda: legacy_display(df, limit))
+        old *= rows / limit
+        note = "" if limit == rows else " (extrapolated)"
+        print(f"{rows:>10,} {paint * 1000:>15.2f} {filtered * 1000:>12.2f} {jump * 1000:>15.2f} {old:>15.1f}{note}")
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Export import ChunkWriter, write_frame
+
+pytest.importorskip("pyarrow")
+
+
+def read(path):
+    return pd.read_parquet(path) if path.endswith(".parquet") else pd.read_feather(path)
+
+
+def read_schema(path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if path.endswith(".parquet"):
+        return pq.read_schema(path)
+    with pa.OSFile(path) as source:
+        return pa.ipc.open_file(source).schema
+
+
+def values(series):
+    return [None if pd.isna(value) else value for value in series]
+
+
+@pytest.mark.parametrize("extension", [".parquet", ".feather"])
+def test_object_column_with_leading_missing_values_round_trips(tmp_path, extension):
+    df = pd.DataFrame({"name": pd.Series([None] * 5 + ["x", "y", None, "z", "w"], dtype=object),
+                       "value": np.arange(10)})
+    path = str(tmp_path / f"out{extension}")
+    write_frame(df, path, rows=3)
+    back = read(path)
+    assert values(back["name"]) == [None] * 5 + ["x", "y", None, "z", "w"]
+    assert back["value"].tolist() == list(range(10))
+
+
+@pytest.mark.parametrize("extension", [".parquet", ".feather"])
+def test_mixed_column_is_written_as_text(tmp_path, extension):
+    # A numeric column with "Unknown" filled into its gaps, as the cleaning pipeline produces
+    df = pd.DataFrame({"Age": pd.Series([21.0, "Unknown", 35.5, None], dtype=object),
+                       "Count": pd.Series([1, 2.5, 3, None], dtype=object)})
+    path = str(tmp_path / f"out{extension}")
+    write_frame(df, path)
+    back = read(path)
+    assert values(back["Age"]) == ["21.0", "Unknown", "35.5", None]
+    assert values(back["Count"]) == [1.0, 2.5, 3.0, None]
+
+
+def test_chunk_writer_accepts_missing_values_in_later_chunks(tmp_path):
+    path = str(tmp_path / "out.parquet")
+    with ChunkWriter(path) as writer:
+        writer.write(pd.DataFrame({"a": [1, 2], "b": pd.Series([None, None], dtype=object)}))
+        writer.write(pd.DataFrame({"a": [np.nan, 4.0], "b": ["x", 7]}))
+    back = pd.read_parquet(path)
+    assert values(back["a"]) == [1.0, 2.0, None, 4.0]
+    assert values(back["b"]) == [None, None, "x", "7"]
+
+
+@pytest.mark.parametrize("extension", [".parquet", ".feather"])
+def test_chunk_writer_keeps_integers_and_widens_only_when_needed(tmp_path, extension):
+    path = str(tmp_path / f"out{extension}")
+    with ChunkWriter(path) as writer:
+        writer.write(pd.DataFrame({"label": [1, 0], "score": [3, 4], "note": [None, None]}))
+        writer.write(pd.DataFrame({"label": [np.nan, 1.0], "score": [2.5, 1.0], "note": [7, None]}))
+        writer.write(pd.DataFrame({"label": [0, 1], "score": [6, 7], "note": [8, 9]}))
+    back = read(path)
+    assert read_schema(path).field("label").type == "int64"
+    assert values(back["label"]) == [1, 0, None, 1, 0, 1]
+    assert read_schema(path).field("score").type == "double"
+    assert back["score"].tolist() == [3.0, 4.0, 2.5, 1.0, 6.0, 7.0]
+    assert values(back["note"]) == [None, None, 7, None, 8, 9]
+
+
+def test_classifier_predictions_keep_their_class_dtype(tmp_path):
+    from sklearn.linear_model import LogisticRegression
+    from Scoring import score_file
+
+    train = pd.DataFrame({"x": [0.0, 1.0, 2.0, 3.0, 4.0, 5.0], "y": [0, 0, 0, 1, 1, 1]})
+    model = LogisticRegression().fit(train[["x"]].to_numpy(dtype=np.float32), train["y"])
+    source = tmp_path / "in.csv"
+    pd.DataFrame({"x": [0.5, None, 4.5]}).to_csv(source, index=False)
+    output = str(tmp_path / "out.parquet")
+    score_file(model, ["x"], True, str(source), output, max_workers=1)
+    assert read_schema(output).field("Prediction").type == "int64"
+    assert values(pd.read_parquet(output)["Prediction"]) == [0, None, 1]
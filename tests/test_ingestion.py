@@ -0,0 +1,20 @@
+import pandas as pd
+
+from Ingestion import read_csv_optimized
+
+
+def test_column_that_turns_to_text_in_a_later_chunk_reads_as_text(tmp_path):
+    path = tmp_path / "mixed.csv"
+    pd.DataFrame({"code": ["1"] * 6 + ["abc"] * 4, "x": range(10)}).to_csv(path, index=False)
+    df = read_csv_optimized(str(path), chunk_rows=3)
+    assert {type(value) for value in df["code"]} == {str}
+    assert (df["code"] == "1").sum() == 6
+    assert df["x"].tolist() == list(range(10))
+
+
+def test_column_empty_in_early_chunks_keeps_its_values(tmp_path):
+    path = tmp_path / "late.csv"
+    pd.DataFrame({"name": [None] * 4 + ["q", "r"], "value": [1.5] * 6}).to_csv(path, index=False)
+    df = read_csv_optimized(str(path), chunk_rows=2)
+    assert df["name"].isna().sum() == 4
+    assert list(df["name"].dropna()) == ["q", "r"]
@@ -0,0 +1,39 @@
+import pandas as pd
+
+from PdfTables import merge_tables
+
+
+def test_headerless_continuation_page_is_folded_in():
+    first = pd.DataFrame({"Name": ["a", "b"], "Price": [1.5, 2.0]})
+    repeated = pd.DataFrame({"Name ": ["c"], "Price": [3.0]})
+    continuation = pd.DataFrame([["e", 5]], columns=["d", "4"])  # tabula took the row "d, 4" as the header
+    merged = merge_tables([first, repeated, continuation])
+    assert merged["Name"].tolist() == ["a", "b", "c", "d", "e"]
+    assert merged["Price"].tolist() == [1.5, 2.0, 3.0, 4.0, 5.0]
+    assert merged.attrs["skipped_tables"] == 0
+
+
+def test_unrelated_tables_are_counted():
+    first = pd.DataFrame({"Name": ["a"], "Price": [1.0]})
+    other = pd.DataFrame({"City": ["x", "y", "z"], "Zip": ["p", "q", "r"]})
+    narrow = pd.DataFrame({"x": [1]})
+    merged = merge_tables([first, other, narrow])
+    assert len(merged) == 1
+    assert (merged.attrs["skipped_tables"], merged.attrs["skipped_rows"]) == (2, 4)
+
+
+def test_same_width_table_with_other_kinds_of_values_stays_separate():
+    first = pd.DataFrame({"Name": ["a", "b"], "Price": [1.5, 2.0]})
+    scores = pd.DataFrame([[2, "low"], [3, "high"]], columns=["1", "medium"])  # Numbers where names were
+    merged = merge_tables([first, scores], pages=[1, 2])
+    assert merged["Name"].tolist() == ["a", "b"]
+    assert (merged.attrs["skipped_tables"], merged.attrs["skipped_rows"]) == (1, 2)
+
+
+def test_continuation_must_follow_the_previous_page():
+    first = pd.DataFrame({"Name": ["a", "b"], "Price": [1.5, 2.0]})
+    next_page = pd.DataFrame([["d", 4.0]], columns=["c", "3"])
+    far_page = pd.DataFrame([["x", 9.0]], columns=["w", "8"])
+    merged = merge_tables([first, next_page, far_page], pages=[1, 2, 5])
+    assert merged["Name"].tolist() == ["a", "b", "c", "d"]
+    assert (merged.attrs["skipped_tables"], merged.attrs["skipped_rows"]) == (1, 1)
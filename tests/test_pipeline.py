@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+from Pipeline import Pipeline, optimize
+
+
+def run_in_order(df, steps):
+    for step in steps:
+        df = Pipeline([step]).run(df)
+    return df
+
+
+def test_drop_low_variance_is_not_moved_after_drop_duplicates():
+    # b looks constant to nunique() because NaN is ignored; once it is dropped the first two rows are equal
+    df = pd.DataFrame({"a": ["x", "x", "y"], "b": [1.0, np.nan, 1.0]})
+    steps = [{"op": "drop_low_variance"}, {"op": "drop_duplicates"}]
+    assert [step["op"] for step in optimize(steps)] == ["drop_low_variance", "drop_duplicates"]
+    assert Pipeline(steps).run(df).equals(run_in_order(df, steps))
+    assert len(Pipeline(steps).run(df)) == 2
+
+
+def test_drop_duplicates_still_moves_before_add_total():
+    steps = [{"op": "add_total"}, {"op": "drop_duplicates"}]
+    assert [step["op"] for step in optimize(steps)] == ["drop_duplicates", "add_total"]
+
+
+def sample_frame():
+    return pd.DataFrame({
+        "a": [1, -2, 3, 4, 5, 6, 7, 8, 9, 400],
+        "b": [0.5, 1.5, np.nan, -3.0, 2.0, 2.5, 1.0, 0.0, 3.5, 4.0],
+        "c": [7, 7, 7, 7, 7, 7, 7, 7, 7, 7],
+        "kind": ["x", "y", None, "x", "y", "x", "y", "x", "y", "x"],
+        "same": ["k"] * 10,
+    })
+
+
+def test_column_wise_steps_run_as_one_fused_pass():
+    steps = [
+        {"op": "zero_negative"},
+        {"op": "outliers", "method": "iqr", "actions": {"a": "clip", "b": "zero"}},
+        {"op": "add_total"},
+        {"op": "drop_low_variance"},
+    ]
+    optimized = optimize(steps)
+    assert [step["op"] for step in optimized] == ["columnwise"]
+    assert optimized[0]["steps"] == steps
+    df = sample_frame()
+    result = Pipeline(steps).run(df)
+    assert result.equals(run_in_order(df, steps))
+    assert list(result.columns) == ["a", "b", "kind", "Total"]
+    assert result["a"].dtype == np.int64
+    assert df.equals(sample_frame())  # The input frame is left alone
+
+
+def test_row_filters_move_ahead_of_row_wise_transforms():
+    remove = {"op": "outliers", "method": "iqr", "actions": {"a": "remove"}}
+    fill = {"op": "fill", "fills": {"kind": {"strategy": "value", "value": "Unknown"}}}
+    steps = [{"op": "add_total"}, fill, remove]
+    assert optimize(steps) == [remove, {"op": "add_total"}, fill]
+    df = sample_frame()
+    assert Pipeline(steps).run(df).equals(run_in_order(df, steps))
+
+
+def test_row_filters_stay_after_steps_that_change_what_they_read():
+    remove_total = {"op": "outliers", "method": "iqr", "actions": {"Total": "remove"}}
+    assert optimize([{"op": "add_total"}, remove_total]) == [{"op": "add_total"}, remove_total]
+    # Negative values feed the outlier bounds and a mean fill depends on which rows are left
+    remove = {"op": "outliers", "method": "iqr", "actions": {"a": "remove"}}
+    mean_fill = {"op": "fill", "fills": {"b": {"strategy": "mean"}}}
+    for step in ({"op": "zero_negative"}, mean_fill):
+        assert optimize([step, remove]) == [step, remove]
+
+
+def test_schema_lists_columns_without_running_the_steps():
+    pipeline = Pipeline([{"op": "add_total"}, {"op": "clean_labels"}, {"op": "drop_duplicates"}])
+    schema = pipeline.schema(pd.DataFrame({"Unit Price": [1.0], "Qty": [2]}))
+    assert list(schema.columns) == ["unit_price", "qty", "total"]
+    assert schema.empty
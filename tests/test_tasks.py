@@ -0,0 +1,49 @@
+import threading
+
+from Tasks import BackgroundTask
+
+
+class FakeRoot:
+    # Stands in for a Tk window: after() callbacks are run by hand
+    def __init__(self):
+        self.exists = True
+        self.pending = []
+
+    def after(self, ms, callback):
+        self.pending.append(callback)
+
+    def winfo_exists(self):
+        return self.exists
+
+    def run_pending(self):
+        pending, self.pending = self.pending, []
+        for callback in pending:
+            callback()
+
+
+def test_poll_stops_and_cancels_when_the_owner_window_is_closed():
+    release = threading.Event()
+    done = []
+
+    def work(task):
+        release.wait(5)
+        return "result"
+
+    root = FakeRoot()
+    task = BackgroundTask(root, work, done.append).start()
+    root.exists = False
+    release.set()
+    task.thread.join(5)
+    root.run_pending()
+    assert task.is_cancelled()
+    assert done == []
+    assert root.pending == []
+
+
+def test_poll_hands_the_result_back_while_the_window_is_open():
+    done = []
+    root = FakeRoot()
+    task = BackgroundTask(root, lambda task: "result", done.append).start()
+    task.thread.join(5)
+    root.run_pending()
+    assert done == ["result"]